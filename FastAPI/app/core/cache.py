@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Cache trong tiến trình: LRU giới hạn kích thước + TTL + version dữ liệu
+    - Mỗi entry lưu kèm `version` (kết quả probe dữ liệu); version khác => coi như miss
+    - Entry quá `ttl` giây => hết hạn
+    - Vượt `maxsize` => loại entry ít dùng gần đây nhất
+    - Thread-safe (route sync của FastAPI chạy trong threadpool)
+    """
+
+    def __init__(self, maxsize: int = 32, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[Any]:
+        """Trả về giá trị đã cache hoặc None nếu miss/hết hạn/sai version"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, entry_version, created_at = entry
+            if self.ttl and time.monotonic() - created_at > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            if entry_version != version:
+                del self._data[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        version: Any = None,
+        is_newer: Optional[Callable[[Any, Any], bool]] = None,
+    ) -> bool:
+        """
+        Lưu giá trị; `is_newer(version đang lưu, version)` trả True thì giữ entry đang có (một lần tính
+        trên dữ liệu cũ kết thúc sau lần tính trên dữ liệu mới không ghi đè kết quả mới)
+        Returns:
+            True nếu đã lưu
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and is_newer is not None and is_newer(entry[1], version):
+                return False
+            self._data[key] = (value, version, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Xoá một key, hoặc toàn bộ cache nếu key=None"""
+        with self._lock:
+            if key is None:
+                self.invalidations += len(self._data)
+                self._data.clear()
+            elif self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def values(self) -> list:
+        """Snapshot các giá trị đang cache (kể cả entry đã hết hạn nhưng chưa bị đọc lại)"""
+        with self._lock:
+            return [entry[0] for entry in self._data.values()]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups > 0 else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
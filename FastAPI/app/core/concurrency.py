@@ -0,0 +1,54 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+
+# Bật/tắt chạy song song các truy vấn độc lập (tắt => chạy tuần tự trên session của request)
+CONCURRENT_QUERIES = os.getenv("ANALYTICS_CONCURRENT_QUERIES", "1") == "1"
+
+# Thread pool giới hạn số truy vấn chạy song song trên toàn tiến trình
+# (mỗi truy vấn giữ một connection trong pool của engine)
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ANALYTICS_QUERY_WORKERS", "4")),
+    thread_name_prefix="analytics-query",
+)
+
+
+def _run_with_own_session(bind, task: Callable[[Session], Any]) -> Any:
+    """
+    Chạy task trên session riêng (Session không an toàn khi dùng chung giữa các thread)
+    cùng engine với session của request (database chính hoặc replica)
+    """
+    db = SessionLocal(bind=bind)
+    try:
+        return task(db)
+    finally:
+        db.close()
+
+
+def run_queries(
+    db: Session,
+    tasks: Dict[Hashable, Callable[[Session], Any]],
+    concurrent: Optional[bool] = None,
+) -> Dict[Hashable, Any]:
+    """
+    Chạy các truy vấn độc lập, trả về dict {tên: kết quả}
+    - Song song: mỗi task một session/connection riêng trên thread pool
+    - Tuần tự (fallback): lần lượt trên session `db` của request
+    Lỗi của bất kỳ task nào được raise lại cho router xử lý
+    """
+    if concurrent is None:
+        concurrent = CONCURRENT_QUERIES
+
+    if not concurrent or len(tasks) <= 1:
+        return {name: task(db) for name, task in tasks.items()}
+
+    bind = db.get_bind()
+    # Mỗi task chạy trong bản sao context của request (giữ span / số dòng của app.core.metrics)
+    futures = {
+        name: _executor.submit(contextvars.copy_context().run, _run_with_own_session, bind, task)
+        for name, task in tasks.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,184 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Optional, Tuple
+
+# Tắt (ANALYTICS_METRICS=0) => không gắn middleware, span() trả về context rỗng dùng chung
+METRICS_ENABLED = os.getenv("ANALYTICS_METRICS", "1") == "1"
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 100, 1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000)
+
+_NOOP = nullcontext()
+
+
+class RequestTimings:
+    """
+    Thời gian từng giai đoạn và số dòng đọc từ DB của một request
+    Thời gian của giai đoạn là wall-clock: các span cùng tên chạy chồng nhau (truy vấn song song của
+    run_queries, span lồng nhau) chỉ được tính một lần, nên không bao giờ vượt quá tổng thời gian request
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.rows = 0
+        self._active: Dict[str, int] = {}
+        self._since: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def enter(self, stage: str) -> None:
+        with self._lock:
+            active = self._active.get(stage, 0)
+            if active == 0:
+                self._since[stage] = time.perf_counter()
+            self._active[stage] = active + 1
+
+    def exit(self, stage: str) -> None:
+        with self._lock:
+            active = self._active[stage] - 1
+            self._active[stage] = active
+            if active == 0:
+                self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - self._since.pop(stage)
+
+    def add_rows(self, rows: int) -> None:
+        with self._lock:
+            self.rows += rows
+
+
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def _timed(timings: RequestTimings, stage: str):
+    timings.enter(stage)
+    try:
+        yield
+    finally:
+        timings.exit(stage)
+
+
+def span(stage: str):
+    """
+    Đo thời gian một giai đoạn của request hiện tại: `with span("sql"): ...`
+    Ngoài request (hoặc metrics tắt) => không làm gì
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NOOP
+    return _timed(timings, stage)
+
+
+def add_rows(rows: int) -> None:
+    """Cộng số dòng đã đọc từ DB vào request hiện tại"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add_rows(rows)
+
+
+class Histogram:
+    """Histogram kiểu Prometheus (bucket tích luỹ) theo bộ nhãn"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [số lượng theo bucket..., +Inf, tổng]
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            base = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = base + "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Thời gian xử lý request", ("route", "method", "status"), DURATION_BUCKETS
+)
+STAGE_DURATION = Histogram(
+    "analytics_stage_duration_seconds", "Thời gian từng giai đoạn trong request", ("route", "stage"), DURATION_BUCKETS
+)
+ROWS_FETCHED = Histogram("analytics_rows_fetched", "Số dòng đọc từ DB mỗi request", ("route",), ROW_BUCKETS)
+
+
+def _route_label(scope: dict) -> str:
+    """Đường dẫn mẫu của route (ví dụ /admissions/ingest/{table}) để giới hạn số nhãn"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def server_timing_header(timings: RequestTimings, total: float) -> str:
+    parts = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings.stages.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+async def timing_middleware(request, call_next: Callable):
+    """Middleware HTTP: gom span của request, trả header Server-Timing và ghi vào histogram"""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+    total = time.perf_counter() - started
+
+    route = _route_label(request.scope)
+    response.headers["Server-Timing"] = server_timing_header(timings, total)
+    REQUEST_DURATION.observe((route, request.method, str(response.status_code)), total)
+    for stage, seconds in timings.stages.items():
+        STAGE_DURATION.observe((route, stage), seconds)
+    if timings.rows:
+        ROWS_FETCHED.observe((route,), timings.rows)
+    return response
+
+
+def render_metrics(pool_stats: Dict[str, dict]) -> str:
+    """Văn bản định dạng Prometheus: histogram + gauge của connection pool theo engine"""
+    lines = []
+    for histogram in (REQUEST_DURATION, STAGE_DURATION, ROWS_FETCHED):
+        lines.extend(histogram.render())
+
+    gauges = {
+        "size": "Số connection cố định của pool",
+        "checked_out": "Số connection đang được dùng",
+        "checked_in": "Số connection rảnh trong pool",
+        "overflow": "Số connection vượt pool_size đang mở",
+    }
+    for key, help_text in gauges.items():
+        name = f"db_pool_{key}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for engine_name, stats in pool_stats.items():
+            if stats.get(key) is not None:
+                lines.append(f'{name}{{engine="{_escape(engine_name)}"}} {stats[key]}')
+    return "\n".join(lines) + "\n"
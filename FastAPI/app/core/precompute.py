@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PrecomputedEntry:
+    """Kết quả đã tính sẵn: body JSON, ETag và version dữ liệu dùng để tính"""
+
+    def __init__(self, body: bytes, etag: str, version: Any):
+        self.body = body
+        self.etag = etag
+        self.version = version
+        self.computed_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.computed_at
+
+
+class _Job:
+    def __init__(self, probe: Callable[[], Any], compute: Callable[[Any], PrecomputedEntry]):
+        self.probe = probe
+        self.compute = compute
+        self.latest_version: Any = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+
+class PrecomputeScheduler:
+    """
+    Tính lại payload nền theo lịch (stale-while-revalidate)
+    - Mỗi `probe_interval` giây: probe version dữ liệu của từng job; tính lại khi version đổi,
+      khi entry cũ hơn `interval` giây, hoặc khi handler yêu cầu
+    - Handler luôn nhận entry tốt gần nhất ngay lập tức (không chờ tính lại)
+    - Tính lỗi => giữ entry cũ, ghi nhận lỗi
+    Chạy trên một thread nền do lifespan của app bật / tắt
+    """
+
+    def __init__(self, interval: float = 300.0, probe_interval: float = 15.0):
+        self.interval = interval
+        self.probe_interval = probe_interval
+        self._jobs: Dict[Hashable, _Job] = {}
+        self._entries: Dict[Hashable, PrecomputedEntry] = {}
+        # key => số thứ tự của lần request_refresh gần nhất, chỉ bỏ khi đã tính lại thành công
+        self._requested: Dict[Hashable, int] = {}
+        self._request_seq = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.ticks = 0
+
+    def register(self, key: Hashable, probe: Callable[[], Any], compute: Callable[[Any], PrecomputedEntry]) -> None:
+        """`probe()` trả về version dữ liệu, `compute(version)` trả về PrecomputedEntry"""
+        self._jobs[key] = _Job(probe, compute)
+
+    def _is_stale(self, key: Hashable, entry: PrecomputedEntry) -> bool:
+        job = self._jobs[key]
+        return entry.age > self.interval or (job.latest_version is not None and job.latest_version != entry.version)
+
+    def get(self, key: Hashable) -> Optional[PrecomputedEntry]:
+        """
+        Entry tốt gần nhất (None nếu chưa có hoặc key không được lên lịch); cũ => yêu cầu tính lại
+        Key đang chờ request_refresh => None: handler tự tính trên dữ liệu hiện tại thay vì trả entry biết chắc đã cũ
+        """
+        if key not in self._jobs:
+            return None
+        with self._lock:
+            if key in self._requested:
+                return None
+            entry = self._entries.get(key)
+        if entry is None or self._is_stale(key, entry):
+            self._wake.set()
+        return entry
+
+    def request_refresh(self, key: Optional[Hashable] = None) -> None:
+        """
+        Buộc tính lại một key (hoặc mọi key) ngay ở vòng kế tiếp, kể cả khi version chưa đổi
+        (ví dụ sau khi nạp dữ liệu: không chờ tới lần probe định kỳ mới phát hiện version mới)
+        """
+        with self._lock:
+            for requested_key in (list(self._jobs) if key is None else [key]):
+                self._request_seq += 1
+                self._requested[requested_key] = self._request_seq
+        self._wake.set()
+
+    def invalidate(self) -> None:
+        """Bỏ mọi entry đã tính: handler tự tính cho tới vòng tính lại kế tiếp (benchmark đo đường lạnh)"""
+        with self._lock:
+            self._entries.clear()
+
+    def run_once(self) -> None:
+        """
+        Một vòng probe + tính lại các job cần thiết (thread nền gọi định kỳ)
+        Yêu cầu tính lại chỉ được bỏ sau khi tính thành công (trong lúc tính get() vẫn trả None);
+        tính lỗi => giữ yêu cầu, vòng sau thử lại
+        """
+        with self._lock:
+            requested = dict(self._requested)
+        self.ticks += 1
+
+        for key, job in self._jobs.items():
+            if self._stop.is_set():
+                return
+            try:
+                version = job.probe()
+                job.latest_version = version
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is not None and key not in requested and not self._is_stale(key, entry):
+                    continue
+                new_entry = job.compute(version)
+                with self._lock:
+                    self._entries[key] = new_entry
+                    # request_refresh đến trong lúc tính (dữ liệu có thể mới hơn) => giữ lại cho vòng sau
+                    if key in requested and self._requested.get(key) == requested[key]:
+                        del self._requested[key]
+                job.refreshes += 1
+                job.last_error = None
+            except Exception as exc:
+                job.failures += 1
+                job.last_error = str(exc)
+                logger.exception("Tính sẵn %s thất bại", key)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.run_once()
+            self._wake.wait(self.probe_interval)
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._thread is not None or not self._jobs:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-precompute", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = dict(self._entries)
+        jobs = []
+        for key, job in self._jobs.items():
+            entry = entries.get(key)
+            jobs.append({
+                "key": list(key) if isinstance(key, tuple) else key,
+                "ready": entry is not None,
+                "age_seconds": round(entry.age, 3) if entry else None,
+                "stale": self._is_stale(key, entry) if entry else None,
+                "refreshes": job.refreshes,
+                "failures": job.failures,
+                "last_error": job.last_error,
+            })
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval": self.interval,
+            "probe_interval": self.probe_interval,
+            "ticks": self.ticks,
+            "jobs": jobs,
+        }
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+from typing import Any, Hashable, Optional
+from pydantic import BaseModel
+from app.core.cache import TTLCache
+
+try:
+    import orjson
+except ImportError:  # orjson là tuỳ chọn, thiếu thì dùng json chuẩn
+    orjson = None
+
+# Client được dùng lại response trong `max-age` giây, sau đó phải hỏi lại bằng If-None-Match
+HTTP_MAX_AGE = int(os.getenv("ANALYTICS_HTTP_MAX_AGE", "0"))
+CACHE_CONTROL = f"private, max-age={HTTP_MAX_AGE}, must-revalidate"
+
+
+def _default(obj: Any) -> Any:
+    """Kiểu mà encoder không tự xử lý: model Pydantic, số numpy"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Không serialize được kiểu {type(obj).__name__}")
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize payload thành JSON bytes (orjson nếu có)"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(key: Hashable, version: Any) -> str:
+    """ETag mạnh, chỉ phụ thuộc route + tham số + version dữ liệu (giống nhau giữa các worker)"""
+    digest = hashlib.sha1(repr((key, version)).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """So khớp header If-None-Match (danh sách ETag, chấp nhận "*" và tiền tố W/)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def is_newer_version(cached: Any, version: Any) -> bool:
+    """
+    Version dữ liệu đã lưu (analytics_repo.get_data_version) mới hơn `version` hay không: so phần tử cuối
+    (TK_PHIEN_BAN, tăng ở mọi lần ghi dữ liệu); version không so được thì coi là không mới hơn
+    """
+    try:
+        return cached[-1] > version[-1]
+    except (TypeError, IndexError):
+        return False
+
+
+class ResponseCache:
+    """Cache body JSON đã serialize theo (route, tham số), hết hạn khi version dữ liệu đổi"""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: Hashable, version: Any) -> Optional[bytes]:
+        return self._cache.get(key, version)
+
+    def set(self, key: Hashable, body: bytes, version: Any) -> bool:
+        """Lưu body, trừ khi cache đang giữ body của version mới hơn"""
+        return self._cache.set(key, body, version, is_newer=is_newer_version)
+
+    def invalidate(self) -> None:
+        self._cache.invalidate()
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        stats["bytes"] = sum(len(body) for body in self._cache.values())
+        return stats
@@ -0,0 +1,67 @@
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    """Một lần tính đang chạy, các request trùng key chờ trên event"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Gộp các request đồng thời có cùng key thành một lần tính (single-flight)
+    - Request đầu tiên (leader) thực hiện `fn`, các request đến trong lúc đó chờ và nhận cùng kết quả
+    - Lỗi của leader được raise lại cho mọi request đang chờ
+    - Không cache: khi leader xong, request tiếp theo sẽ tính lại
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalesced_rate": round(self.coalesced / self.requests * 100, 2) if self.requests > 0 else 0.0,
+                "in_flight": len(self._calls),
+            }
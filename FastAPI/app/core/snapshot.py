@@ -0,0 +1,220 @@
+"""
+Snapshot DataFrame dùng chung giữa các worker uvicorn qua file memory-map (mặc định trên /dev/shm)
+
+Bố cục thư mục của một key:
+    <root>/<key>/CURRENT          tên generation đang dùng (đổi bằng os.replace => nguyên tử)
+    <root>/<key>/.lock            khoá file, chỉ một tiến trình được ghi generation mới
+    <root>/<key>/gen-000001/      meta.json + mỗi cột một file .npy
+
+- Cột số được lưu nguyên dtype, cột category lưu codes + categories; worker đọc bằng
+  np.load(mmap_mode="r") nên không copy (các tiến trình dùng chung page cache)
+- Cột chuỗi / ngày không phải category được mã hoá như category và chuyển lại dtype gốc khi đọc
+  (có copy); DataFrame của view analytics dạng compact không có loại cột này
+- DataFrame đọc ra là chỉ đọc: không sửa trực tiếp (giống cache view data)
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Callable, Hashable, Optional
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: không có khoá liên tiến trình, mỗi worker tự tạo snapshot
+    fcntl = None
+
+# Số generation giữ lại (generation cũ vẫn đọc được bởi worker đang map nó cho đến khi đóng)
+KEEP_GENERATIONS = 2
+
+
+def default_snapshot_dir() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "admission-analytics")
+
+
+class _FileLock:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+
+
+def _version_token(version: Any) -> str:
+    return repr(version)
+
+
+class SnapshotStore:
+    """Ghi / gắn snapshot DataFrame theo key và version dữ liệu"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self.attaches = 0
+        self.writes = 0
+        os.makedirs(root, mode=0o700, exist_ok=True)
+
+    def _key_dir(self, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(self.root, digest)
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        return path
+
+    def _current(self, key_dir: str) -> Optional[str]:
+        try:
+            with open(os.path.join(key_dir, "CURRENT"), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _read_meta(self, gen_dir: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(gen_dir, "meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def attach(self, key: Hashable, version: Any) -> Optional[pd.DataFrame]:
+        """DataFrame map từ generation hiện tại nếu cùng version, ngược lại None"""
+        key_dir = self._key_dir(key)
+        generation = self._current(key_dir)
+        if generation is None:
+            return None
+        gen_dir = os.path.join(key_dir, generation)
+        meta = self._read_meta(gen_dir)
+        if meta is None or meta["version"] != _version_token(version):
+            return None
+        df = _load_frame(gen_dir, meta)
+        with self._lock:
+            self.attaches += 1
+        return df
+
+    def write(self, key: Hashable, version: Any, df: pd.DataFrame) -> str:
+        """Ghi generation mới rồi đổi CURRENT (gọi khi đang giữ khoá của key)"""
+        key_dir = self._key_dir(key)
+        existing = [int(name.split("-")[1]) for name in os.listdir(key_dir) if name.startswith("gen-")]
+        number = max(existing, default=0) + 1
+        generation = f"gen-{number:06d}"
+
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=key_dir)
+        _save_frame(staging, df, _version_token(version))
+        os.rename(staging, os.path.join(key_dir, generation))
+
+        pointer = os.path.join(key_dir, f".CURRENT-{os.getpid()}")
+        with open(pointer, "w", encoding="utf-8") as f:
+            f.write(generation)
+        os.replace(pointer, os.path.join(key_dir, "CURRENT"))
+
+        self._cleanup(key_dir, generation)
+        with self._lock:
+            self.writes += 1
+        return generation
+
+    def get_or_create(self, key: Hashable, version: Any, produce: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Gắn snapshot nếu đã có đúng version; nếu chưa thì một tiến trình (giữ khoá) gọi `produce`
+        và ghi generation mới, các tiến trình khác chờ khoá rồi gắn vào kết quả đó
+        """
+        df = self.attach(key, version)
+        if df is not None:
+            return df
+        with _FileLock(os.path.join(self._key_dir(key), ".lock")):
+            df = self.attach(key, version)
+            if df is not None:
+                return df
+            self.write(key, version, produce())
+        return self.attach(key, version)
+
+    def invalidate(self) -> None:
+        """Bỏ mọi snapshot (các worker sẽ tạo lại ở lần đọc sau)"""
+        if not os.path.isdir(self.root):
+            return
+        for name in os.listdir(self.root):
+            try:
+                os.remove(os.path.join(self.root, name, "CURRENT"))
+            except FileNotFoundError:
+                pass
+
+    def _cleanup(self, key_dir: str, current: str) -> None:
+        generations = sorted(name for name in os.listdir(key_dir) if name.startswith("gen-"))
+        for name in generations[:-KEEP_GENERATIONS]:
+            if name != current:
+                shutil.rmtree(os.path.join(key_dir, name), ignore_errors=True)
+
+    def stats(self) -> dict:
+        size = 0
+        snapshots = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            size += sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames)
+            snapshots += "CURRENT" in filenames
+        with self._lock:
+            return {
+                "root": self.root,
+                "snapshots": snapshots,
+                "bytes_on_disk": size,
+                "attaches": self.attaches,
+                "writes": self.writes,
+            }
+
+
+def _json_default(obj: Any) -> Any:
+    return obj.item() if hasattr(obj, "item") else str(obj)
+
+
+def _save_frame(path: str, df: pd.DataFrame, version: str) -> None:
+    columns = []
+    for i, (name, series) in enumerate(df.items()):
+        dtype = series.dtype
+        if not (isinstance(dtype, np.dtype) and dtype.kind in "biuf"):
+            categorical = series if isinstance(dtype, pd.CategoricalDtype) else series.astype("category")
+            np.save(os.path.join(path, f"{i}.npy"), categorical.cat.codes.to_numpy())
+            np.save(os.path.join(path, f"{i}.categories.npy"), categorical.cat.categories.to_numpy(dtype=object))
+            kind = "category" if isinstance(dtype, pd.CategoricalDtype) else "encoded"
+        else:
+            np.save(os.path.join(path, f"{i}.npy"), series.to_numpy())
+            kind = "array"
+        columns.append({"name": name, "kind": kind, "dtype": str(dtype)})
+
+    meta = {
+        "version": version,
+        "rows": len(df),
+        "columns": columns,
+        "attrs": json.loads(json.dumps(df.attrs, default=_json_default)),
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def _load_frame(path: str, meta: dict) -> pd.DataFrame:
+    data = {}
+    for i, column in enumerate(meta["columns"]):
+        values = np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r")
+        if column["kind"] == "array":
+            data[column["name"]] = values
+            continue
+        # Categories do chính tiến trình snapshot ghi ra (thư mục quyền 0700)
+        categories = np.load(os.path.join(path, f"{i}.categories.npy"), allow_pickle=True)
+        categorical = pd.Categorical.from_codes(values, categories=pd.Index(categories))
+        if column["kind"] == "category":
+            data[column["name"]] = categorical
+        else:
+            data[column["name"]] = pd.Series(categorical).astype(column["dtype"] if column["dtype"] != "object" else object)
+
+    df = pd.DataFrame(data, copy=False)
+    if not data:
+        df = pd.DataFrame(index=pd.RangeIndex(meta["rows"]))
+    df.attrs.update(meta["attrs"])
+    return df
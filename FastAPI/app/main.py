@@ -1,12 +1,48 @@
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import analytics
-from app.core.database import Base, engine
+from app.routers import admission, analytics, metrics
+from app.core.metrics import METRICS_ENABLED, timing_middleware
 
-# Tạo bảng nếu chưa có (trong thực tế nên dùng Alembic)
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Admission Analytics API")
+# production: không tạo bảng khi khởi động (chạy `python -m app.migrate` lúc deploy)
+APP_ENV = os.getenv("APP_ENV", "development")
+AUTO_CREATE_SCHEMA = os.getenv("DB_AUTO_CREATE_SCHEMA", "0" if APP_ENV == "production" else "1") == "1"
+
+# Sau khi app sẵn sàng: nạp trước stack analytics và tính sẵn dashboard các năm (chạy nền)
+ANALYTICS_PRELOAD = os.getenv("ANALYTICS_PRELOAD", "1") == "1"
+ANALYTICS_WARMUP_YEARS = [int(year) for year in os.getenv("ANALYTICS_WARMUP_YEARS", "").split(",") if year.strip()]
+
+
+def _warm_up():
+    try:
+        analytics.preload_analytics_modules()
+        if ANALYTICS_WARMUP_YEARS:
+            analytics.warm_dashboard_cache(ANALYTICS_WARMUP_YEARS)
+    except Exception:
+        logger.exception("Warm-up analytics thất bại")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AUTO_CREATE_SCHEMA:
+        # Tạo bảng nếu chưa có (môi trường dev; production dùng app.migrate)
+        from app.migrate import migrate
+
+        migrate()
+    if ANALYTICS_PRELOAD or ANALYTICS_WARMUP_YEARS:
+        threading.Thread(target=_warm_up, name="analytics-warmup", daemon=True).start()
+    # Thread tính sẵn payload cho ANALYTICS_ACTIVE_YEARS (không có năm nào => không chạy)
+    analytics.precompute_scheduler.start()
+    yield
+    analytics.precompute_scheduler.stop()
+
+
+app = FastAPI(title="Admission Analytics API", lifespan=lifespan)
 
 # Cấu hình CORS để React gọi được API
 app.add_middleware(
@@ -15,10 +51,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag"],
 )
 
+# Đo thời gian từng giai đoạn (header Server-Timing + /metrics), tắt bằng ANALYTICS_METRICS=0
+if METRICS_ENABLED:
+    app.middleware("http")(timing_middleware)
+
 app.include_router(analytics.router)
+app.include_router(admission.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to Admission Analytics API"}
\ No newline at end of file
+    return {"message": "Welcome to Admission Analytics API"}
@@ -0,0 +1,45 @@
+"""
+Tạo schema / index còn thiếu, chạy một lần khi deploy thay vì mỗi lần worker khởi động
+
+Chạy (trong thư mục FastAPI):
+    python -m app.migrate
+"""
+from sqlalchemy import inspect
+from app.core.database import Base, engine
+import app.models  # noqa: F401  (đăng ký model vào Base.metadata)
+
+
+def migrate(bind=None) -> dict:
+    """
+    - Tạo các bảng chưa có (bảng / view đã có được giữ nguyên)
+    - Tạo các index khai báo trong models.py nhưng chưa có trên bảng đã tồn tại
+      (tương đương migrations/*.sql vì các file đó chỉ CREATE TABLE / CREATE INDEX; chạy lại nhiều lần vẫn an toàn)
+    Không sửa cột của bảng đã tồn tại: migration có ALTER phải chạy bằng file .sql
+    """
+    bind = bind or engine
+    existing_tables = set(inspect(bind).get_table_names())
+    Base.metadata.create_all(bind=bind)
+
+    inspector = inspect(bind)
+    created_tables = sorted(set(inspector.get_table_names()) - existing_tables)
+    created_indexes = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables or not table.indexes:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=bind)
+                created_indexes.append(index.name)
+
+    return {"created_tables": created_tables, "created_indexes": created_indexes}
+
+
+def main():
+    result = migrate()
+    print(f"Bảng mới: {', '.join(result['created_tables']) or 'không có'}")
+    print(f"Index mới: {', '.join(result['created_indexes']) or 'không có'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Date, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Double, Date, DateTime, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -118,6 +118,12 @@ class HoSoNhapHoc(Base):
     NamTuyenSinh = Column(Integer)
     NgayXacNhan = Column(Date)
 
+    # Index phục vụ lọc theo năm tuyển sinh (xem migrations/001_hsnh_year_indexes.sql)
+    __table_args__ = (
+        Index("IX_HSNH_NAM_NGANH", "NamTuyenSinh", "MaNganh"),
+        Index("IX_HSNH_NAM_CCCD", "NamTuyenSinh", "CCCD"),
+    )
+
     # Relationships
     thi_sinh = relationship("ThiSinh", back_populates="ho_so_nhap_hoc")
     nganh = relationship("Nganh", back_populates="ho_so_nhap_hoc")
@@ -152,4 +158,54 @@ class ViewPhanTichTuyenSinh(Base):
     DXT_IELTS_THPT = Column(Float)
 
     # Điểm cuối cùng cao nhất
-    DiemXetTuyen = Column(Float)
\ No newline at end of file
+    DiemXetTuyen = Column(Float)
+
+
+# Bảng tổng hợp (rollup) theo năm tuyển sinh, xem app/repository/rollup_repo.py
+class TkNganhNam(Base):
+    __tablename__ = "TK_NGANH_NAM"
+    NamTuyenSinh = Column(Integer, primary_key=True)
+    MaNganh = Column(String(50), ForeignKey("NGANH.MaNganh"), primary_key=True)
+    SoLuongNhapHoc = Column(Integer, default=0)
+
+class TkTinhNam(Base):
+    __tablename__ = "TK_TINH_NAM"
+    NamTuyenSinh = Column(Integer, primary_key=True)
+    QueQuan = Column(String(255), primary_key=True)  # "" thay cho QueQuan NULL
+    SoLuong = Column(Integer, default=0)
+
+class TkPhuongThucNam(Base):
+    __tablename__ = "TK_PHUONG_THUC_NAM"
+    NamTuyenSinh = Column(Integer, primary_key=True)
+    PhuongThuc = Column(String(50), primary_key=True)  # Tên cột DXT_*
+    SoLuong = Column(Integer, default=0)  # Số thí sinh có điểm > 0
+    TongDiem = Column(Double, default=0)  # Tổng điểm > 0 (DOUBLE: trung bình khớp đường pandas)
+
+class TkBinDiemNam(Base):
+    __tablename__ = "TK_BIN_DIEM_NAM"
+    NamTuyenSinh = Column(Integer, primary_key=True)
+    Bin = Column(Integer, primary_key=True)  # Bin 5 điểm của DiemXetTuyen > 0
+    SoLuong = Column(Integer, default=0)
+
+class TkPhanViNam(Base):
+    __tablename__ = "TK_PHAN_VI_NAM"
+    NamTuyenSinh = Column(Integer, primary_key=True)
+    TenNganh = Column(String(255), primary_key=True)  # "" = mọi ngành
+    PhuongThuc = Column(String(50), primary_key=True)  # Tên cột DXT_* hoặc DiemXetTuyen
+    SoLuong = Column(Integer, default=0)  # Số thí sinh có điểm > 0
+    Digest = Column(LargeBinary)  # t-digest, xem app/services/sketch.py
+    PhienBan = Column(String(100))  # Version dữ liệu của năm lúc tạo digest
+
+class TkPhienBan(Base):
+    __tablename__ = "TK_PHIEN_BAN"
+    NamTuyenSinh = Column(Integer, primary_key=True)
+    PhienBan = Column(Integer, default=0)  # Tăng trong cùng transaction với mỗi lần ghi dữ liệu của năm
+    CapNhatLuc = Column(DateTime)
+
+class TkWatermark(Base):
+    __tablename__ = "TK_WATERMARK"
+    NamTuyenSinh = Column(Integer, primary_key=True)
+    NgayChot = Column(Date)  # Đã tổng hợp mọi hồ sơ có NgayXacNhan < NgayChot (và NULL)
+    SoDong = Column(Integer)  # Số hồ sơ đã tổng hợp, dùng để phát hiện sửa/xoá dữ liệu cũ
+    PhienBan = Column(Integer)  # TK_PHIEN_BAN của năm lúc tổng hợp, phát hiện sửa dữ liệu không đổi số dòng
+    CapNhatLuc = Column(DateTime)
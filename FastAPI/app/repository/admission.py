@@ -0,0 +1,192 @@
+import time
+from typing import IO, Iterator, List
+import pandas as pd
+from sqlalchemy import Date, Float, Integer, String
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import DiemThi, HoSoNhapHoc, ThiSinh
+from app.repository.version_repo import bump_data_versions, get_admission_years_of
+
+# Các bảng nhận dữ liệu nạp hàng loạt (tên trên URL => model)
+INGEST_MODELS = {
+    "thisinh": ThiSinh,
+    "diem_thi": DiemThi,
+    "ho_so_nhap_hoc": HoSoNhapHoc,
+}
+
+# Số lỗi tối đa trả về trong kết quả (tổng số dòng lỗi vẫn được đếm đủ)
+MAX_REPORTED_ERRORS = 100
+
+# Định dạng ngày được chấp nhận: ISO và kiểu Việt Nam (ngày trước tháng); khác => dòng lỗi
+INGEST_DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"]
+
+
+def _read_batches(source: IO[bytes], fmt: str, batch_size: int) -> Iterator[pd.DataFrame]:
+    """Đọc file upload theo batch, giữ mọi giá trị ở dạng chuỗi (CCCD có số 0 ở đầu)"""
+    if fmt == "csv":
+        reader = pd.read_csv(source, dtype=str, keep_default_na=False, na_values=[""], chunksize=batch_size)
+    else:
+        reader = pd.read_json(source, lines=True, dtype=False, chunksize=batch_size)
+    for batch in reader:
+        yield batch
+
+
+def _parse_dates(raw: pd.Series) -> pd.Series:
+    """Ngày theo INGEST_DATE_FORMATS, thử lần lượt từng định dạng (03/04/2024 là 3 tháng 4); không khớp => NaT"""
+    text = raw.astype("string").str.strip()
+    parsed = pd.to_datetime(text, format=INGEST_DATE_FORMATS[0], errors="coerce")
+    for date_format in INGEST_DATE_FORMATS[1:]:
+        parsed = parsed.fillna(pd.to_datetime(text, format=date_format, errors="coerce"))
+    return parsed
+
+
+def _validate_batch(model, batch: pd.DataFrame, row_offset: int, errors: list) -> pd.DataFrame:
+    """
+    Kiểm tra và chuyển kiểu cả batch bằng thao tác vector theo cột (không tạo model Pydantic từng dòng)
+    - Thiếu khoá chính, sai kiểu số/ngày, chuỗi quá dài => dòng lỗi
+    - Cột không thuộc bảng bị bỏ qua
+    Trả về các dòng hợp lệ, đã đúng kiểu
+    """
+    table = model.__table__
+    columns = [column for column in table.columns if column.name in batch.columns]
+    missing_keys = [column.name for column in table.primary_key.columns if column.name not in batch.columns]
+    if missing_keys:
+        raise ValueError(f"Thiếu cột khoá chính: {', '.join(missing_keys)}")
+
+    data = pd.DataFrame(index=batch.index)
+    invalid = pd.Series(False, index=batch.index)
+    reasons = pd.Series("", index=batch.index, dtype=object)
+
+    def flag(mask: pd.Series, reason: str):
+        nonlocal invalid
+        new = mask & ~invalid
+        reasons[new] = reason
+        invalid = invalid | mask
+
+    for column in columns:
+        raw = batch[column.name]
+        present = raw.notna() & (raw.astype(str).str.strip() != "")
+        if isinstance(column.type, (Float, Integer)):
+            values = pd.to_numeric(raw.where(present), errors="coerce")
+            flag(present & values.isna(), f"{column.name} không phải số")
+            if isinstance(column.type, Integer):
+                integral = values % 1 == 0
+                flag(values.notna() & ~integral, f"{column.name} không phải số nguyên")
+                values = values.where(integral).astype("Int64")
+        elif isinstance(column.type, Date):
+            values = _parse_dates(raw.where(present))
+            flag(present & values.isna(), f"{column.name} không phải ngày hợp lệ (yyyy-mm-dd hoặc dd/mm/yyyy)")
+            values = values.dt.date
+        else:
+            values = raw.where(present).astype("string").str.strip()
+            if isinstance(column.type, String) and column.type.length:
+                too_long = (values.str.len() > column.type.length).fillna(False).astype(bool)
+                flag(too_long, f"{column.name} dài quá {column.type.length} ký tự")
+
+        if column.primary_key:
+            flag(~present, f"Thiếu {column.name}")
+        data[column.name] = values
+
+    if invalid.any():
+        for index in invalid[invalid].index:
+            if len(errors) >= MAX_REPORTED_ERRORS:
+                break
+            errors.append({"row": int(row_offset + batch.index.get_loc(index) + 1), "error": reasons[index]})
+
+    return data[~invalid]
+
+
+def _upsert_statement(db: Session, model, columns: List[str]):
+    """INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT DO UPDATE (SQLite, PostgreSQL)"""
+    table = model.__table__
+    key_columns = [column.name for column in table.primary_key.columns]
+    update_columns = [name for name in columns if name not in key_columns]
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        if update_columns:
+            return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in update_columns})
+        return stmt.prefix_with("IGNORE")
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        if update_columns:
+            return stmt.on_conflict_do_update(
+                index_elements=key_columns,
+                set_={name: stmt.excluded[name] for name in update_columns},
+            )
+        return stmt.on_conflict_do_nothing(index_elements=key_columns)
+    return table.insert()
+
+
+def _to_records(data: pd.DataFrame) -> List[dict]:
+    """DataFrame => list dict cho executemany (NaN/NA => None)"""
+    data = data.astype(object).where(data.notna(), None)
+    return data.to_dict("records")
+
+
+def _affected_years(db: Session, model, data: pd.DataFrame) -> set:
+    """Năm tuyển sinh có dữ liệu bị batch thay đổi: năm hiện có của các thí sinh + năm trong batch hồ sơ"""
+    years = get_admission_years_of(db, data["CCCD"].tolist())
+    if model is HoSoNhapHoc and "NamTuyenSinh" in data.columns:
+        years.update(int(nam) for nam in data["NamTuyenSinh"].dropna().unique())
+    return years
+
+
+def bulk_ingest(
+    db: Session,
+    table_name: str,
+    source: IO[bytes],
+    fmt: str = "csv",
+    batch_size: int = 5000,
+) -> dict:
+    """
+    Nạp hàng loạt dữ liệu vào THISINH / DIEM_THI / HO_SO_NHAP_HOC
+    - Đọc và kiểm tra theo batch `batch_size` dòng
+    - Mỗi batch ghi bằng một lệnh upsert nhiều dòng (executemany) trong transaction riêng,
+      cùng transaction tăng version dữ liệu (TK_PHIEN_BAN) của các năm bị ảnh hưởng
+    - Dòng lỗi bị bỏ qua và được báo lại; batch lỗi DB được rollback và dừng nạp
+    """
+    if table_name not in INGEST_MODELS:
+        raise ValueError(f"Bảng không hỗ trợ nạp dữ liệu: {table_name}")
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError(f"Định dạng không hỗ trợ: {fmt}")
+    if batch_size <= 0:
+        raise ValueError("batch_size phải lớn hơn 0")
+
+    model = INGEST_MODELS[table_name]
+    errors = []
+    rows_received = 0
+    rows_written = 0
+    batches = 0
+    started = time.perf_counter()
+
+    for batch in _read_batches(source, fmt, batch_size):
+        valid = _validate_batch(model, batch.reset_index(drop=True), rows_received, errors)
+        rows_received += len(batch)
+        if valid.empty:
+            continue
+
+        stmt = _upsert_statement(db, model, list(valid.columns))
+        try:
+            years = _affected_years(db, model, valid)
+            db.execute(stmt, _to_records(valid))
+            bump_data_versions(db, years)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        rows_written += len(valid)
+        batches += 1
+
+    elapsed = time.perf_counter() - started
+    return {
+        "table": model.__tablename__,
+        "rows_received": rows_received,
+        "rows_written": rows_written,
+        "rows_invalid": rows_received - rows_written,
+        "batches": batches,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows_written / elapsed, 1) if elapsed > 0 else 0.0,
+        "errors": errors,
+    }
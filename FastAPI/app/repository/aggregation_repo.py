@@ -0,0 +1,151 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, literal
+from typing import List, Optional
+from app.core.metrics import span
+from app.models import ViewPhanTichTuyenSinh, ThiSinh
+from app.repository.analytics_repo import SCORE_COLUMNS, _filter_view_query
+from app.repository.rollup_repo import (
+    ROLLUP_METHOD_COLUMNS,
+    get_rollup_method_stats,
+    get_rollup_score_buckets,
+    is_rollup_fresh,
+)
+
+# Cột DXT_* lấy được từ TK_PHUONG_THUC_NAM: chart phương thức chỉ cần số lượng / tổng điểm > 0
+# (DXT_HSA vẫn quét view vì summary cần cả số giá trị < 0 để tính tỉ lệ HSA)
+ROLLUP_STATS_COLUMNS = [col for col in ROLLUP_METHOD_COLUMNS if col != "DXT_HSA"]
+
+
+def _base_query(db: Session, *columns):
+    """Query trên view join ThiSinh giống get_view_admission_data (để số dòng khớp)"""
+    return db.query(*columns).select_from(ViewPhanTichTuyenSinh).join(
+        ThiSinh, ViewPhanTichTuyenSinh.CCCD == ThiSinh.CCCD
+    )
+
+
+def _column_aggregates(col_name: str) -> list:
+    """
+    Các aggregate có điều kiện cho một cột điểm:
+    đếm/tổng/max của giá trị > 0 và giá trị < 0 (NULL/0 suy ra từ tổng số dòng)
+    """
+    col = getattr(ViewPhanTichTuyenSinh, col_name)
+    return [
+        func.sum(case((col > 0, 1), else_=0)).label(f"{col_name}__pos_count"),
+        func.sum(case((col > 0, col), else_=None)).label(f"{col_name}__pos_sum"),
+        func.max(case((col > 0, col), else_=None)).label(f"{col_name}__pos_max"),
+        func.sum(case((col < 0, 1), else_=0)).label(f"{col_name}__neg_count"),
+        func.sum(case((col < 0, col), else_=None)).label(f"{col_name}__neg_sum"),
+        func.max(case((col < 0, col), else_=None)).label(f"{col_name}__neg_max"),
+    ]
+
+
+def get_score_column_stats(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+    score_columns: Optional[List[str]] = None,
+) -> dict:
+    """
+    Thống kê đủ (sufficient statistics) của các cột điểm trong một lần quét view
+    Đủ để tái tạo trung bình sau khi làm sạch của clean_admission_data mà không tải từng dòng
+    """
+    score_columns = score_columns or SCORE_COLUMNS
+    columns = [
+        func.count(literal(1)).label("total"),
+        func.count(func.distinct(ViewPhanTichTuyenSinh.TenNganh)).label("total_majors"),
+    ]
+    for col_name in score_columns:
+        columns.extend(_column_aggregates(col_name))
+
+    query = _filter_view_query(_base_query(db, *columns), nam_tuyen_sinh, ma_nganh, ma_pt)
+    row = query.one()._mapping
+
+    stats = {
+        "total": int(row["total"] or 0),
+        "total_majors": int(row["total_majors"] or 0),
+        "columns": {},
+    }
+    for col_name in score_columns:
+        stats["columns"][col_name] = {
+            "pos_count": int(row[f"{col_name}__pos_count"] or 0),
+            "pos_sum": float(row[f"{col_name}__pos_sum"] or 0),
+            "pos_max": row[f"{col_name}__pos_max"],
+            "neg_count": int(row[f"{col_name}__neg_count"] or 0),
+            "neg_sum": float(row[f"{col_name}__neg_sum"] or 0),
+            "neg_max": row[f"{col_name}__neg_max"],
+        }
+    return stats
+
+
+def get_top_province(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+) -> Optional[str]:
+    """Mode của QueQuan (hoà thì lấy giá trị nhỏ nhất theo thứ tự chuỗi, giống Series.mode)"""
+    so_luong = func.count(ThiSinh.CCCD)
+    query = (
+        _base_query(db, ThiSinh.QueQuan, so_luong.label("so_luong"))
+        .filter(ThiSinh.QueQuan.isnot(None))
+    )
+    query = _filter_view_query(query, nam_tuyen_sinh, ma_nganh, ma_pt)
+    row = query.group_by(ThiSinh.QueQuan).order_by(so_luong.desc(), ThiSinh.QueQuan).first()
+    return row[0] if row is not None else None
+
+
+def get_score_bucket_counts(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+    bin_width: int = 5,
+) -> dict:
+    """
+    Đếm số thí sinh theo bin `bin_width` điểm của DiemXetTuyen (chỉ giá trị > 0)
+    Bin đóng bên phải như pd.cut: bin i = (w*i, w*(i+1)], bin 0 gồm cả 0
+    """
+    score = ViewPhanTichTuyenSinh.DiemXetTuyen
+    bucket = case(
+        (score <= bin_width, 0),
+        else_=func.ceil(score / bin_width) - 1,
+    ).label("bucket")
+    query = _base_query(db, bucket, func.count(literal(1)).label("so_luong")).filter(score > 0)
+    query = _filter_view_query(query, nam_tuyen_sinh, ma_nganh, ma_pt)
+    return {int(row.bucket): int(row.so_luong) for row in query.group_by(bucket)}
+
+
+def get_aggregated_stats(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+) -> dict:
+    """
+    Gom toàn bộ aggregate cần cho summary + 2 chart điểm (O(số bin) thay vì O(số thí sinh))
+    Kết quả dùng cho các hàm *_from_stats trong app.services.aggregation
+    Cả năm, không lọc ngành / phương thức và rollup còn mới: bin điểm và các cột ROLLUP_STATS_COLUMNS
+    đọc từ bảng rollup thay vì quét view
+    """
+    with span("sql"):
+        use_rollup = (
+            nam_tuyen_sinh is not None and ma_nganh is None and ma_pt is None
+            and is_rollup_fresh(db, nam_tuyen_sinh)
+        )
+        if not use_rollup:
+            stats = get_score_column_stats(db, nam_tuyen_sinh, ma_nganh, ma_pt)
+            stats["score_buckets"] = get_score_bucket_counts(db, nam_tuyen_sinh, ma_nganh, ma_pt)
+        else:
+            scanned = [col for col in SCORE_COLUMNS if col not in ROLLUP_STATS_COLUMNS]
+            stats = get_score_column_stats(db, nam_tuyen_sinh, score_columns=scanned)
+            method_stats = get_rollup_method_stats(db, nam_tuyen_sinh)
+            for col_name in ROLLUP_STATS_COLUMNS:
+                # Các trường còn lại không được chart phương thức dùng tới
+                pos = method_stats.get(col_name, {"pos_count": 0, "pos_sum": 0.0})
+                stats["columns"][col_name] = {
+                    **pos, "pos_max": None, "neg_count": 0, "neg_sum": 0.0, "neg_max": None,
+                }
+            stats["score_buckets"] = get_rollup_score_buckets(db, nam_tuyen_sinh)
+        stats["top_province"] = get_top_province(db, nam_tuyen_sinh, ma_nganh, ma_pt)
+    return stats
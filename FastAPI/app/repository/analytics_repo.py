@@ -1,7 +1,41 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, exists, select
+from typing import Iterator, List, Optional, Tuple
+import os
+import numpy as np
 import pandas as pd
-from app.models import ViewPhanTichTuyenSinh, HoSoNhapHoc, Nganh, ThiSinh
+from app.core.cache import TTLCache
+from app.core.metrics import add_rows, span
+from app.core.snapshot import SnapshotStore, default_snapshot_dir
+from app.models import ViewPhanTichTuyenSinh, HoSoNhapHoc, Nganh, ThiSinh, NhomXetTuyen
+from app.repository.rollup_repo import (
+    get_rollup_admission_by_major,
+    get_rollup_demographics_by_province,
+    is_rollup_fresh,
+)
+from app.repository.version_repo import data_version_column
+
+# Danh sách các cột điểm cần làm sạch
+SCORE_COLUMNS = [
+    "TongDiemTHPT", "HSA", "TSA", "IELTS", "SAT",
+    "DiemXetTuyen",
+    "DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT", 
+    "DXT_IELTS_DGNL", "DXT_IELTS_THPT"
+]
+
+# Các cột mà calculate_summary / analyze_score_distribution / build_thpt_subject_analysis_chart cần
+ANALYTICS_COLUMNS = [
+    "TenNganh", "QueQuan",
+    "TongDiemTHPT", "HSA", "TSA", "IELTS", "DiemXetTuyen",
+    "DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT",
+    "DXT_IELTS_DGNL", "DXT_IELTS_THPT"
+]
+
+# Cột cho histogram điểm cấu hình được: mọi cột điểm được làm sạch + chiều nhóm (ngành, khối)
+HISTOGRAM_COLUMNS = ["TenNganh", "KhoiXetTuyen"] + SCORE_COLUMNS
+
+# Cột chuỗi ít giá trị khác nhau => lưu dạng category khi compact
+CATEGORICAL_COLUMNS = ["TenNganh", "KhoiXetTuyen", "QueQuan", "GioiTinh"]
 
 
 def clean_admission_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -18,15 +52,7 @@ def clean_admission_data(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     cleaning_stats = {}
     
-    # Danh sách các cột điểm cần làm sạch
-    score_columns = [
-        "TongDiemTHPT", "HSA", "TSA", "IELTS", "SAT",
-        "DiemXetTuyen",
-        "DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT", 
-        "DXT_IELTS_DGNL", "DXT_IELTS_THPT"
-    ]
-    
-    for col in score_columns:
+    for col in SCORE_COLUMNS:
         if col in df.columns:
             # Chuyển sang numeric, các giá trị không phải số thành NaN
             df[col] = pd.to_numeric(df[col], errors="coerce")
@@ -41,13 +67,13 @@ def clean_admission_data(df: pd.DataFrame) -> pd.DataFrame:
             
             # Thay thế NULL và 0 bằng trung bình
             if pd.notna(mean_value) and mean_value > 0:
-                # Thay NULL
-                df[col].fillna(mean_value, inplace=True)
+                # Thay NULL (gán lại cột, fillna inplace qua df[col] không có tác dụng với Copy-on-Write)
+                df[col] = df[col].fillna(mean_value)
                 # Thay 0
                 df.loc[df[col] == 0, col] = mean_value
             else:
                 # Nếu không có giá trị > 0, set NULL thành 0, giữ 0 như cũ
-                df[col].fillna(0, inplace=True)
+                df[col] = df[col].fillna(0)
             
             # Ghi lại thống kê nếu có xử lý
             if null_count > 0 or zero_count > 0:
@@ -66,11 +92,170 @@ def clean_admission_data(df: pd.DataFrame) -> pd.DataFrame:
 
 
 
-def get_view_admission_data(db: Session) -> pd.DataFrame:
+def clean_admission_data_fast(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+    """
+    Phiên bản vector hoá của clean_admission_data: cùng kết quả, cùng `cleaning_stats`
+    - Gom các cột điểm thành một mảng 2-D float64 và xử lý mọi cột trong một lượt có mask
+    - Không `df.copy()` toàn bộ: inplace=False chỉ tạo bản shallow rồi thay các cột điểm
+    - inplace=True ghi đè trực tiếp lên `df` (dùng khi df vừa đọc từ DB)
+    """
+    out = df if inplace else df.copy(deep=False)
+    columns = [col for col in SCORE_COLUMNS if col in out.columns]
+    cleaning_stats = {}
+
+    if columns:
+        # Cột đã là số thì dùng thẳng, còn lại chuyển sang numeric (không phải số thành NaN)
+        block = np.empty((len(out), len(columns)), dtype=np.float64, order="F")
+        for j, col in enumerate(columns):
+            series = out[col]
+            if not pd.api.types.is_numeric_dtype(series):
+                series = pd.to_numeric(series, errors="coerce")
+            block[:, j] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        null_mask = np.isnan(block)
+        zero_mask = block == 0
+        positive_mask = block > 0
+
+        null_counts = null_mask.sum(axis=0)
+        zero_counts = zero_mask.sum(axis=0)
+        valid_counts = positive_mask.sum(axis=0)
+        # Tổng trên các giá trị đã lọc (cùng thứ tự cộng với Series.mean => trung bình trùng khớp từng bit)
+        valid_sums = np.array([block[positive_mask[:, j], j].sum() for j in range(len(columns))])
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(valid_counts > 0, valid_sums / valid_counts, np.nan)
+
+        # NULL và 0 thành trung bình; cột không có giá trị > 0 thì NULL thành 0 (0 giữ nguyên)
+        fill_values = np.where(valid_counts > 0, means, 0.0)
+        np.copyto(block, np.broadcast_to(fill_values, block.shape), where=null_mask | zero_mask)
+
+        for j, col in enumerate(columns):
+            out[col] = block[:, j]
+
+            null_count = int(null_counts[j])
+            zero_count = int(zero_counts[j])
+            if null_count > 0 or zero_count > 0:
+                mean_value = means[j]
+                cleaning_stats[col] = {
+                    "null_count": null_count,
+                    "zero_count": zero_count,
+                    "total_replaced": null_count + zero_count,
+                    "mean_value": round(float(mean_value), 2) if not np.isnan(mean_value) else 0,
+                    "valid_data_count": int(valid_counts[j]),
+                }
+
+    out.attrs["cleaning_stats"] = cleaning_stats
+    return out
+
+
+def fill_admission_scores(df: pd.DataFrame, fill_values: dict) -> pd.DataFrame:
+    """
+    Làm sạch với giá trị điền đã biết trước (tại chỗ), dùng cho dữ liệu đọc theo chunk
+    `fill_values[col]` là trung bình các giá trị > 0 của cả tập dữ liệu (0 nếu không có),
+    nên kết quả giống clean_admission_data chạy trên toàn bộ dữ liệu
+    """
+    for col in SCORE_COLUMNS:
+        if col in df.columns and col in fill_values:
+            values = pd.to_numeric(df[col], errors="coerce")
+            df[col] = values.mask(values.isna() | (values == 0), fill_values[col])
+    return df
+
+
+def _filter_view_query(
+    query,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+):
+    """
+    Áp dụng bộ lọc năm / ngành / phương thức ngay trong SQL
+    View không có cột NamTuyenSinh nên lọc bằng EXISTS trên HO_SO_NHAP_HOC
+    (dùng index IX_HSNH_NAM_CCCD / IX_HSNH_NAM_NGANH), tránh nhân bản dòng khi join
+    """
+    if nam_tuyen_sinh is None and ma_nganh is None and ma_pt is None:
+        return query
+
+    condition = HoSoNhapHoc.CCCD == ViewPhanTichTuyenSinh.CCCD
+    if nam_tuyen_sinh is not None:
+        condition = condition & (HoSoNhapHoc.NamTuyenSinh == nam_tuyen_sinh)
+    if ma_nganh is not None:
+        condition = condition & (HoSoNhapHoc.MaNganh == ma_nganh)
+    if ma_pt is not None:
+        nhom_ids = select(NhomXetTuyen.MaNhom).where(NhomXetTuyen.MaPT == ma_pt)
+        condition = condition & HoSoNhapHoc.MaNhom.in_(nhom_ids)
+
+    subquery = exists().where(condition)
+    return query.filter(subquery)
+
+
+def _view_select_columns(columns: Optional[List[str]]) -> list:
+    """Chuyển danh sách tên cột (của view + QueQuan) thành cột SQLAlchemy để SELECT"""
+    if columns is None:
+        return [ViewPhanTichTuyenSinh, ThiSinh.QueQuan]
+
+    view_columns = ViewPhanTichTuyenSinh.__table__.columns
+    selected = []
+    for name in columns:
+        if name == "QueQuan":
+            selected.append(ThiSinh.QueQuan)
+        elif name in view_columns:
+            selected.append(getattr(ViewPhanTichTuyenSinh, name))
+        else:
+            raise ValueError(f"Cột không hợp lệ: {name}")
+    return selected
+
+
+def compact_admission_dtypes(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Lấy toàn bộ dữ liệu phân tích từ view VW_PHAN_TICH_TUYENSINH + QueQuan từ ThiSinh
+    Giảm bộ nhớ của DataFrame view (tại chỗ):
+    - Cột chuỗi lặp lại nhiều (ngành, khối, quê quán, giới tính) => category
+    Cột điểm giữ float64: float32 (27.3 => 27.299999) đổi kết quả làm tròn của trung bình và rơi sai bin
+    trên biên của phổ điểm / histogram, lệch với mode=sql và pd.cut
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def _build_view_query(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+):
+    """Query view + QueQuan với bộ lọc và tập cột đã chọn"""
+    query = (
+        db.query(*_view_select_columns(columns))
+        .select_from(ViewPhanTichTuyenSinh)
+        .join(ThiSinh, ViewPhanTichTuyenSinh.CCCD == ThiSinh.CCCD)
+    )
+    return _filter_view_query(query, nam_tuyen_sinh, ma_nganh, ma_pt)
+
+
+def get_view_admission_data(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Lấy dữ liệu phân tích từ view VW_PHAN_TICH_TUYENSINH + QueQuan từ ThiSinh
     View đã tính sẵn: HSA, TSA, IELTS, điểm xét tuyển theo phương thức
     Tự động làm sạch dữ liệu NULL/NaN và giá trị 0 trước khi trả về
+
+    **Bộ lọc (thực hiện trong SQL):**
+    - `nam_tuyen_sinh`: chỉ lấy thí sinh có hồ sơ nhập học năm đó (None = mọi năm)
+    - `ma_nganh`: chỉ lấy thí sinh nhập học ngành có mã tương ứng
+    - `ma_pt`: chỉ lấy thí sinh thuộc nhóm xét tuyển của phương thức tương ứng
+
+    **Giảm bộ nhớ:**
+    - `columns`: chỉ SELECT các cột này (tên cột của view và/hoặc "QueQuan"), None = tất cả
+    - `compact`: cột chuỗi thành category (sau khi làm sạch)
+    - Bộ nhớ của DataFrame (bytes) được lưu trong `df.attrs["memory_bytes"]`
     
     **Quy trình làm sạch:**
     - Chuyển all cột điểm sang kiểu numeric
@@ -80,24 +265,200 @@ def get_view_admission_data(db: Session) -> pd.DataFrame:
     - Nếu cột toàn NULL/0, set thành 0
     - Thống kê cleaning được lưu trong `df.attrs["cleaning_stats"]`
     """
-    query = (
-        db.query(ViewPhanTichTuyenSinh, ThiSinh.QueQuan)
-        .join(ThiSinh, ViewPhanTichTuyenSinh.CCCD == ThiSinh.CCCD)
-    )
-    df = pd.read_sql(query.statement, db.bind)
-    
-    # Áp dụng làm sạch dữ liệu ngay sau khi lấy từ DB
-    if not df.empty:
-        df = clean_admission_data(df)
+    query = _build_view_query(db, nam_tuyen_sinh, ma_nganh, ma_pt, columns)
+    with span("sql"):
+        df = pd.read_sql(query.statement, db.bind)
+    add_rows(len(df))
     
+    # Áp dụng làm sạch dữ liệu ngay sau khi lấy từ DB (df vừa đọc nên làm sạch tại chỗ)
+    with span("clean"):
+        if not df.empty:
+            df = clean_admission_data_fast(df, inplace=True)
+        if compact:
+            df = compact_admission_dtypes(df)
+
+    df.attrs["memory_bytes"] = int(df.memory_usage(deep=True).sum())
     return df
 
 
-def get_data_quality_stats(db: Session) -> dict:
+# Số dòng mỗi chunk khi đọc view theo kiểu streaming
+STREAM_CHUNKSIZE = int(os.getenv("ANALYTICS_STREAM_CHUNKSIZE", "50000"))
+
+
+def iter_view_admission_chunks(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Đọc view theo từng chunk bằng server-side cursor (stream_results), chưa làm sạch
+    Bộ nhớ chỉ giữ một chunk; dùng với các accumulator trong app.services.streaming
+    """
+    chunksize = chunksize or STREAM_CHUNKSIZE
+    query = _build_view_query(db, nam_tuyen_sinh, ma_nganh, ma_pt, columns)
+    connection = db.connection().execution_options(stream_results=True, max_row_buffer=chunksize)
+    reader = iter(pd.read_sql(query.statement, connection, chunksize=chunksize))
+    while True:
+        with span("sql"):
+            chunk = next(reader, None)
+        if chunk is None:
+            return
+        add_rows(len(chunk))
+        yield chunk
+
+
+# Router tải view dạng compact (category) trừ khi tắt qua biến môi trường
+COMPACT_DTYPES = os.getenv("ANALYTICS_COMPACT_DTYPES", "1") == "1"
+
+# Cache DataFrame đã làm sạch theo (năm, ngành, phương thức), cấu hình qua biến môi trường
+_view_cache = TTLCache(
+    maxsize=int(os.getenv("ANALYTICS_CACHE_MAXSIZE", "32")),
+    ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "300")),
+)
+
+# Snapshot DataFrame dùng chung giữa các worker (memory-map), tắt khi ANALYTICS_SNAPSHOT_DIR rỗng
+# "shm" => thư mục mặc định trên /dev/shm
+ANALYTICS_SNAPSHOT_DIR = os.getenv("ANALYTICS_SNAPSHOT_DIR", "")
+if ANALYTICS_SNAPSHOT_DIR == "shm":
+    ANALYTICS_SNAPSHOT_DIR = default_snapshot_dir()
+_snapshot_store = SnapshotStore(ANALYTICS_SNAPSHOT_DIR) if ANALYTICS_SNAPSHOT_DIR else None
+
+def get_data_version(db: Session, nam_tuyen_sinh: Optional[int] = None) -> tuple:
+    """
+    Probe rẻ để phát hiện dữ liệu thay đổi, một câu truy vấn:
+    (MAX(NgayXacNhan), COUNT(*)) trên HO_SO_NHAP_HOC + version trong TK_PHIEN_BAN
+    - Nếu có năm thì chỉ probe trong năm đó (dùng index IX_HSNH_NAM_CCCD)
+    - TK_PHIEN_BAN được tăng cùng transaction ghi dữ liệu (xem version_repo), nên thấy cả thay đổi
+      mà probe trên HO_SO_NHAP_HOC không thấy (nạp THISINH / DIEM_THI, sửa điểm, đổi ngành)
+    - Chỉ gồm giá trị trong DB: giống nhau giữa các worker (ETag, snapshot dùng chung)
+    """
+    query = db.query(
+        func.max(HoSoNhapHoc.NgayXacNhan), func.count(HoSoNhapHoc.CCCD), data_version_column(nam_tuyen_sinh)
+    )
+    if nam_tuyen_sinh is not None:
+        query = query.filter(HoSoNhapHoc.NamTuyenSinh == nam_tuyen_sinh)
+    with span("probe"):
+        max_date, row_count, phien_ban = query.one()
+    return (str(max_date) if max_date is not None else None, int(row_count or 0), int(phien_ban or 0))
+
+
+def get_cached_view_admission_data(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Giống `get_view_admission_data` nhưng dùng cache trong tiến trình
+    - Key: (năm, ngành, phương thức, tập cột, compact)
+    - Entry bị bỏ khi hết TTL, bị LRU loại, hoặc version dữ liệu thay đổi
+    - DataFrame trả về được dùng chung giữa các request: không sửa trực tiếp
+    - Bật ANALYTICS_SNAPSHOT_DIR: khi miss, worker gắn snapshot memory-map do worker khác đã tạo
+      (cùng version dữ liệu trong DB) thay vì tự truy vấn + làm sạch lại
+    """
+    key = (nam_tuyen_sinh, ma_nganh, ma_pt, tuple(columns) if columns is not None else None, compact)
+    version = get_data_version(db, nam_tuyen_sinh)
+    df = _view_cache.get(key, version)
+    if df is None:
+        def load():
+            return get_view_admission_data(db, nam_tuyen_sinh, ma_nganh, ma_pt, columns=columns, compact=compact)
+
+        if _snapshot_store is not None:
+            snapshot_key = (str(db.get_bind().url),) + key
+            with span("snapshot"):
+                df = _snapshot_store.get_or_create(snapshot_key, version, load)
+        else:
+            df = load()
+        _view_cache.set(key, df, version)
+    return df
+
+
+def get_view_cache_stats() -> dict:
+    """Thống kê hit/miss của cache view data, kèm tổng bộ nhớ các DataFrame đang cache"""
+    stats = _view_cache.stats()
+    stats["memory_bytes"] = sum(df.attrs.get("memory_bytes", 0) for df in _view_cache.values())
+    stats["snapshots"] = _snapshot_store.stats() if _snapshot_store is not None else None
+    return stats
+
+
+def clear_view_cache() -> None:
+    """
+    Xoá toàn bộ cache view data của tiến trình (kể cả snapshot dùng chung) để giải phóng bộ nhớ
+    ngay sau khi nạp dữ liệu; tính đúng đắn không phụ thuộc vào hàm này (version đã đổi trong DB)
+    """
+    _view_cache.invalidate()
+    if _snapshot_store is not None:
+        _snapshot_store.invalidate()
+
+
+# Cột của frame drill-down: cột analytics + các chiều lọc (khối, giới tính); CCCD để gắn phương thức
+EXPLORE_COLUMNS = ANALYTICS_COLUMNS + ["KhoiXetTuyen", "GioiTinh"]
+
+
+def get_explore_data(db: Session, nam_tuyen_sinh: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Dữ liệu cho API drill-down (/analytics/explore) của một năm
+    - Frame view đã làm sạch, dạng compact, gồm CCCD + EXPLORE_COLUMNS
+    - Bảng (CCCD, MaPT) các phương thức của thí sinh trong năm: một thí sinh có thể thuộc
+      nhiều phương thức nên không join thẳng vào frame (tránh nhân bản dòng)
+    """
+    df = get_view_admission_data(db, nam_tuyen_sinh, columns=["CCCD"] + EXPLORE_COLUMNS, compact=True)
+    query = (
+        db.query(HoSoNhapHoc.CCCD, NhomXetTuyen.MaPT)
+        .join(NhomXetTuyen, HoSoNhapHoc.MaNhom == NhomXetTuyen.MaNhom)
+        .filter(HoSoNhapHoc.NamTuyenSinh == nam_tuyen_sinh)
+        .distinct()
+    )
+    with span("sql"):
+        methods = pd.read_sql(query.statement, db.bind)
+    return df, methods
+
+
+def get_trend_data(db: Session, from_year: int, to_year: int) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Dữ liệu xu hướng nhiều năm, đọc trong một truy vấn (hồ sơ năm [from_year, to_year] + view + quê quán)
+
+    Returns:
+        - applications: mỗi hồ sơ một dòng (NamTuyenSinh, MaNganh, QueQuan), để đếm như
+          get_admission_by_major / get_demographics_by_province
+        - students: mỗi thí sinh một dòng mỗi năm với các cột ANALYTICS_COLUMNS, làm sạch riêng theo
+          từng năm (giống get_view_admission_data của năm đó)
+        - majors: MaNganh, TenNganh, ChiTieu
+    """
+    score_columns = [getattr(ViewPhanTichTuyenSinh, col) for col in ANALYTICS_COLUMNS if col != "QueQuan"]
+    query = (
+        db.query(HoSoNhapHoc.NamTuyenSinh, HoSoNhapHoc.CCCD, HoSoNhapHoc.MaNganh, ThiSinh.QueQuan, *score_columns)
+        .select_from(HoSoNhapHoc)
+        .join(ThiSinh, HoSoNhapHoc.CCCD == ThiSinh.CCCD)
+        .join(ViewPhanTichTuyenSinh, HoSoNhapHoc.CCCD == ViewPhanTichTuyenSinh.CCCD)
+        .filter(HoSoNhapHoc.NamTuyenSinh.between(from_year, to_year))
+    )
+    majors_query = db.query(Nganh.MaNganh, Nganh.TenNganh, Nganh.ChiTieu).order_by(Nganh.TenNganh)
+    with span("sql"):
+        df = pd.read_sql(query.statement, db.bind)
+        majors = pd.read_sql(majors_query.statement, db.bind)
+    add_rows(len(df))
+
+    applications = df[["NamTuyenSinh", "MaNganh", "QueQuan"]]
+    with span("clean"):
+        students = df.drop_duplicates(["NamTuyenSinh", "CCCD"])[["NamTuyenSinh"] + ANALYTICS_COLUMNS]
+        students = pd.concat(
+            [clean_admission_data_fast(group) for _, group in students.groupby("NamTuyenSinh", sort=True)]
+            or [students]
+        )
+    return applications, students, majors
+
+
+def get_data_quality_stats(db: Session, nam_tuyen_sinh: Optional[int] = None) -> dict:
     """
     Lấy thống kê chất lượng dữ liệu - bao gồm tổng số NULL được thay thế
     """
-    df = get_view_admission_data(db)
+    df = get_view_admission_data(db, nam_tuyen_sinh)
     
     if df.empty:
         return {"total_records": 0, "cleaning_stats": {}}
@@ -107,6 +468,7 @@ def get_data_quality_stats(db: Session) -> dict:
     return {
         "total_records": len(df),
         "total_columns": len(df.columns),
+        "memory_bytes": df.attrs.get("memory_bytes", 0),
         "columns_cleaned": len(cleaning_stats),
         "cleaning_details": cleaning_stats
     }
@@ -117,7 +479,7 @@ def get_admitted_students_exam_scores(db: Session, nam_tuyen_sinh: int = 2024) -
     """
     Wrapper của view data (đã làm sạch) cho tương thích API
     """
-    return get_view_admission_data(db)
+    return get_view_admission_data(db, nam_tuyen_sinh)
 
 
 def get_admitted_students_scores(db: Session, nam_tuyen_sinh: int = 2024) -> pd.DataFrame:
@@ -125,7 +487,7 @@ def get_admitted_students_scores(db: Session, nam_tuyen_sinh: int = 2024) -> pd.
     Lấy dữ liệu điểm của thí sinh nhập học từ view (đã làm sạch)
     View đã chuẩn bị: TongDiemTHPT, HSA, TSA, IELTS, DiemXetTuyen
     """
-    df = get_view_admission_data(db)
+    df = get_view_admission_data(db, nam_tuyen_sinh)
     if df.empty:
         return pd.DataFrame(
             columns=[
@@ -159,10 +521,17 @@ def get_admitted_students_scores(db: Session, nam_tuyen_sinh: int = 2024) -> pd.
     return df
 
 
-def get_admission_by_major(db: Session, nam_tuyen_sinh: int = 2024) -> pd.DataFrame:
+def get_admission_by_major(db: Session, nam_tuyen_sinh: int = 2024, use_rollup: bool = True) -> pd.DataFrame:
     """
     Thống kê số lượng nhập học so với chỉ tiêu từng ngành từ bảng NGANH và HO_SO_NHAP_HOC
+    Đọc từ rollup TK_NGANH_NAM nếu rollup của năm đã cập nhật đủ
     """
+    if use_rollup and is_rollup_fresh(db, nam_tuyen_sinh):
+        with span("sql"):
+            df = get_rollup_admission_by_major(db, nam_tuyen_sinh)
+        add_rows(len(df))
+        return df
+
     query = (
         db.query(
             Nganh.TenNganh,
@@ -174,14 +543,23 @@ def get_admission_by_major(db: Session, nam_tuyen_sinh: int = 2024) -> pd.DataFr
         .order_by(Nganh.TenNganh)
     )
     
-    df = pd.read_sql(query.statement, db.bind)
+    with span("sql"):
+        df = pd.read_sql(query.statement, db.bind)
+    add_rows(len(df))
     return df if not df.empty else pd.DataFrame(columns=["TenNganh", "ChiTieu", "so_luong_nhap_hoc"])
 
 
-def get_demographics_by_province(db: Session, nam_tuyen_sinh: int = 2024) -> pd.DataFrame:
+def get_demographics_by_province(db: Session, nam_tuyen_sinh: int = 2024, use_rollup: bool = True) -> pd.DataFrame:
     """
     Lấy thông tin phân bố địa lý theo quê quán từ bảng ThiSinh
+    Đọc từ rollup TK_TINH_NAM nếu rollup của năm đã cập nhật đủ
     """
+    if use_rollup and is_rollup_fresh(db, nam_tuyen_sinh):
+        with span("sql"):
+            df = get_rollup_demographics_by_province(db, nam_tuyen_sinh)
+        add_rows(len(df))
+        return df
+
     query = (
         db.query(
             ThiSinh.QueQuan,
@@ -193,5 +571,7 @@ def get_demographics_by_province(db: Session, nam_tuyen_sinh: int = 2024) -> pd.
         .order_by(func.count(ThiSinh.CCCD).desc())
     )
     
-    df = pd.read_sql(query.statement, db.bind)
+    with span("sql"):
+        df = pd.read_sql(query.statement, db.bind)
+    add_rows(len(df))
     return df if not df.empty else pd.DataFrame(columns=["QueQuan", "so_luong"])
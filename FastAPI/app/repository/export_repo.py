@@ -0,0 +1,64 @@
+from sqlalchemy import Date, Float, Integer
+from sqlalchemy.orm import Session
+from typing import Iterator, List, Optional
+import pandas as pd
+from app.models import ViewPhanTichTuyenSinh, ThiSinh
+from app.repository.aggregation_repo import get_score_column_stats
+from app.repository.analytics_repo import fill_admission_scores, iter_view_admission_chunks
+
+# Cột mặc định khi export: toàn bộ view + QueQuan
+EXPORT_COLUMNS = [column.name for column in ViewPhanTichTuyenSinh.__table__.columns] + ["QueQuan"]
+
+
+def get_export_column_kinds(columns: List[str]) -> dict:
+    """Kiểu dữ liệu ("string" / "float" / "integer" / "date") của các cột export, dùng để dựng schema cố định"""
+    kinds = {}
+    for name in columns:
+        if name == "QueQuan":
+            column_type = ThiSinh.__table__.columns["QueQuan"].type
+        elif name in ViewPhanTichTuyenSinh.__table__.columns:
+            column_type = ViewPhanTichTuyenSinh.__table__.columns[name].type
+        else:
+            raise ValueError(f"Cột không hợp lệ: {name}")
+
+        if isinstance(column_type, Float):
+            kinds[name] = "float"
+        elif isinstance(column_type, Integer):
+            kinds[name] = "integer"
+        elif isinstance(column_type, Date):
+            kinds[name] = "date"
+        else:
+            kinds[name] = "string"
+    return kinds
+
+
+def get_cleaning_fill_values(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+) -> dict:
+    """Giá trị clean_admission_data dùng để thay NULL/0 cho từng cột điểm, tính bằng một aggregate SQL"""
+    stats = get_score_column_stats(db, nam_tuyen_sinh, ma_nganh, ma_pt)
+    return {
+        col: (col_stats["pos_sum"] / col_stats["pos_count"] if col_stats["pos_count"] > 0 else 0.0)
+        for col, col_stats in stats["columns"].items()
+    }
+
+
+def iter_cleaned_view_chunks(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Đọc view đã làm sạch theo từng chunk (hai lượt: aggregate lấy trung bình, rồi stream dữ liệu)
+    Kết quả ghép lại giống clean_admission_data trên toàn bộ dữ liệu, bộ nhớ chỉ giữ một chunk
+    """
+    columns = columns or EXPORT_COLUMNS
+    fill_values = get_cleaning_fill_values(db, nam_tuyen_sinh, ma_nganh, ma_pt)
+    for chunk in iter_view_admission_chunks(db, nam_tuyen_sinh, ma_nganh, ma_pt, columns=columns, chunksize=chunksize):
+        yield fill_admission_scores(chunk, fill_values)
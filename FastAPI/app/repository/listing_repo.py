@@ -0,0 +1,123 @@
+import base64
+import json
+import os
+from sqlalchemy import case, func, tuple_
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+import pandas as pd
+from app.core.cache import TTLCache
+from app.core.metrics import add_rows, span
+from app.models import ViewPhanTichTuyenSinh
+from app.repository.analytics_repo import (
+    SCORE_COLUMNS,
+    _build_view_query,
+    fill_admission_scores,
+    get_data_version,
+)
+from app.repository.export_repo import get_cleaning_fill_values
+
+# Cột trả về cho từng thí sinh
+LISTING_COLUMNS = ["CCCD", "HoTen", "GioiTinh", "TenNganh", "KhoiXetTuyen", "QueQuan"] + SCORE_COLUMNS
+
+# Cột được phép sắp xếp: điểm xét tuyển cuối cùng và điểm theo từng phương thức
+LISTING_SORT_COLUMNS = ["DiemXetTuyen", "DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT", "DXT_IELTS_DGNL", "DXT_IELTS_THPT"]
+
+LISTING_MAX_LIMIT = int(os.getenv("ANALYTICS_LISTING_MAX_LIMIT", "500"))
+
+# Số chữ số thập phân của khoá sắp xếp (điểm hơn kém nhau ít hơn mức này xếp theo CCCD)
+LISTING_SORT_PRECISION = 6
+
+# Giá trị điền NULL/0 theo bộ lọc (một aggregate quét view), dùng lại cho mọi trang cùng version
+_fill_values_cache = TTLCache(maxsize=64, ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "300")))
+
+
+def encode_cursor(sort_value: float, cccd: str) -> str:
+    """Cursor mờ (opaque) của dòng cuối trang: (giá trị sắp xếp đã làm sạch, CCCD)"""
+    raw = json.dumps([sort_value, cccd], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, cccd = json.loads(raw)
+        return float(sort_value), str(cccd)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Cursor không hợp lệ") from exc
+
+
+def _get_fill_values(db: Session, nam_tuyen_sinh: Optional[int], ma_nganh: Optional[str], ma_pt: Optional[str]) -> dict:
+    key = (nam_tuyen_sinh, ma_nganh, ma_pt)
+    version = get_data_version(db, nam_tuyen_sinh)
+    fill_values = _fill_values_cache.get(key, version)
+    if fill_values is None:
+        with span("sql"):
+            fill_values = get_cleaning_fill_values(db, nam_tuyen_sinh, ma_nganh, ma_pt)
+        _fill_values_cache.set(key, fill_values, version)
+    return fill_values
+
+
+def get_student_page(
+    db: Session,
+    nam_tuyen_sinh: Optional[int] = None,
+    ma_nganh: Optional[str] = None,
+    ma_pt: Optional[str] = None,
+    sort: str = "DiemXetTuyen",
+    descending: bool = True,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Một trang thí sinh của view, sắp xếp theo điểm đã làm sạch, phân trang keyset
+    - Thứ tự: (điểm sau làm sạch, CCCD) => ổn định, không trùng / sót dòng giữa các trang
+    - Trang sau lọc `(điểm, CCCD) < cursor` (hoặc > khi tăng dần) thay vì OFFSET: mỗi trang chỉ
+      đọc / làm sạch / trả về limit + 1 dòng, trang sâu không phải chuyển các dòng phía trước
+    - Giới hạn: khoá sắp xếp là biểu thức tính (CASE điền NULL/0 + ROUND) trên view VW_PHAN_TICH_TUYENSINH,
+      mà các cột DXT_* / DiemXetTuyen vốn được view tính ra, nên không có index nào dùng được; DB vẫn quét
+      tập đã lọc và chọn top-N theo biểu thức ở mọi trang (O(n log limit)), chỉ tránh được chi phí OFFSET
+    - Điểm NULL/0 được sắp xếp và trả về bằng giá trị điền của clean_admission_data
+      (trung bình các giá trị > 0 của cả tập lọc), chỉ các dòng của trang được tải và làm sạch
+
+    Returns:
+        (DataFrame các dòng của trang, cursor của trang kế tiếp hoặc None nếu hết)
+    """
+    if sort not in LISTING_SORT_COLUMNS:
+        raise ValueError(f"Không sắp xếp được theo cột: {sort}")
+    if not 1 <= limit <= LISTING_MAX_LIMIT:
+        raise ValueError(f"limit phải trong khoảng 1..{LISTING_MAX_LIMIT}")
+    after = decode_cursor(cursor) if cursor else None
+
+    fill_values = _get_fill_values(db, nam_tuyen_sinh, ma_nganh, ma_pt)
+    column = getattr(ViewPhanTichTuyenSinh, sort)
+    # Cùng quy tắc với fill_admission_scores; làm tròn để giá trị đọc ra (cột FLOAT của MySQL)
+    # so sánh lại với chính biểu thức trong trang sau được chính xác
+    sort_key = func.round(
+        case((column.is_(None) | (column == 0), fill_values[sort]), else_=column),
+        LISTING_SORT_PRECISION,
+    ).label("sort_key")
+    cccd = ViewPhanTichTuyenSinh.CCCD
+
+    query = _build_view_query(db, nam_tuyen_sinh, ma_nganh, ma_pt, LISTING_COLUMNS).add_columns(sort_key)
+    if after is not None:
+        position = tuple_(sort_key, cccd)
+        query = query.filter(position < tuple_(*after) if descending else position > tuple_(*after))
+    if descending:
+        query = query.order_by(sort_key.desc(), cccd.desc())
+    else:
+        query = query.order_by(sort_key.asc(), cccd.asc())
+    query = query.limit(limit + 1)
+
+    with span("sql"):
+        df = pd.read_sql(query.statement, db.bind)
+    add_rows(len(df))
+
+    has_more = len(df) > limit
+    df = df.iloc[:limit]
+    next_cursor = None
+    if has_more:
+        last = df.iloc[-1]
+        next_cursor = encode_cursor(float(last["sort_key"]), str(last["CCCD"]))
+
+    with span("clean"):
+        df = fill_admission_scores(df.drop(columns="sort_key"), fill_values)
+    return df, next_cursor
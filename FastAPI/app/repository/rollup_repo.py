@@ -0,0 +1,268 @@
+from datetime import date, datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, exists, literal, or_, update
+from typing import Optional
+import pandas as pd
+from app.models import (
+    HoSoNhapHoc,
+    Nganh,
+    ThiSinh,
+    TkBinDiemNam,
+    TkNganhNam,
+    TkPhuongThucNam,
+    TkTinhNam,
+    TkWatermark,
+    ViewPhanTichTuyenSinh,
+)
+from app.repository.version_repo import get_year_version
+
+# Các cột điểm xét tuyển theo phương thức được tổng hợp (giống DXT_METHOD_COLUMNS của services)
+ROLLUP_METHOD_COLUMNS = ["DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT", "DXT_IELTS_DGNL", "DXT_IELTS_THPT"]
+
+# Độ rộng bin điểm xét tuyển trong TK_BIN_DIEM_NAM
+ROLLUP_BIN_WIDTH = 5
+
+ROLLUP_MODELS = [TkNganhNam, TkTinhNam, TkPhuongThucNam, TkBinDiemNam]
+
+
+def _processed_condition(nam_tuyen_sinh: int, ngay_chot: date):
+    """Hồ sơ đã nằm trong rollup khi watermark là `ngay_chot`"""
+    return (HoSoNhapHoc.NamTuyenSinh == nam_tuyen_sinh) & or_(
+        HoSoNhapHoc.NgayXacNhan.is_(None),
+        HoSoNhapHoc.NgayXacNhan < ngay_chot,
+    )
+
+
+def _delta_condition(nam_tuyen_sinh: int, ngay_chot_cu: Optional[date], ngay_chot_moi: date):
+    """Hồ sơ mới cần cộng thêm khi dời watermark từ `ngay_chot_cu` sang `ngay_chot_moi`"""
+    if ngay_chot_cu is None:
+        return _processed_condition(nam_tuyen_sinh, ngay_chot_moi)
+    return (
+        (HoSoNhapHoc.NamTuyenSinh == nam_tuyen_sinh)
+        & (HoSoNhapHoc.NgayXacNhan >= ngay_chot_cu)
+        & (HoSoNhapHoc.NgayXacNhan < ngay_chot_moi)
+    )
+
+
+def _count_rows(db: Session, condition) -> int:
+    return int(db.query(func.count(HoSoNhapHoc.CCCD)).filter(condition).scalar() or 0)
+
+
+def _add_counts(db: Session, model, nam_tuyen_sinh: int, key_column: str, counts: dict, value_columns: tuple):
+    """Cộng dồn delta vào bảng rollup (bảng nhỏ: vài chục đến vài trăm dòng mỗi năm)"""
+    for key, values in counts.items():
+        row = db.get(model, (nam_tuyen_sinh, key))
+        if row is None:
+            row = model(NamTuyenSinh=nam_tuyen_sinh, **{key_column: key})
+            for column in value_columns:
+                setattr(row, column, 0)
+            db.add(row)
+        for column, value in zip(value_columns, values):
+            setattr(row, column, (getattr(row, column) or 0) + value)
+
+
+def _aggregate_delta(db: Session, nam_tuyen_sinh: int, delta, processed) -> dict:
+    """Tính các rollup cho phần hồ sơ mới"""
+    majors = (
+        db.query(HoSoNhapHoc.MaNganh, func.count(HoSoNhapHoc.CCCD))
+        .filter(delta)
+        .group_by(HoSoNhapHoc.MaNganh)
+        .all()
+    )
+    provinces = (
+        db.query(ThiSinh.QueQuan, func.count(ThiSinh.CCCD))
+        .join(HoSoNhapHoc, ThiSinh.CCCD == HoSoNhapHoc.CCCD)
+        .filter(delta)
+        .group_by(ThiSinh.QueQuan)
+        .all()
+    )
+
+    # Điểm lấy từ view, mỗi thí sinh chỉ tính một lần trong năm:
+    # thí sinh có hồ sơ mới và chưa có hồ sơ nào đã được tổng hợp trước đó
+    candidate = exists().where((HoSoNhapHoc.CCCD == ViewPhanTichTuyenSinh.CCCD) & delta)
+    if processed is not None:
+        candidate = candidate & ~exists().where((HoSoNhapHoc.CCCD == ViewPhanTichTuyenSinh.CCCD) & processed)
+
+    method_columns = []
+    for col_name in ROLLUP_METHOD_COLUMNS:
+        col = getattr(ViewPhanTichTuyenSinh, col_name)
+        method_columns.append(func.sum(case((col > 0, 1), else_=0)))
+        method_columns.append(func.sum(case((col > 0, col), else_=None)))
+    method_row = (
+        db.query(*method_columns)
+        .select_from(ViewPhanTichTuyenSinh)
+        .join(ThiSinh, ViewPhanTichTuyenSinh.CCCD == ThiSinh.CCCD)
+        .filter(candidate)
+        .one()
+    )
+
+    score = ViewPhanTichTuyenSinh.DiemXetTuyen
+    bucket = case(
+        (score <= ROLLUP_BIN_WIDTH, 0),
+        else_=func.ceil(score / ROLLUP_BIN_WIDTH) - 1,
+    ).label("bucket")
+    buckets = (
+        db.query(bucket, func.count(literal(1)))
+        .select_from(ViewPhanTichTuyenSinh)
+        .join(ThiSinh, ViewPhanTichTuyenSinh.CCCD == ThiSinh.CCCD)
+        .filter(candidate & (score > 0))
+        .group_by(bucket)
+        .all()
+    )
+
+    methods = {}
+    for i, col_name in enumerate(ROLLUP_METHOD_COLUMNS):
+        so_luong = int(method_row[2 * i] or 0)
+        if so_luong > 0:
+            methods[col_name] = (so_luong, float(method_row[2 * i + 1] or 0))
+
+    return {
+        "majors": {ma_nganh: (int(so_luong),) for ma_nganh, so_luong in majors},
+        "provinces": {(que_quan or ""): (int(so_luong),) for que_quan, so_luong in provinces},
+        "methods": methods,
+        "buckets": {int(b): (int(so_luong),) for b, so_luong in buckets},
+    }
+
+
+def _lock_watermark(db: Session, nam_tuyen_sinh: int) -> TkWatermark:
+    """
+    Khoá dòng TK_WATERMARK của năm tới hết transaction (tạo dòng rỗng nếu chưa có), để các lần refresh
+    đồng thời (nhiều worker, /rollups/refresh cùng lúc với hook sau nạp dữ liệu) chạy lần lượt và lần sau
+    đọc watermark lần trước đã ghi, không cộng trùng delta
+    Khoá bằng UPDATE thay vì SELECT ... FOR UPDATE: khoá dòng trên MySQL / PostgreSQL và khoá ghi trên
+    SQLite (FOR UPDATE bị bỏ qua); phải là lệnh đầu tiên của transaction
+    """
+    touch = update(TkWatermark).where(TkWatermark.NamTuyenSinh == nam_tuyen_sinh).values(CapNhatLuc=datetime.now())
+    if db.execute(touch).rowcount == 0:
+        try:
+            with db.begin_nested():
+                db.add(TkWatermark(NamTuyenSinh=nam_tuyen_sinh, CapNhatLuc=datetime.now()))
+        except IntegrityError:
+            # Refresh khác vừa tạo dòng: chờ khoá của nó
+            db.execute(touch)
+    return (
+        db.query(TkWatermark)
+        .filter(TkWatermark.NamTuyenSinh == nam_tuyen_sinh)
+        .populate_existing()
+        .one()
+    )
+
+
+def refresh_rollups(db: Session, nam_tuyen_sinh: int, ngay_chot: Optional[date] = None) -> dict:
+    """
+    Cập nhật rollup của một năm từ watermark đã lưu
+    - Chỉ tổng hợp các ngày đã đóng (NgayXacNhan < ngay_chot, mặc định là hôm nay)
+    - Incremental: chỉ quét hồ sơ trong [watermark cũ, ngay_chot)
+    - Full rebuild khi chưa có watermark, số hồ sơ cũ đã thay đổi (xoá/bổ sung lùi ngày), hoặc
+      version dữ liệu của năm (TK_PHIEN_BAN) đã tăng từ lần trước: mọi lần nạp dữ liệu chạm tới năm
+      đều tăng version, kể cả khi chỉ sửa ngành / quê quán / điểm mà số hồ sơ không đổi
+    """
+    ngay_chot = ngay_chot or date.today()
+    watermark = _lock_watermark(db, nam_tuyen_sinh)
+    # Đọc trước khi tổng hợp: lần nạp xen giữa sẽ tăng version và buộc lần sau tổng hợp lại
+    phien_ban = get_year_version(db, nam_tuyen_sinh)
+
+    full_rebuild = (
+        watermark.NgayChot is None
+        or watermark.PhienBan != phien_ban
+        or ngay_chot < watermark.NgayChot
+        or _count_rows(db, _processed_condition(nam_tuyen_sinh, watermark.NgayChot)) != watermark.SoDong
+    )
+
+    if full_rebuild:
+        for model in ROLLUP_MODELS:
+            db.query(model).filter(model.NamTuyenSinh == nam_tuyen_sinh).delete(synchronize_session=False)
+        ngay_chot_cu = None
+        processed = None
+    else:
+        ngay_chot_cu = watermark.NgayChot
+        processed = _processed_condition(nam_tuyen_sinh, ngay_chot_cu)
+
+    delta = _delta_condition(nam_tuyen_sinh, ngay_chot_cu, ngay_chot)
+    delta_rows = _count_rows(db, delta)
+    if delta_rows > 0:
+        aggregates = _aggregate_delta(db, nam_tuyen_sinh, delta, processed)
+        _add_counts(db, TkNganhNam, nam_tuyen_sinh, "MaNganh", aggregates["majors"], ("SoLuongNhapHoc",))
+        _add_counts(db, TkTinhNam, nam_tuyen_sinh, "QueQuan", aggregates["provinces"], ("SoLuong",))
+        _add_counts(db, TkPhuongThucNam, nam_tuyen_sinh, "PhuongThuc", aggregates["methods"], ("SoLuong", "TongDiem"))
+        _add_counts(db, TkBinDiemNam, nam_tuyen_sinh, "Bin", aggregates["buckets"], ("SoLuong",))
+
+    watermark.NgayChot = ngay_chot
+    watermark.SoDong = _count_rows(db, _processed_condition(nam_tuyen_sinh, ngay_chot))
+    watermark.PhienBan = phien_ban
+    watermark.CapNhatLuc = datetime.now()
+    db.commit()
+
+    return {
+        "year": nam_tuyen_sinh,
+        "mode": "full" if full_rebuild else "incremental",
+        "delta_rows": delta_rows,
+        "watermark": str(ngay_chot),
+        "total_rows": watermark.SoDong,
+    }
+
+
+def get_admission_years(db: Session) -> list:
+    """Các năm tuyển sinh có trong HO_SO_NHAP_HOC (tăng dần)"""
+    return [
+        nam for (nam,) in db.query(HoSoNhapHoc.NamTuyenSinh).distinct().order_by(HoSoNhapHoc.NamTuyenSinh)
+        if nam is not None
+    ]
+
+
+def refresh_all_rollups(db: Session, ngay_chot: Optional[date] = None) -> list:
+    """Cập nhật rollup cho mọi năm có trong HO_SO_NHAP_HOC"""
+    return [refresh_rollups(db, nam, ngay_chot) for nam in get_admission_years(db)]
+
+
+def is_rollup_fresh(db: Session, nam_tuyen_sinh: int) -> bool:
+    """
+    Rollup được coi là mới khi mọi hồ sơ của năm đã được tổng hợp và dữ liệu của năm không bị nạp lại
+    từ lần tổng hợp đó (version TK_PHIEN_BAN trùng với watermark)
+    (năm đã đóng luôn mới sau lần refresh đầu; năm đang tuyển chỉ mới khi chưa có hồ sơ sau watermark)
+    """
+    watermark = db.get(TkWatermark, nam_tuyen_sinh)
+    if watermark is None or watermark.SoDong is None or watermark.PhienBan is None:
+        return False
+    if get_year_version(db, nam_tuyen_sinh) != watermark.PhienBan:
+        return False
+    return _count_rows(db, HoSoNhapHoc.NamTuyenSinh == nam_tuyen_sinh) == watermark.SoDong
+
+
+def get_rollup_admission_by_major(db: Session, nam_tuyen_sinh: int) -> pd.DataFrame:
+    """Giống get_admission_by_major nhưng đọc từ TK_NGANH_NAM"""
+    query = (
+        db.query(
+            Nganh.TenNganh,
+            Nganh.ChiTieu,
+            func.coalesce(TkNganhNam.SoLuongNhapHoc, 0).label("so_luong_nhap_hoc"),
+        )
+        .outerjoin(TkNganhNam, (Nganh.MaNganh == TkNganhNam.MaNganh) & (TkNganhNam.NamTuyenSinh == nam_tuyen_sinh))
+        .order_by(Nganh.TenNganh)
+    )
+    return pd.read_sql(query.statement, db.bind)
+
+
+def get_rollup_demographics_by_province(db: Session, nam_tuyen_sinh: int) -> pd.DataFrame:
+    """Giống get_demographics_by_province nhưng đọc từ TK_TINH_NAM"""
+    query = (
+        db.query(TkTinhNam.QueQuan, TkTinhNam.SoLuong.label("so_luong"))
+        .filter(TkTinhNam.NamTuyenSinh == nam_tuyen_sinh, TkTinhNam.SoLuong > 0)
+        .order_by(TkTinhNam.SoLuong.desc())
+    )
+    df = pd.read_sql(query.statement, db.bind)
+    df["QueQuan"] = df["QueQuan"].replace("", None)
+    return df
+
+
+def get_rollup_method_stats(db: Session, nam_tuyen_sinh: int) -> dict:
+    """Số lượng và tổng điểm > 0 theo từng cột DXT_* của năm"""
+    rows = db.query(TkPhuongThucNam).filter(TkPhuongThucNam.NamTuyenSinh == nam_tuyen_sinh).all()
+    return {row.PhuongThuc: {"pos_count": int(row.SoLuong or 0), "pos_sum": float(row.TongDiem or 0)} for row in rows}
+
+
+def get_rollup_score_buckets(db: Session, nam_tuyen_sinh: int) -> dict:
+    """Số thí sinh theo bin điểm xét tuyển (chỉ điểm > 0) của năm"""
+    rows = db.query(TkBinDiemNam).filter(TkBinDiemNam.NamTuyenSinh == nam_tuyen_sinh).all()
+    return {int(row.Bin): int(row.SoLuong) for row in rows if row.SoLuong}
@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session
+from typing import Tuple
+import pandas as pd
+from app.core.metrics import add_rows, span
+from app.models import HoSoNhapHoc, Nganh, NhomXetTuyen, ViewPhanTichTuyenSinh
+
+# Điểm theo phương thức của view + điểm cuối cùng (dùng khi phương thức không có cột DXT_ riêng)
+SIMULATION_SCORE_COLUMNS = [
+    "DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT", "DXT_IELTS_DGNL", "DXT_IELTS_THPT", "DiemXetTuyen",
+]
+
+
+def get_simulation_data(db: Session, nam_tuyen_sinh: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Dữ liệu cho mô phỏng xét tuyển của một năm
+    - Hồ sơ: mỗi dòng (CCCD, MaNganh) của HO_SO_NHAP_HOC kèm MaPT của nhóm xét tuyển,
+      NgayXacNhan (thứ tự nguyện vọng) và điểm gốc theo phương thức của thí sinh (chưa làm sạch:
+      hồ sơ thiếu điểm không được xét thay vì nhận điểm trung bình)
+    - Ngành: MaNganh, TenNganh, ChiTieu
+    """
+    score_columns = [getattr(ViewPhanTichTuyenSinh, col) for col in SIMULATION_SCORE_COLUMNS]
+    query = (
+        db.query(
+            HoSoNhapHoc.CCCD,
+            HoSoNhapHoc.MaNganh,
+            NhomXetTuyen.MaPT,
+            HoSoNhapHoc.NgayXacNhan,
+            *score_columns,
+        )
+        .join(NhomXetTuyen, HoSoNhapHoc.MaNhom == NhomXetTuyen.MaNhom)
+        .join(ViewPhanTichTuyenSinh, HoSoNhapHoc.CCCD == ViewPhanTichTuyenSinh.CCCD)
+        .filter(HoSoNhapHoc.NamTuyenSinh == nam_tuyen_sinh)
+    )
+    majors_query = db.query(Nganh.MaNganh, Nganh.TenNganh, Nganh.ChiTieu)
+    with span("sql"):
+        applications = pd.read_sql(query.statement, db.bind)
+        majors = pd.read_sql(majors_query.statement, db.bind)
+    add_rows(len(applications))
+    return applications, majors
@@ -0,0 +1,42 @@
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+from app.models import TkPhanViNam
+
+# Cột điểm có quantile sketch: điểm xét tuyển cuối cùng và từng phương thức
+SKETCH_COLUMNS = ["DiemXetTuyen", "DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT", "DXT_IELTS_DGNL", "DXT_IELTS_THPT"]
+
+
+def sketch_version_token(version: tuple) -> str:
+    """Version lưu cùng digest: get_data_version của năm (chỉ gồm giá trị trong DB, giống nhau giữa các worker)"""
+    return repr(tuple(version))
+
+
+def load_quantile_sketches(db: Session, nam_tuyen_sinh: int, version_token: str) -> Optional[Dict[Tuple[str, str], bytes]]:
+    """Digest đã lưu của năm {(TenNganh, cột): bytes}; None nếu chưa có hoặc khác version"""
+    rows = db.query(TkPhanViNam).filter(TkPhanViNam.NamTuyenSinh == nam_tuyen_sinh).all()
+    if not rows or any(row.PhienBan != version_token for row in rows):
+        return None
+    return {(row.TenNganh, row.PhuongThuc): row.Digest for row in rows}
+
+
+def save_quantile_sketches(
+    db: Session,
+    nam_tuyen_sinh: int,
+    version_token: str,
+    sketches: Dict[Tuple[str, str], Tuple[int, bytes]],
+) -> int:
+    """Thay toàn bộ digest của năm bằng `sketches` {(TenNganh, cột): (số lượng, bytes)} trong một transaction"""
+    db.query(TkPhanViNam).filter(TkPhanViNam.NamTuyenSinh == nam_tuyen_sinh).delete(synchronize_session=False)
+    db.add_all(
+        TkPhanViNam(
+            NamTuyenSinh=nam_tuyen_sinh,
+            TenNganh=ten_nganh,
+            PhuongThuc=phuong_thuc,
+            SoLuong=so_luong,
+            Digest=digest,
+            PhienBan=version_token,
+        )
+        for (ten_nganh, phuong_thuc), (so_luong, digest) in sketches.items()
+    )
+    db.commit()
+    return len(sketches)
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Iterable, Optional, Set
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import HoSoNhapHoc, TkPhienBan
+
+# Số CCCD mỗi lần tra năm tuyển sinh (giới hạn số tham số của một câu lệnh)
+LOOKUP_CHUNK = 1000
+
+
+def data_version_column(nam_tuyen_sinh: Optional[int] = None):
+    """
+    Scalar subquery version dữ liệu trong DB (giống nhau giữa các worker), gộp vào câu probe của
+    get_data_version; không có năm => tổng version mọi năm
+    """
+    query = select(func.coalesce(func.sum(TkPhienBan.PhienBan), 0))
+    if nam_tuyen_sinh is not None:
+        query = query.where(TkPhienBan.NamTuyenSinh == nam_tuyen_sinh)
+    return query.scalar_subquery()
+
+
+def get_year_version(db: Session, nam_tuyen_sinh: int) -> int:
+    """Version hiện tại của một năm (0 nếu chưa từng tăng)"""
+    return int(db.query(data_version_column(nam_tuyen_sinh)).scalar() or 0)
+
+
+def get_admission_years_of(db: Session, cccds: Iterable[str]) -> Set[int]:
+    """Các năm tuyển sinh có hồ sơ của những thí sinh này (dữ liệu bị ảnh hưởng khi ghi đè thí sinh / điểm)"""
+    cccds = list(dict.fromkeys(cccd for cccd in cccds if cccd is not None))
+    years = set()
+    for start in range(0, len(cccds), LOOKUP_CHUNK):
+        rows = (
+            db.query(HoSoNhapHoc.NamTuyenSinh)
+            .filter(HoSoNhapHoc.CCCD.in_(cccds[start:start + LOOKUP_CHUNK]))
+            .distinct()
+        )
+        years.update(nam for (nam,) in rows if nam is not None)
+    return years
+
+
+def bump_data_versions(db: Session, years: Iterable[int]) -> None:
+    """
+    Tăng version của các năm trong transaction hiện tại (không commit): version đổi cùng lúc
+    với dữ liệu, mọi worker thấy ở lần probe kế tiếp
+    """
+    now = datetime.now()
+    for year in sorted(set(years)):
+        if _increment(db, year, now):
+            continue
+        try:
+            # Năm chưa có dòng version; request khác có thể vừa tạo => tăng lại
+            with db.begin_nested():
+                db.add(TkPhienBan(NamTuyenSinh=year, PhienBan=1, CapNhatLuc=now))
+        except IntegrityError:
+            _increment(db, year, now)
+
+
+def _increment(db: Session, year: int, now: datetime) -> bool:
+    updated = (
+        db.query(TkPhienBan)
+        .filter(TkPhienBan.NamTuyenSinh == year)
+        .update({TkPhienBan.PhienBan: TkPhienBan.PhienBan + 1, TkPhienBan.CapNhatLuc: now}, synchronize_session=False)
+    )
+    return updated > 0
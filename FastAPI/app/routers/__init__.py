@@ -1 +1 @@
-from . import analytics
+from . import admission, analytics, metrics
@@ -0,0 +1,63 @@
+import os
+import tempfile
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.lazy import lazy_module
+from app.routers.analytics import precompute_scheduler
+from app.schemas import IngestionResult
+
+# pandas chỉ được nạp khi có request nạp dữ liệu đầu tiên
+admission_repo = lazy_module("app.repository.admission")
+analytics_repo = lazy_module("app.repository.analytics_repo")
+
+router = APIRouter(prefix="/admissions", tags=["Admissions"])
+
+# Kích thước batch mặc định khi nạp dữ liệu, file upload lớn hơn ngưỡng spool sẽ ghi ra đĩa tạm
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "5000"))
+INGEST_SPOOL_BYTES = int(os.getenv("INGEST_SPOOL_BYTES", str(16 * 1024 * 1024)))
+
+
+async def _spool_request_body(request: Request, upload) -> None:
+	"""
+	Ghi body request vào file spool: phần còn nằm trong bộ nhớ ghi trực tiếp, phần ra đĩa
+	(vượt INGEST_SPOOL_BYTES) ghi trên threadpool để không chặn event loop
+	"""
+	async for data in request.stream():
+		if upload.tell() + len(data) <= INGEST_SPOOL_BYTES:
+			upload.write(data)
+		else:
+			await run_in_threadpool(upload.write, data)
+	await run_in_threadpool(upload.seek, 0)
+
+
+@router.post("/ingest/{table}", response_model=IngestionResult)
+async def ingest_admission_data(
+	table: Literal["thisinh", "diem_thi", "ho_so_nhap_hoc"],
+	request: Request,
+	fmt: Literal["csv", "ndjson"] = "csv",
+	batch_size: int = INGEST_BATCH_SIZE,
+	db: Session = Depends(get_db),
+):
+	"""
+	Nạp hàng loạt CSV/NDJSON gửi trong body request (không cần multipart)
+	Ví dụ: curl --data-binary @thisinh.csv "/admissions/ingest/thisinh?fmt=csv"
+	"""
+	with tempfile.SpooledTemporaryFile(max_size=INGEST_SPOOL_BYTES) as upload:
+		await _spool_request_body(request, upload)
+		try:
+			return await run_in_threadpool(admission_repo.bulk_ingest, db, table, upload, fmt, batch_size)
+		except ValueError as exc:
+			raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+		except Exception as exc:
+			raise HTTPException(
+				status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+				detail=f"Không thể nạp dữ liệu: {str(exc)}",
+			) from exc
+		finally:
+			# Kể cả khi lỗi giữa chừng: các batch trước đã commit (và đã tăng version trong DB),
+			# giải phóng ngay cache cũ của tiến trình này và tính lại các payload tính sẵn
+			analytics_repo.clear_view_cache()
+			precompute_scheduler.request_refresh()
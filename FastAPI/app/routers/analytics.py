@@ -1,54 +1,501 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+from typing import Any, Callable, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.repository.analytics_repo import (
-	get_admission_by_major,
-	get_admitted_students_exam_scores,
-	get_admitted_students_scores,
-	get_demographics_by_province,
-	get_view_admission_data,
-	get_data_quality_stats,
+from app.core.cache import TTLCache
+from app.core.concurrency import run_queries
+from app.core.database import ReadSessionLocal, get_db, get_read_db
+from app.core.lazy import lazy_module
+from app.core.metrics import span
+from app.core.precompute import PrecomputedEntry, PrecomputeScheduler
+from app.core.response_cache import CACHE_CONTROL, ResponseCache, dumps, etag_matches, make_etag
+from app.core.singleflight import SingleFlight
+from app.schemas import DashboardAnalyticsResponse, DashboardSectionsResponse, SimulationRequest, SimulationResponse, StudentPage
+
+# Stack analytics (pandas, numpy) được nạp ở request đầu tiên hoặc khi warm-up, không nạp lúc import
+aggregation_repo = lazy_module("app.repository.aggregation_repo")
+analytics_repo = lazy_module("app.repository.analytics_repo")
+export_repo = lazy_module("app.repository.export_repo")
+listing_repo = lazy_module("app.repository.listing_repo")
+rollup_repo = lazy_module("app.repository.rollup_repo")
+simulation_repo = lazy_module("app.repository.simulation_repo")
+sketch_repo = lazy_module("app.repository.sketch_repo")
+aggregation_service = lazy_module("app.services.aggregation")
+analytics_service = lazy_module("app.services.analytics")
+dashboard_service = lazy_module("app.services.dashboard")
+explore_service = lazy_module("app.services.explore")
+export_service = lazy_module("app.services.export")
+histogram_service = lazy_module("app.services.histogram")
+simulation_service = lazy_module("app.services.simulation")
+sketch_service = lazy_module("app.services.sketch")
+streaming_service = lazy_module("app.services.streaming")
+trends_service = lazy_module("app.services.trends")
+visualization_service = lazy_module("app.services.visualization")
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+# "pandas": tải view đã làm sạch rồi tính bằng pandas; "sql": aggregate ngay trong database;
+# "stream": đọc view theo chunk và cộng dồn (bộ nhớ cố định)
+AggregationMode = Literal["pandas", "sql", "stream"]
+
+# Gộp các request giống nhau đang chạy đồng thời (ví dụ nhiều người mở dashboard cùng lúc)
+_single_flight = SingleFlight()
+
+# Body JSON đã serialize của dashboard / summary / charts, gắn với version dữ liệu
+_response_cache = ResponseCache(
+	maxsize=int(os.getenv("ANALYTICS_RESPONSE_CACHE_MAXSIZE", "128")),
+	ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "300")),
 )
-from app.schemas import DashboardAnalyticsResponse
-from app.services.analytics import (
-	analyze_score_distribution,
-	build_thpt_subject_analysis_chart,
-	calculate_summary,
-	format_score_distribution_chart,
-	map_major_items,
-	map_province_items,
+
+# Bitmap index drill-down theo năm (xem app.services.explore), gắn với version dữ liệu
+_explore_indexes = TTLCache(
+	maxsize=int(os.getenv("ANALYTICS_EXPLORE_CACHE_MAXSIZE", "4")),
+	ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "300")),
 )
-from app.services.visualization import (
-	format_major_admission_chart,
-	format_province_pie_chart,
+
+# Hồ sơ đã nạp cho mô phỏng xét tuyển theo năm (what-if chỉ tiêu không tải lại dữ liệu)
+_simulation_pools = TTLCache(
+	maxsize=int(os.getenv("ANALYTICS_SIMULATION_CACHE_MAXSIZE", "4")),
+	ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "300")),
 )
 
-router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
+# Quantile sketch đã nạp theo năm {(TenNganh, cột điểm): TDigest}, và bản đã gộp theo bộ năm
+_quantile_sketches = TTLCache(
+	maxsize=int(os.getenv("ANALYTICS_SKETCH_CACHE_MAXSIZE", "32")),
+	ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "300")),
+)
+_merged_quantile_sketches = TTLCache(
+	maxsize=int(os.getenv("ANALYTICS_SKETCH_CACHE_MAXSIZE", "32")),
+	ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "300")),
+)
+
+# Số năm tối đa của một truy vấn xu hướng
+ANALYTICS_TRENDS_MAX_YEARS = int(os.getenv("ANALYTICS_TRENDS_MAX_YEARS", "20"))
 
-@router.get("/dashboard", response_model=DashboardAnalyticsResponse)
-def get_dashboard_analytics(year: int = 2024, db: Session = Depends(get_db)):
-	try:
-		df_view = get_view_admission_data(db)
-		df_major = get_admission_by_major(db, year)
-		df_province = get_demographics_by_province(db, year)
+# Số năm tối đa của một request dashboard dạng batch
+ANALYTICS_BATCH_MAX_YEARS = int(os.getenv("ANALYTICS_BATCH_MAX_YEARS", "10"))
+
+
+# Tính sẵn dashboard / summary / charts (tham số mặc định) của các năm đang tuyển sinh trên thread nền
+ANALYTICS_ACTIVE_YEARS = [int(year) for year in os.getenv("ANALYTICS_ACTIVE_YEARS", "").split(",") if year.strip()]
+precompute_scheduler = PrecomputeScheduler(
+	interval=float(os.getenv("ANALYTICS_PRECOMPUTE_INTERVAL", "300")),
+	probe_interval=float(os.getenv("ANALYTICS_PRECOMPUTE_PROBE_INTERVAL", "15")),
+)
+
+
+def _cached_json_response(request: Request, db: Session, key: tuple, year: Optional[int], build: Callable[[], Any]) -> Response:
+	"""
+	Trả response JSON có ETag mạnh (route + tham số + version dữ liệu của năm)
+	- Key được tính sẵn => trả ngay kết quả tốt gần nhất (không probe DB), cũ thì thread nền tính lại
+	- If-None-Match khớp => 304, không tính toán và không serialize
+	- Body đã serialize được cache, request lặp lại chỉ ghi bytes ra socket
+	- Miss thì tính qua single-flight rồi serialize một lần
+	"""
+	entry = precompute_scheduler.get(key)
+	if entry is not None:
+		headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL, "Age": str(int(entry.age))}
+		if etag_matches(request.headers.get("if-none-match"), entry.etag):
+			return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+		return Response(content=entry.body, media_type="application/json", headers=headers)
+
+	version = analytics_repo.get_data_version(db, year)
+	etag = make_etag(key, version)
+	headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+	if etag_matches(request.headers.get("if-none-match"), etag):
+		return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+	return Response(content=_cached_body(key, version, build), media_type="application/json", headers=headers)
+
+
+def _build_body(build: Callable[[], Any]) -> bytes:
+	payload = build()
+	with span("serialize"):
+		return dumps(payload)
 
-		summary = calculate_summary(df_view)
-		score_distribution = analyze_score_distribution(df_view)
 
-		response = DashboardAnalyticsResponse(
+def _cached_body(key: tuple, version: Any, build: Callable[[], Any]) -> bytes:
+	"""
+	Body JSON đã serialize từ cache, hoặc tính và serialize một lần trong single-flight (các request chờ
+	nhận luôn bytes, không serialize lại)
+	Single-flight theo (key, version): request thấy version mới không nhận kết quả của lần tính đang chạy
+	trên dữ liệu cũ, và lần tính cũ xong sau không ghi đè body của version mới trong cache
+	"""
+	body = _response_cache.get(key, version)
+	if body is None:
+		body = _single_flight.do((key, version), lambda: _build_body(build))
+		_response_cache.set(key, body, version)
+	return body
+
+
+def _compute_view_stats(db: Session, mode: AggregationMode, year: int, major=None, method=None) -> dict:
+	"""Thống kê đủ cho chế độ "sql" hoặc "stream" (xem app.services.aggregation)"""
+	if mode == "sql":
+		return aggregation_repo.get_aggregated_stats(db, year, ma_nganh=major, ma_pt=method)
+	chunks = analytics_repo.iter_view_admission_chunks(
+		db, year, ma_nganh=major, ma_pt=method, columns=analytics_repo.ANALYTICS_COLUMNS
+	)
+	with span("compute"):
+		return streaming_service.accumulate_chunks(chunks)
+
+
+def _compute_view_metrics(
+	db: Session,
+	mode: AggregationMode,
+	year: int,
+	major=None,
+	method=None,
+	metrics: Optional[List[str]] = None,
+) -> dict:
+	"""
+	{metric: kết quả} theo chế độ tính; metric là summary, score_distribution (Series),
+	thpt_subject_analysis (chart); mặc định tính cả ba
+	"""
+	metrics = metrics or ["summary", "score_distribution", "thpt_subject_analysis"]
+	if mode != "pandas":
+		stats = _compute_view_stats(db, mode, year, major, method)
+		builders = {
+			"summary": aggregation_service.summary_from_stats,
+			"score_distribution": aggregation_service.score_distribution_from_stats,
+			"thpt_subject_analysis": aggregation_service.thpt_subject_chart_from_stats,
+		}
+		with span("compute"):
+			return {name: builders[name](stats) for name in metrics}
+
+	df_view = analytics_repo.get_cached_view_admission_data(
+		db,
+		year,
+		ma_nganh=major,
+		ma_pt=method,
+		columns=analytics_repo.ANALYTICS_COLUMNS,
+		compact=analytics_repo.COMPACT_DTYPES,
+	)
+	builders = {
+		"summary": analytics_service.calculate_summary,
+		"score_distribution": analytics_service.analyze_score_distribution,
+		"thpt_subject_analysis": analytics_service.build_thpt_subject_analysis_chart,
+	}
+	with span("compute"):
+		return {name: builders[name](df_view) for name in metrics}
+
+
+def _fetch_dashboard_data(db: Session, mode: AggregationMode, years: List[int], sections: List[str]) -> dict:
+	"""
+	Chạy song song các nhánh độc lập mà `sections` cần (view metrics, thống kê ngành, thống kê tỉnh)
+	của mọi năm trong một lượt run_queries; mỗi (năm, nguồn) chỉ được tải một lần
+	Returns:
+		{năm: {nguồn: kết quả}}
+	"""
+	plan = dashboard_service.plan_sections(sections)
+	loaders = {
+		"view": lambda year: lambda session: _compute_view_metrics(session, mode, year, metrics=plan["view"]),
+		"major": lambda year: lambda session: analytics_repo.get_admission_by_major(session, year),
+		"province": lambda year: lambda session: analytics_repo.get_demographics_by_province(session, year),
+	}
+	results = run_queries(db, {(year, source): loaders[source](year) for year in years for source in plan})
+	data = {year: {} for year in years}
+	for (year, source), result in results.items():
+		data[year][source] = result
+	return data
+
+
+def _format_sections(data: dict, sections: List[str]) -> dict:
+	"""{section: giá trị trong response} từ dữ liệu đã tải của một năm"""
+	formatters = {
+		"summary": lambda: data["view"]["summary"],
+		"admission_by_major": lambda: visualization_service.format_major_admission_chart(data["major"]),
+		"demographics_by_province": lambda: visualization_service.format_province_pie_chart(data["province"]),
+		"score_distribution": lambda: analytics_service.format_score_distribution_chart(
+			data["view"]["score_distribution"]
+		),
+		"thpt_subject_analysis": lambda: data["view"]["thpt_subject_analysis"],
+		"top_majors": lambda: analytics_service.map_major_items(data["major"]),
+		"top_provinces": lambda: analytics_service.map_province_items(data["province"]),
+	}
+	with span("compute"):
+		return {section: formatters[section]() for section in sections}
+
+
+def _build_dashboard(db: Session, year: int, mode: AggregationMode, sections: Optional[List[str]] = None):
+	"""Dashboard đầy đủ (đã validate) hoặc chỉ các `sections` được yêu cầu"""
+	requested = sections or dashboard_service.DASHBOARD_SECTIONS
+	values = _format_sections(_fetch_dashboard_data(db, mode, [year], requested)[year], requested)
+	if sections is not None:
+		return dashboard_service.assemble_dashboard(year, values)
+
+	with span("validate"):
+		return DashboardAnalyticsResponse(
 			year=year,
-			summary=summary,
-			charts={
-				"admission_by_major": format_major_admission_chart(df_major),
-				"demographics_by_province": format_province_pie_chart(df_province),
-				"score_distribution": format_score_distribution_chart(score_distribution),
-				"thpt_subject_analysis": build_thpt_subject_analysis_chart(df_view),
-			},
-			top_majors=map_major_items(df_major),
-			top_provinces=map_province_items(df_province),
+			summary=values["summary"],
+			charts={name: values[name] for name in dashboard_service.CHART_SECTIONS},
+			top_majors=values["top_majors"],
+			top_provinces=values["top_provinces"],
+		)
+
+
+def _build_dashboard_batch(db: Session, years: List[int], mode: AggregationMode, sections: Optional[List[str]]) -> dict:
+	requested = sections or dashboard_service.DASHBOARD_SECTIONS
+	data = _fetch_dashboard_data(db, mode, years, requested)
+	return {
+		"years": years,
+		"sections": requested,
+		"results": [dashboard_service.assemble_dashboard(year, _format_sections(data[year], requested)) for year in years],
+	}
+
+
+def _build_summary(db: Session, year: int, major: Optional[str], method: Optional[str], mode: AggregationMode):
+	if mode != "pandas":
+		stats = _compute_view_stats(db, mode, year, major, method)
+		with span("compute"):
+			return aggregation_service.summary_from_stats(stats)
+	df_view = analytics_repo.get_cached_view_admission_data(
+		db,
+		year,
+		ma_nganh=major,
+		ma_pt=method,
+		columns=analytics_repo.ANALYTICS_COLUMNS,
+		compact=analytics_repo.COMPACT_DTYPES,
+	)
+	with span("compute"):
+		return analytics_service.calculate_summary(df_view)
+
+
+def _build_charts(db: Session, year: int, mode: AggregationMode, sections: Optional[List[str]] = None) -> dict:
+	requested = sections or dashboard_service.CHART_SECTIONS
+	values = _format_sections(_fetch_dashboard_data(db, mode, [year], requested)[year], requested)
+	return {"year": year, **values}
+
+
+def _build_histograms(
+	db: Session,
+	year: int,
+	columns: List[str],
+	bin_width: float,
+	lower: float,
+	upper: Optional[float],
+	group_by: Optional[str],
+) -> dict:
+	# Một frame (mọi cột điểm + chiều nhóm) dùng chung cho mọi tổ hợp cột / bin / nhóm
+	df_view = analytics_repo.get_cached_view_admission_data(
+		db, year, columns=analytics_repo.HISTOGRAM_COLUMNS, compact=analytics_repo.COMPACT_DTYPES
+	)
+	with span("compute"):
+		histograms = histogram_service.compute_histograms(
+			df_view,
+			columns,
+			bin_width,
+			lower,
+			upper,
+			group_by=histogram_service.HISTOGRAM_GROUPS[group_by] if group_by else None,
+		)
+		charts = analytics_service.format_histogram_charts(histograms)
+	return {"year": year, "bin_width": bin_width, "group_by": group_by, "histograms": charts}
+
+
+def _get_explore_index(db: Session, year: int):
+	"""Bitmap index của năm từ cache; miss thì tải frame + tạo index một lần (single-flight)"""
+	version = analytics_repo.get_data_version(db, year)
+	index = _explore_indexes.get(year, version)
+	if index is None:
+		def build():
+			df, methods = analytics_repo.get_explore_data(db, year)
+			with span("index"):
+				return explore_service.build_bitmap_index(df, methods)
+
+		index = _single_flight.do(("explore-index", year, version), build)
+		_explore_indexes.set(year, index, version)
+	return index
+
+
+def _get_simulation_pool(db: Session, year: int):
+	"""Pool hồ sơ của năm từ cache; miss thì tải hồ sơ + chỉ tiêu một lần (single-flight)"""
+	version = analytics_repo.get_data_version(db, year)
+	pool = _simulation_pools.get(year, version)
+	if pool is None:
+		def build():
+			applications, majors = simulation_repo.get_simulation_data(db, year)
+			with span("index"):
+				return simulation_service.build_application_pool(applications, majors)
+
+		pool = _single_flight.do(("simulation-pool", year, version), build)
+		_simulation_pools.set(year, pool, version)
+	return pool
+
+
+def _build_quantile_sketches(db: Session, year: int) -> dict:
+	"""Digest của năm tính từ view theo chunk (bộ nhớ cố định)"""
+	chunks = analytics_repo.iter_view_admission_chunks(db, year, columns=["TenNganh"] + sketch_repo.SKETCH_COLUMNS)
+	with span("compute"):
+		return sketch_service.build_score_sketches(chunks, sketch_repo.SKETCH_COLUMNS)
+
+
+def _get_quantile_sketches(db: Session, year: int, version: Any = None) -> dict:
+	"""
+	Digest của năm: cache trong tiến trình -> bảng TK_PHAN_VI_NAM nếu cùng version dữ liệu
+	-> tính lại từ view (không ghi; ghi qua POST /analytics/sketches/refresh)
+	"""
+	if version is None:
+		version = analytics_repo.get_data_version(db, year)
+	sketches = _quantile_sketches.get(year, version)
+	if sketches is None:
+		def load():
+			with span("sql"):
+				stored = sketch_repo.load_quantile_sketches(db, year, sketch_repo.sketch_version_token(version))
+			if stored is None:
+				return _build_quantile_sketches(db, year)
+			return {key: sketch_service.TDigest.from_bytes(data) for key, data in stored.items()}
+
+		sketches = _single_flight.do(("sketches", year, version), load)
+		_quantile_sketches.set(year, sketches, version)
+	return sketches
+
+
+def _get_merged_quantile_sketches(db: Session, years: List[int]) -> dict:
+	"""Digest gộp của nhiều năm, cache theo bộ năm + version từng năm; một năm thì dùng thẳng digest của năm"""
+	if len(years) == 1:
+		return _get_quantile_sketches(db, years[0])
+	key = tuple(years)
+	versions = tuple(analytics_repo.get_data_version(db, y) for y in years)
+	merged = _merged_quantile_sketches.get(key, versions)
+	if merged is None:
+		def merge():
+			sketch_sets = [_get_quantile_sketches(db, y, version) for y, version in zip(years, versions)]
+			with span("compute"):
+				return sketch_service.merge_sketches(sketch_sets)
+
+		merged = _single_flight.do(("merged-sketches", key, versions), merge)
+		_merged_quantile_sketches.set(key, merged, versions)
+	return merged
+
+
+def _build_explore(db: Session, year: int, filters: dict, combine: str, facets: bool) -> dict:
+	index = _get_explore_index(db, year)
+	with span("compute"):
+		result = explore_service.explore(index, filters, combine, facets)
+	return {"year": year, "filters": filters, "combine": combine, **result}
+
+
+def _build_trends(db: Session, from_year: int, to_year: int) -> dict:
+	applications, students, majors = analytics_repo.get_trend_data(db, from_year, to_year)
+	with span("compute"):
+		result = trends_service.build_trends(applications, students, majors, from_year, to_year)
+	return {"from": from_year, "to": to_year, **result}
+
+
+def preload_analytics_modules() -> None:
+	"""Nạp trước pandas và stack analytics (để request đầu tiên không phải chờ import)"""
+	for module in (
+		aggregation_repo, analytics_repo, export_repo, listing_repo, rollup_repo, simulation_repo, sketch_repo,
+		aggregation_service, analytics_service, dashboard_service, explore_service, export_service,
+		histogram_service, simulation_service, sketch_service, streaming_service, trends_service,
+		visualization_service,
+	):
+		module.load()
+
+
+def warm_dashboard_cache(years: List[int], mode: AggregationMode = "pandas") -> None:
+	"""Tính sẵn dashboard của các năm vào cache (chạy nền sau khi app sẵn sàng)"""
+	for year in years:
+		db = ReadSessionLocal()
+		try:
+			key = ("dashboard", year, mode)
+			_cached_body(key, analytics_repo.get_data_version(db, year), lambda: _build_dashboard(db, year, mode))
+		finally:
+			db.close()
+
+
+def _register_precompute_job(key: tuple, year: int, build: Callable[[Session], Any]) -> None:
+	"""Đăng ký một payload tính sẵn; ETag giống hệt đường tính trực tiếp (make_etag(key, version))"""
+
+	def probe():
+		db = ReadSessionLocal()
+		try:
+			return analytics_repo.get_data_version(db, year)
+		finally:
+			db.close()
+
+	def compute(version) -> PrecomputedEntry:
+		db = ReadSessionLocal()
+		try:
+			payload = build(db)
+		finally:
+			db.close()
+		return PrecomputedEntry(dumps(payload), make_etag(key, version), version)
+
+	precompute_scheduler.register(key, probe, compute)
+
+
+def register_precompute_jobs(years: List[int], mode: AggregationMode = "pandas") -> None:
+	"""Lên lịch tính sẵn dashboard, summary, charts (tham số mặc định) cho các năm"""
+	for year in years:
+		_register_precompute_job(("dashboard", year, mode), year, lambda db, year=year: _build_dashboard(db, year, mode))
+		_register_precompute_job(
+			("summary", year, None, None, mode), year, lambda db, year=year: _build_summary(db, year, None, None, mode)
+		)
+		_register_precompute_job(("charts", year, mode), year, lambda db, year=year: _build_charts(db, year, mode))
+
+
+register_precompute_jobs(ANALYTICS_ACTIVE_YEARS)
+
+
+def _parse_sections(sections: Optional[List[str]], allowed: List[str]) -> Optional[List[str]]:
+	try:
+		return dashboard_service.parse_sections(sections, allowed)
+	except ValueError as exc:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/dashboard", response_model=DashboardSectionsResponse, response_model_exclude_none=True)
+def get_dashboard_analytics(
+	request: Request,
+	year: int = 2024,
+	mode: AggregationMode = "pandas",
+	sections: Optional[List[str]] = Query(
+		None, description="Chỉ tính các section này (lặp lại hoặc phân tách bằng dấu phẩy), bỏ trống = tất cả"
+	),
+	db: Session = Depends(get_read_db),
+):
+	"""
+	Dashboard của năm; `sections` (summary, các chart, top_majors, top_provinces) chỉ chạy các truy vấn
+	và bước tính mà section đó cần, response chỉ gồm các section được yêu cầu
+	"""
+	sections = _parse_sections(sections, dashboard_service.DASHBOARD_SECTIONS)
+	key = ("dashboard", year, mode) if sections is None else ("dashboard", year, mode, tuple(sections))
+	try:
+		return _cached_json_response(request, db, key, year, lambda: _build_dashboard(db, year, mode, sections))
+	except Exception as exc:
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể lấy dữ liệu analytics: {str(exc)}",
+		) from exc
+
+
+@router.get("/dashboard/batch")
+def get_dashboard_batch(
+	request: Request,
+	year: List[int] = Query(..., description="Lặp lại để lấy nhiều năm"),
+	mode: AggregationMode = "pandas",
+	sections: Optional[List[str]] = Query(None, description="Như /dashboard, áp dụng cho mọi năm"),
+	db: Session = Depends(get_read_db),
+):
+	"""
+	Nhiều năm x nhiều section trong một request: mọi (năm, nguồn dữ liệu) cần thiết được tải một lần
+	trong cùng một lượt truy vấn song song, `results` thẳng hàng với `years`
+	"""
+	years = sorted(set(year))
+	if len(years) > ANALYTICS_BATCH_MAX_YEARS:
+		raise HTTPException(
+			status_code=status.HTTP_400_BAD_REQUEST,
+			detail=f"Tối đa {ANALYTICS_BATCH_MAX_YEARS} năm mỗi request",
+		)
+	sections = _parse_sections(sections, dashboard_service.DASHBOARD_SECTIONS)
+	key = ("dashboard_batch", tuple(years), mode, tuple(sections) if sections else None)
+	try:
+		return _cached_json_response(
+			request, db, key, None, lambda: _build_dashboard_batch(db, years, mode, sections)
 		)
-		return response
 	except Exception as exc:
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -57,10 +504,22 @@ def get_dashboard_analytics(year: int = 2024, db: Session = Depends(get_db)):
 
 
 @router.get("/summary")
-def get_summary_analytics(year: int = 2024, db: Session = Depends(get_db)):
+def get_summary_analytics(
+	request: Request,
+	year: int = 2024,
+	major: Optional[str] = None,
+	method: Optional[str] = None,
+	mode: AggregationMode = "pandas",
+	db: Session = Depends(get_read_db),
+):
 	try:
-		df_view = get_view_admission_data(db)
-		return calculate_summary(df_view)
+		return _cached_json_response(
+			request,
+			db,
+			("summary", year, major, method, mode),
+			year,
+			lambda: _build_summary(db, year, major, method, mode),
+		)
 	except Exception as exc:
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -69,22 +528,307 @@ def get_summary_analytics(year: int = 2024, db: Session = Depends(get_db)):
 
 
 @router.get("/charts")
-def get_chart_analytics(year: int = 2024, db: Session = Depends(get_db)):
+def get_chart_analytics(
+	request: Request,
+	year: int = 2024,
+	mode: AggregationMode = "pandas",
+	sections: Optional[List[str]] = Query(None, description="Chỉ tính các chart này, bỏ trống = tất cả"),
+	db: Session = Depends(get_read_db),
+):
+	sections = _parse_sections(sections, dashboard_service.CHART_SECTIONS)
+	key = ("charts", year, mode) if sections is None else ("charts", year, mode, tuple(sections))
 	try:
-		df_view = get_view_admission_data(db)
-		df_major = get_admission_by_major(db, year)
-		df_province = get_demographics_by_province(db, year)
-		score_distribution = analyze_score_distribution(df_view)
-
-		return {
-			"year": year,
-			"admission_by_major": format_major_admission_chart(df_major),
-			"demographics_by_province": format_province_pie_chart(df_province),
-			"score_distribution": format_score_distribution_chart(score_distribution),
-			"thpt_subject_analysis": build_thpt_subject_analysis_chart(df_view),
-		}
+		return _cached_json_response(request, db, key, year, lambda: _build_charts(db, year, mode, sections))
 	except Exception as exc:
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"Không thể lấy chart analytics: {str(exc)}",
 		) from exc
+
+
+@router.get("/histogram")
+def get_score_histogram(
+	request: Request,
+	year: int = 2024,
+	column: List[str] = Query(["DiemXetTuyen"], description="Cột điểm, lặp lại để lấy nhiều histogram"),
+	bin_width: float = Query(5, gt=0, description="Độ rộng bin"),
+	lower: float = Query(0, alias="min", description="Biên trái"),
+	upper: Optional[float] = Query(None, alias="max", description="Biên phải, bỏ trống = theo điểm cao nhất"),
+	group_by: Optional[Literal["major", "block"]] = None,
+	db: Session = Depends(get_read_db),
+):
+	"""
+	Histogram điểm (đã làm sạch) với độ rộng bin, khoảng, cột điểm tuỳ chọn, có thể theo ngành / khối;
+	mọi histogram được đếm trong một lần numpy.bincount, nhãn giống chart score_distribution
+	"""
+	unknown = [col for col in column if col not in analytics_repo.SCORE_COLUMNS]
+	if unknown:
+		raise HTTPException(
+			status_code=status.HTTP_400_BAD_REQUEST, detail=f"Cột điểm không hợp lệ: {', '.join(unknown)}"
+		)
+	columns = list(dict.fromkeys(column))
+	key = ("histogram", year, tuple(columns), bin_width, lower, upper, group_by)
+	try:
+		return _cached_json_response(
+			request, db, key, year, lambda: _build_histograms(db, year, columns, bin_width, lower, upper, group_by)
+		)
+	except ValueError as exc:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+	except Exception as exc:
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể lấy histogram điểm: {str(exc)}",
+		) from exc
+
+
+@router.get("/explore")
+def explore_analytics(
+	request: Request,
+	year: int = 2024,
+	major: Optional[List[str]] = Query(None, description="TenNganh, lặp lại tham số để chọn nhiều giá trị (OR)"),
+	block: Optional[List[str]] = Query(None, description="KhoiXetTuyen"),
+	province: Optional[List[str]] = Query(None, description="QueQuan"),
+	gender: Optional[List[str]] = Query(None, description="GioiTinh"),
+	method: Optional[List[str]] = Query(None, description="MaPT"),
+	combine: Literal["and", "or"] = Query("and", description="Kết hợp giữa các chiều lọc"),
+	facets: bool = Query(False, description="Kèm số thí sinh theo từng giá trị của mỗi chiều"),
+	db: Session = Depends(get_read_db),
+):
+	"""
+	Drill-down dashboard: trong cùng một chiều các giá trị được OR, giữa các chiều AND (hoặc OR
+	theo `combine`); summary và chart điểm được tính lại trên tập thí sinh khớp bộ lọc
+	"""
+	filters = explore_service.parse_filters(
+		{"major": major, "block": block, "province": province, "gender": gender, "method": method}
+	)
+	key = ("explore", year, tuple((dimension, tuple(values)) for dimension, values in filters.items()), combine, facets)
+	try:
+		return _cached_json_response(
+			request, db, key, year, lambda: _build_explore(db, year, filters, combine, facets)
+		)
+	except Exception as exc:
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể lấy dữ liệu drill-down: {str(exc)}",
+		) from exc
+
+
+@router.get("/trends")
+def get_trend_analytics(
+	request: Request,
+	from_year: int = Query(..., alias="from"),
+	to_year: int = Query(..., alias="to"),
+	db: Session = Depends(get_read_db),
+):
+	"""
+	Xu hướng qua các năm trong một lượt đọc: summary, tỉ lệ lấp đầy chỉ tiêu theo ngành, số thí sinh
+	theo tỉnh, điểm xét tuyển trung bình theo phương thức; mỗi chỉ số là một mảng thẳng hàng với `years`
+	"""
+	if from_year > to_year or to_year - from_year >= ANALYTICS_TRENDS_MAX_YEARS:
+		raise HTTPException(
+			status_code=status.HTTP_400_BAD_REQUEST,
+			detail=f"Khoảng năm không hợp lệ (from <= to, tối đa {ANALYTICS_TRENDS_MAX_YEARS} năm)",
+		)
+	try:
+		return _cached_json_response(
+			request, db, ("trends", from_year, to_year), None, lambda: _build_trends(db, from_year, to_year)
+		)
+	except Exception as exc:
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể lấy xu hướng tuyển sinh: {str(exc)}",
+		) from exc
+
+
+@router.get("/percentiles")
+def get_score_percentiles(
+	year: List[int] = Query([2024], description="Lặp lại để gộp nhiều năm"),
+	method: str = Query("DiemXetTuyen", description="DiemXetTuyen hoặc một cột DXT_*"),
+	major: Optional[str] = Query(None, description="TenNganh, bỏ trống = mọi ngành"),
+	q: List[float] = Query([0.1, 0.5, 0.9], description="Các mức percentile trong [0, 1]"),
+	by_major: bool = Query(False, description="Trả percentile của từng ngành"),
+	db: Session = Depends(get_read_db),
+):
+	"""
+	Percentile điểm (> 0) theo ngành và phương thức, trả lời từ quantile sketch (t-digest)
+	thay vì sắp xếp lại điểm gốc; nhiều năm được gộp bằng merge digest
+	"""
+	if method not in sketch_repo.SKETCH_COLUMNS:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Cột điểm không hợp lệ: {method}")
+	if not q or any(not 0 <= level <= 1 for level in q):
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Mức percentile phải trong [0, 1]")
+	years = sorted(set(year))
+	try:
+		sketches = _get_merged_quantile_sketches(db, years)
+	except Exception as exc:
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể lấy percentile điểm: {str(exc)}",
+		) from exc
+
+	empty = sketch_service.TDigest.empty()
+	with span("compute"):
+		result = {
+			"years": years,
+			"method": method,
+			"major": major,
+			**sketch_service.describe(sketches.get((major or sketch_service.ALL_MAJORS, method), empty), q),
+		}
+		if by_major:
+			result["majors"] = [
+				{"major_name": name, **sketch_service.describe(digest, q)}
+				for (name, column), digest in sorted(sketches.items())
+				if column == method and name != sketch_service.ALL_MAJORS
+			]
+	return result
+
+
+@router.post("/sketches/refresh")
+def refresh_quantile_sketches(year: Optional[int] = None, db: Session = Depends(get_db)):
+	"""Tính lại và lưu quantile sketch của một năm (mặc định mọi năm) kèm version dữ liệu"""
+	try:
+		years = [year] if year is not None else rollup_repo.get_admission_years(db)
+		results = []
+		for y in years:
+			version = analytics_repo.get_data_version(db, y)
+			sketches = _build_quantile_sketches(db, y)
+			stored = sketch_repo.save_quantile_sketches(
+				db,
+				y,
+				sketch_repo.sketch_version_token(version),
+				{key: (digest.count, digest.to_bytes()) for key, digest in sketches.items()},
+			)
+			_quantile_sketches.set(y, sketches, version)
+			results.append({"year": y, "sketches": stored})
+		return results
+	except Exception as exc:
+		db.rollback()
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể cập nhật quantile sketch: {str(exc)}",
+		) from exc
+
+
+@router.get("/students", response_model=StudentPage)
+def list_students(
+	year: Optional[int] = 2024,
+	major: Optional[str] = None,
+	method: Optional[str] = None,
+	sort: str = Query("DiemXetTuyen", description="DiemXetTuyen hoặc một cột DXT_*"),
+	order: Literal["desc", "asc"] = "desc",
+	limit: int = Query(50, ge=1),
+	cursor: Optional[str] = Query(None, description="next_cursor của trang trước"),
+	db: Session = Depends(get_read_db),
+):
+	"""
+	Danh sách thí sinh (đã làm sạch điểm) theo trang, phân trang keyset trên (điểm, CCCD):
+	trang sâu nhanh như trang đầu, dữ liệu thay đổi giữa hai trang không làm trùng / sót dòng
+	"""
+	try:
+		df, next_cursor = listing_repo.get_student_page(
+			db, year, ma_nganh=major, ma_pt=method, sort=sort, descending=order == "desc", limit=limit, cursor=cursor
+		)
+	except ValueError as exc:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+	except Exception as exc:
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể lấy danh sách thí sinh: {str(exc)}",
+		) from exc
+
+	with span("serialize"):
+		items = df.astype(object).where(df.notna(), None).to_dict("records")
+	return {"year": year, "sort": sort, "order": order, "limit": limit, "items": items, "next_cursor": next_cursor}
+
+
+@router.post("/simulation", response_model=SimulationResponse)
+def simulate_admission(request: SimulationRequest, db: Session = Depends(get_read_db)):
+	"""
+	Mô phỏng xét tuyển: mỗi thí sinh được phân vào nguyện vọng cao nhất còn chỗ theo điểm của
+	phương thức (chấp nhận trì hoãn), trả về điểm chuẩn và tỉ lệ lấp đầy từng ngành.
+	`quotas` ghi đè chỉ tiêu của một số ngành để thử kịch bản
+	"""
+	try:
+		pool = _get_simulation_pool(db, request.year)
+		with span("compute"):
+			result = simulation_service.simulate(pool, request.quotas)
+	except ValueError as exc:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+	except Exception as exc:
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể mô phỏng xét tuyển: {str(exc)}",
+		) from exc
+	return {"year": request.year, **result}
+
+
+@router.get("/cache")
+def get_cache_stats():
+	return {
+		"view_data": analytics_repo.get_view_cache_stats(),
+		"responses": _response_cache.stats(),
+		"explore_indexes": {
+			**_explore_indexes.stats(),
+			"memory_bytes": sum(index.memory_bytes for index in _explore_indexes.values()),
+		},
+	}
+
+
+@router.get("/precompute")
+def get_precompute_stats():
+	return precompute_scheduler.stats()
+
+
+@router.get("/coalescing")
+def get_coalescing_stats():
+	return _single_flight.stats()
+
+
+@router.post("/rollups/refresh")
+def refresh_rollup_tables(year: Optional[int] = None, db: Session = Depends(get_db)):
+	try:
+		if year is None:
+			return rollup_repo.refresh_all_rollups(db)
+		return [rollup_repo.refresh_rollups(db, year)]
+	except Exception as exc:
+		db.rollback()
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail=f"Không thể cập nhật rollup: {str(exc)}",
+		) from exc
+
+
+@router.get("/export")
+def export_admission_data(
+	year: int = 2024,
+	fmt: Literal["csv", "ndjson", "parquet"] = Query("csv", alias="format"),
+	compression: Optional[Literal["gzip", "zstd"]] = None,
+	columns: Optional[str] = Query(None, description="Danh sách cột, phân tách bằng dấu phẩy"),
+	major: Optional[str] = None,
+	method: Optional[str] = None,
+):
+	if columns:
+		column_list = [col.strip() for col in columns.split(",") if col.strip()]
+	else:
+		column_list = export_repo.EXPORT_COLUMNS
+	try:
+		export_service.check_export_options(fmt, compression)
+		column_kinds = export_repo.get_export_column_kinds(column_list)
+	except ValueError as exc:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+	def generate():
+		# Session riêng cho luồng export: response stream chạy sau khi handler đã trả về
+		db = ReadSessionLocal()
+		try:
+			chunks = export_repo.iter_cleaned_view_chunks(db, year, ma_nganh=major, ma_pt=method, columns=column_list)
+			yield from export_service.encode_export_stream(chunks, fmt, column_kinds, compression)
+		finally:
+			db.close()
+
+	filename = export_service.export_filename(f"tuyensinh_{year}", fmt, compression)
+	return StreamingResponse(
+		generate(),
+		media_type=export_service.export_media_type(fmt, compression),
+		headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+	)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.database import get_pool_stats
+from app.core.metrics import render_metrics
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+	"""Metrics định dạng Prometheus (text exposition 0.0.4)"""
+	return PlainTextResponse(render_metrics(get_pool_stats()), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/metrics/pool")
+def get_connection_pool_stats():
+	"""Trạng thái connection pool của database chính và replica (nếu có)"""
+	return get_pool_stats()
@@ -90,4 +90,93 @@ class DashboardAnalyticsResponse(BaseModel):
     summary: AnalyticsSummary
     charts: DashboardCharts
     top_majors: List[MajorAdmissionItem]
-    top_provinces: List[ProvinceCountItem]
\ No newline at end of file
+    top_provinces: List[ProvinceCountItem]
+
+
+# /analytics/dashboard?sections=...: chỉ có các section được yêu cầu (không chỉ định => đủ như DashboardAnalyticsResponse)
+class DashboardSectionCharts(BaseModel):
+    admission_by_major: Optional[ChartData] = None
+    demographics_by_province: Optional[ChartData] = None
+    score_distribution: Optional[ChartData] = None
+    thpt_subject_analysis: Optional[ChartData] = None
+
+
+class DashboardSectionsResponse(BaseModel):
+    year: int
+    summary: Optional[AnalyticsSummary] = None
+    charts: Optional[DashboardSectionCharts] = None
+    top_majors: Optional[List[MajorAdmissionItem]] = None
+    top_provinces: Optional[List[ProvinceCountItem]] = None
+
+
+class StudentListItem(BaseModel):
+    CCCD: str
+    HoTen: Optional[str] = None
+    GioiTinh: Optional[str] = None
+    TenNganh: Optional[str] = None
+    KhoiXetTuyen: Optional[str] = None
+    QueQuan: Optional[str] = None
+    TongDiemTHPT: float
+    HSA: float
+    TSA: float
+    IELTS: float
+    SAT: float
+    DiemXetTuyen: float
+    DXT_THPT: float
+    DXT_HSA: float
+    DXT_TSA: float
+    DXT_SAT: float
+    DXT_IELTS_DGNL: float
+    DXT_IELTS_THPT: float
+
+
+class StudentPage(BaseModel):
+    year: Optional[int]
+    sort: str
+    order: str
+    limit: int
+    items: List[StudentListItem]
+    next_cursor: Optional[str] = None
+
+
+class SimulationRequest(BaseModel):
+    year: int = 2024
+    # Chỉ tiêu giả định theo MaNganh (what-if), ngành không có trong đây dùng NGANH.ChiTieu
+    quotas: Dict[str, int] = {}
+
+
+class SimulationMajorResult(BaseModel):
+    major_code: str
+    major_name: str
+    quota: int
+    admitted: int
+    fill_rate: float
+    cutoff_score: Optional[float] = None
+    cutoff_by_method: Dict[str, float]
+
+
+class SimulationResponse(BaseModel):
+    year: int
+    applicants: int
+    applications: int
+    invalid_applications: int
+    admitted: int
+    unmatched: int
+    rounds: int
+    majors: List[SimulationMajorResult]
+
+
+class IngestionError(BaseModel):
+    row: int
+    error: str
+
+
+class IngestionResult(BaseModel):
+    table: str
+    rows_received: int
+    rows_written: int
+    rows_invalid: int
+    batches: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: List[IngestionError]
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Tính summary / chart từ thống kê đủ (xem app.repository.aggregation_repo.get_aggregated_stats)
+thay vì từ DataFrame từng thí sinh. Kết quả giống hệt đường pandas, kể cả việc
+clean_admission_data thay NULL/0 bằng trung bình các giá trị > 0:
+- Giá trị được điền = pos_sum / pos_count
+- Số dòng được điền = total - pos_count - neg_count
+"""
+import math
+import pandas as pd
+from typing import Optional
+from app.schemas import AnalyticsSummary
+from app.services.analytics import (
+    DXT_METHOD_COLUMNS,
+    SCORE_BIN_WIDTH,
+    _round_to_half,
+    calculate_summary,
+    score_distribution_bins,
+)
+
+
+def _imputed_mean(col_stats: dict) -> Optional[float]:
+    """Giá trị clean_admission_data dùng để thay NULL/0 (None nếu cột không có giá trị > 0)"""
+    if col_stats["pos_count"] > 0:
+        return col_stats["pos_sum"] / col_stats["pos_count"]
+    return None
+
+
+def _filled_count(col_stats: dict, total: int) -> int:
+    """Số dòng NULL/0 của cột"""
+    return total - col_stats["pos_count"] - col_stats["neg_count"]
+
+
+def _cleaned_mean(col_stats: dict, total: int) -> float:
+    """Trung bình của cột sau khi làm sạch"""
+    if total == 0:
+        return 0.0
+    mean_value = _imputed_mean(col_stats)
+    filled = _filled_count(col_stats, total) * mean_value if mean_value is not None else 0.0
+    return (col_stats["pos_sum"] + col_stats["neg_sum"] + filled) / total
+
+
+def _cleaned_positive_count(col_stats: dict, total: int) -> int:
+    """Số dòng > 0 sau khi làm sạch (NULL/0 thành trung bình > 0 nếu cột có giá trị > 0)"""
+    if _imputed_mean(col_stats) is None:
+        return 0
+    return col_stats["pos_count"] + _filled_count(col_stats, total)
+
+
+def summary_from_stats(stats: dict) -> AnalyticsSummary:
+    """Tương đương calculate_summary(df) với df đã làm sạch"""
+    total_students = stats["total"]
+    if total_students == 0:
+        return calculate_summary(pd.DataFrame())
+
+    columns = stats["columns"]
+
+    hsa_admitted = _cleaned_positive_count(columns["DXT_HSA"], total_students)
+    hsa_admission_rate = round((hsa_admitted / total_students) * 100, 2)
+
+    ielts_students = _cleaned_positive_count(columns["IELTS"], total_students)
+    ielts_rate = round((ielts_students / total_students) * 100, 2)
+
+    # Trung bình các giá trị > 0 sau làm sạch chính là giá trị điền vào
+    avg_ielts = 0.0
+    if ielts_students > 0:
+        avg_ielts = _round_to_half(_imputed_mean(columns["IELTS"]))
+
+    return AnalyticsSummary(
+        total_students=total_students,
+        avg_thpt_total=round(_cleaned_mean(columns["TongDiemTHPT"], total_students), 2),
+        avg_hsa_total=round(_cleaned_mean(columns["HSA"], total_students), 2),
+        avg_tsa_total=round(_cleaned_mean(columns["TSA"], total_students), 2),
+        top_province=str(stats["top_province"]) if stats.get("top_province") is not None else "N/A",
+        total_majors=stats["total_majors"],
+        hsa_admission_rate=hsa_admission_rate,
+        ielts_rate=ielts_rate,
+        avg_ielts=avg_ielts,
+    )
+
+
+def _bucket_index(score: float) -> int:
+    """Bin (đóng bên phải) chứa một điểm > 0, giống aggregation_repo.get_score_bucket_counts"""
+    if score <= SCORE_BIN_WIDTH:
+        return 0
+    return int(math.ceil(score / SCORE_BIN_WIDTH)) - 1
+
+
+def score_distribution_from_stats(stats: dict) -> pd.Series:
+    """Tương đương analyze_score_distribution(df) với df đã làm sạch"""
+    total = stats["total"]
+    if total == 0:
+        return pd.Series(dtype=int)
+
+    col_stats = stats["columns"]["DiemXetTuyen"]
+    mean_value = _imputed_mean(col_stats)
+    filled = _filled_count(col_stats, total)
+
+    # Max sau làm sạch: giá trị điền (trung bình) không vượt quá max của các giá trị > 0
+    if mean_value is not None:
+        max_score = col_stats["pos_max"]
+    elif filled > 0:
+        max_score = 0
+    else:
+        max_score = col_stats["neg_max"]
+    if max_score == 0:
+        return pd.Series(dtype=int)
+
+    intervals = score_distribution_bins(max_score)
+    counts = [0] * len(intervals)
+    for bucket, so_luong in stats["score_buckets"].items():
+        counts[bucket] += so_luong
+    if mean_value is not None:
+        counts[_bucket_index(mean_value)] += filled
+    else:
+        counts[0] += filled
+
+    return pd.Series(counts, index=intervals, name="count")
+
+
+def thpt_subject_chart_from_stats(stats: dict) -> dict:
+    """Tương đương build_thpt_subject_analysis_chart(df) với df đã làm sạch"""
+    if stats["total"] == 0:
+        return {"labels": [], "datasets": []}
+
+    methods = {}
+    for col in DXT_METHOD_COLUMNS:
+        avg = _imputed_mean(stats["columns"][col])
+        if avg is not None and avg > 0:
+            methods[col.replace("DXT_", "")] = round(avg, 2)
+
+    if not methods:
+        return {"labels": [], "datasets": []}
+
+    return {
+        "labels": list(methods.keys()),
+        "datasets": [
+            {
+                "label": "Điểm xét tuyển trung bình",
+                "data": list(methods.values()),
+                "backgroundColor": "#3B82F6",
+            }
+        ],
+    }
@@ -1,6 +1,16 @@
 import pandas as pd
 from typing import List, Optional
 from app.schemas import AnalyticsSummary, MajorAdmissionItem, ProvinceCountItem
+from app.services.histogram import bin_edges, bin_intervals, compute_histograms, to_series
+
+# Các cột điểm xét tuyển theo phương thức
+DXT_METHOD_COLUMNS = ["DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT", "DXT_IELTS_DGNL", "DXT_IELTS_THPT"]
+
+# Độ rộng bin histogram điểm xét tuyển
+SCORE_BIN_WIDTH = 5
+
+# Biên phải tối thiểu của histogram điểm xét tuyển (thang 0-20 kể cả khi điểm thấp)
+SCORE_MIN_UPPER = 20
 
 
 def _round_to_half(value: float) -> float:
@@ -73,18 +83,17 @@ def calculate_summary(df: pd.DataFrame) -> AnalyticsSummary:
     )
 
 def analyze_score_distribution(df: pd.DataFrame) -> pd.Series:
-    """Phân phối điểm xét tuyển cuối cùng"""
+    """Phân phối điểm xét tuyển cuối cùng (bin SCORE_BIN_WIDTH điểm, xem app.services.histogram)"""
     if df.empty:
         return pd.Series(dtype=int)
 
-    score_series = pd.to_numeric(df["DiemXetTuyen"], errors="coerce").fillna(0)
-    if score_series.max() == 0:
-        return pd.Series(dtype=int)
-    
-    max_score = int(score_series.max())
-    upper_bound = max(20, ((max_score // 5) + 1) * 5)
-    bins = list(range(0, upper_bound + 5, 5))
-    return pd.cut(score_series, bins=bins, include_lowest=True).value_counts().sort_index()
+    histogram = compute_histograms(df, ["DiemXetTuyen"], SCORE_BIN_WIDTH, min_upper=SCORE_MIN_UPPER)["DiemXetTuyen"]
+    return to_series(histogram["intervals"], histogram["total"])
+
+
+def score_distribution_bins(max_score: float) -> pd.IntervalIndex:
+    """Các interval mà analyze_score_distribution sinh ra cho một giá trị max"""
+    return bin_intervals(bin_edges(max_score, SCORE_BIN_WIDTH, min_upper=SCORE_MIN_UPPER))
 
 
 def format_score_distribution_chart(score_dist: pd.Series) -> dict:
@@ -105,6 +114,21 @@ def format_score_distribution_chart(score_dist: pd.Series) -> dict:
     }
 
 
+
+def format_histogram_charts(histograms: dict) -> dict:
+    """
+    Format kết quả compute_histograms: mỗi cột một chart như format_score_distribution_chart,
+    kèm số thí sinh theo từng nhóm (cùng thứ tự nhãn) khi có group_by
+    """
+    charts = {}
+    for column, histogram in histograms.items():
+        chart = format_score_distribution_chart(to_series(histogram["intervals"], histogram["total"]))
+        chart["groups"] = [
+            {"name": name, "data": counts.astype(int).tolist()} for name, counts in histogram["groups"].items()
+        ]
+        charts[column] = chart
+    return charts
+
 def build_thpt_subject_analysis_chart(df: pd.DataFrame) -> dict:
     """Tạo chart phân tích theo phương thức xét tuyển"""
     if df.empty:
@@ -112,12 +136,12 @@ def build_thpt_subject_analysis_chart(df: pd.DataFrame) -> dict:
 
     # Tính trung bình các điểm xét tuyển theo phương thức
     methods = {}
-    for col in ["DXT_THPT", "DXT_HSA", "DXT_TSA", "DXT_SAT", "DXT_IELTS_DGNL", "DXT_IELTS_THPT"]:
+    for col in DXT_METHOD_COLUMNS:
         if col in df.columns:
             col_data = pd.to_numeric(df[col], errors="coerce").fillna(0)
             avg = col_data[col_data > 0].mean() if (col_data > 0).any() else 0
             if avg > 0:
-                methods[col.replace("DXT_", "")] = round(avg, 2)
+                methods[col.replace("DXT_", "")] = round(float(avg), 2)
     
     if not methods:
         return {"labels": [], "datasets": []}
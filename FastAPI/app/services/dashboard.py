@@ -0,0 +1,65 @@
+"""
+Kế hoạch tính theo section của dashboard: mỗi section chỉ cần một nguồn dữ liệu nên chỉ những
+truy vấn / bước tính mà các section được yêu cầu phụ thuộc vào mới được chạy.
+- "view": view đã làm sạch (hoặc thống kê ở chế độ sql / stream)
+- "major": thống kê nhập học theo ngành
+- "province": thống kê thí sinh theo tỉnh
+Ví dụ chỉ lấy admission_by_major thì không tải và làm sạch view.
+"""
+from typing import Dict, Iterable, List, Optional
+
+# Các chart của dashboard (cũng là các section của /analytics/charts)
+CHART_SECTIONS = ["admission_by_major", "demographics_by_province", "score_distribution", "thpt_subject_analysis"]
+
+# Mọi section theo thứ tự trong response dashboard
+DASHBOARD_SECTIONS = ["summary", *CHART_SECTIONS, "top_majors", "top_provinces"]
+
+# Nguồn dữ liệu mà từng section phụ thuộc
+SECTION_SOURCES = {
+    "summary": "view",
+    "admission_by_major": "major",
+    "demographics_by_province": "province",
+    "score_distribution": "view",
+    "thpt_subject_analysis": "view",
+    "top_majors": "major",
+    "top_provinces": "province",
+}
+
+
+def parse_sections(values: Optional[Iterable[str]], allowed: List[str]) -> Optional[List[str]]:
+    """
+    Chuẩn hoá tham số sections (lặp lại tham số hoặc phân tách bằng dấu phẩy) theo thứ tự của `allowed`
+    Returns:
+        None nếu không chỉ định (lấy tất cả)
+    Raises:
+        ValueError nếu có section không hợp lệ
+    """
+    if not values:
+        return None
+    requested = {part.strip() for value in values for part in value.split(",") if part.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise ValueError(f"Section không hợp lệ: {', '.join(unknown)} (hợp lệ: {', '.join(allowed)})")
+    return [section for section in allowed if section in requested] or None
+
+
+def plan_sections(sections: List[str]) -> Dict[str, List[str]]:
+    """{nguồn dữ liệu: các section dùng nguồn đó}, chỉ gồm các nguồn cần chạy"""
+    plan: Dict[str, List[str]] = {}
+    for section in sections:
+        plan.setdefault(SECTION_SOURCES[section], []).append(section)
+    return plan
+
+
+def assemble_dashboard(year: int, values: dict) -> dict:
+    """Response dashboard chỉ gồm các section đã tính (DashboardSectionsResponse, cùng bố cục với DashboardAnalyticsResponse)"""
+    result = {"year": year}
+    if "summary" in values:
+        result["summary"] = values["summary"]
+    charts = {name: values[name] for name in CHART_SECTIONS if name in values}
+    if charts:
+        result["charts"] = charts
+    for name in ("top_majors", "top_provinces"):
+        if name in values:
+            result[name] = values[name]
+    return result
@@ -0,0 +1,168 @@
+"""
+Drill-down dashboard theo các chiều phân loại bằng bitmap index trong bộ nhớ.
+
+Mỗi giá trị của một chiều (ngành, khối, tỉnh, giới tính, phương thức) có một bitmap
+(np.packbits, 1 bit / thí sinh). Bộ lọc được trả lời bằng OR các bitmap trong cùng chiều rồi
+AND (hoặc OR) giữa các chiều, chỉ chạm tới n/8 byte mỗi bitmap; sau đó chạy lại đúng các hàm
+summary / chart của app.services.analytics trên tập dòng đã chọn.
+"""
+from typing import Dict, List, Literal, Optional
+import numpy as np
+import pandas as pd
+from app.services.analytics import (
+    analyze_score_distribution,
+    build_thpt_subject_analysis_chart,
+    calculate_summary,
+    format_score_distribution_chart,
+)
+
+# Tên tham số lọc => cột của frame (MaPT lấy từ bảng phương thức, không nằm trong frame)
+EXPLORE_DIMENSIONS = {
+    "major": "TenNganh",
+    "block": "KhoiXetTuyen",
+    "province": "QueQuan",
+    "gender": "GioiTinh",
+    "method": "MaPT",
+}
+
+FilterCombine = Literal["and", "or"]
+
+# Số bit 1 của từng giá trị byte (popcount khi numpy < 2.0 chưa có np.bitwise_count)
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def _popcount(bitmap: np.ndarray) -> int:
+    """Số bit 1 của bitmap uint8"""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bitmap).sum())
+    return int(_BYTE_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+
+class BitmapIndex:
+    """
+    Frame đã làm sạch của một năm + bitmap theo từng giá trị của từng chiều
+    Chỉ đọc sau khi tạo: dùng chung giữa các request
+    """
+
+    def __init__(self, frame: pd.DataFrame, bitmaps: Dict[str, Dict[str, np.ndarray]]):
+        self.frame = frame
+        self.bitmaps = bitmaps
+        self.size = len(frame)
+        self._all = np.packbits(np.ones(self.size, dtype=bool))
+        self._none = np.zeros_like(self._all)
+
+    @property
+    def memory_bytes(self) -> int:
+        bitmap_bytes = sum(bitmap.nbytes for values in self.bitmaps.values() for bitmap in values.values())
+        return int(self.frame.memory_usage(deep=True).sum()) + bitmap_bytes
+
+    def _dimension_bitmap(self, dimension: str, values: List[str]) -> np.ndarray:
+        """OR các bitmap của những giá trị được chọn (giá trị không tồn tại => không khớp dòng nào)"""
+        if dimension not in self.bitmaps:
+            raise ValueError(f"Chiều lọc không hợp lệ: {dimension}")
+        result = self._none.copy()
+        for value in values:
+            bitmap = self.bitmaps[dimension].get(value)
+            if bitmap is not None:
+                np.bitwise_or(result, bitmap, out=result)
+        return result
+
+    def select(self, filters: Dict[str, List[str]], combine: FilterCombine = "and") -> np.ndarray:
+        """Bitmap các dòng khớp bộ lọc; không có bộ lọc => mọi dòng"""
+        filters = {dimension: values for dimension, values in filters.items() if values}
+        if not filters:
+            return self._all.copy()
+        result = None
+        for dimension, values in filters.items():
+            bitmap = self._dimension_bitmap(dimension, values)
+            if result is None:
+                result = bitmap
+            elif combine == "and":
+                np.bitwise_and(result, bitmap, out=result)
+            else:
+                np.bitwise_or(result, bitmap, out=result)
+        return result
+
+    def rows(self, selection: np.ndarray) -> pd.DataFrame:
+        positions = np.flatnonzero(np.unpackbits(selection, count=self.size))
+        if len(positions) == self.size:
+            return self.frame
+        return self.frame.take(positions)
+
+    def facets(self, selection: np.ndarray) -> Dict[str, Dict[str, int]]:
+        """Số thí sinh của từng giá trị mỗi chiều trong tập đã chọn (popcount của AND)"""
+        return {
+            dimension: {
+                value: _popcount(selection & bitmap)
+                for value, bitmap in values.items()
+            }
+            for dimension, values in self.bitmaps.items()
+        }
+
+
+def _category_bitmaps(column: pd.Series) -> Dict[str, np.ndarray]:
+    categorical = column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype("category")
+    codes = categorical.cat.codes.to_numpy()
+    return {
+        str(category): np.packbits(codes == code)
+        for code, category in enumerate(categorical.cat.categories)
+    }
+
+
+def build_bitmap_index(df: pd.DataFrame, methods: pd.DataFrame) -> BitmapIndex:
+    """
+    Tạo index từ kết quả analytics_repo.get_explore_data
+    - Chiều category của frame: so sánh codes một lượt cho mỗi giá trị
+    - Phương thức: đặt bit tại vị trí dòng của các CCCD thuộc phương thức (thí sinh có thể thuộc nhiều)
+    Cột CCCD bị bỏ khỏi frame sau khi dùng để ánh xạ vị trí
+    """
+    bitmaps: Dict[str, Dict[str, np.ndarray]] = {}
+    for dimension, column in EXPLORE_DIMENSIONS.items():
+        if column in df.columns:
+            bitmaps[dimension] = _category_bitmaps(df[column])
+
+    positions = pd.Index(df["CCCD"]).get_indexer(methods["CCCD"])
+    matched = positions >= 0
+    method_bitmaps = {}
+    for method, group_positions in pd.Series(positions[matched]).groupby(methods["MaPT"].to_numpy()[matched]):
+        mask = np.zeros(len(df), dtype=bool)
+        mask[group_positions.to_numpy()] = True
+        method_bitmaps[str(method)] = np.packbits(mask)
+    bitmaps["method"] = method_bitmaps
+
+    return BitmapIndex(df.drop(columns="CCCD"), bitmaps)
+
+
+def explore(
+    index: BitmapIndex,
+    filters: Dict[str, List[str]],
+    combine: FilterCombine = "and",
+    facets: bool = False,
+) -> dict:
+    """Summary + chart điểm của tập thí sinh khớp bộ lọc (cùng hàm với dashboard)"""
+    selection = index.select(filters, combine)
+    df = index.rows(selection)
+    result = {
+        "matched": int(len(df)),
+        "total": index.size,
+        "summary": calculate_summary(df),
+        "charts": {
+            "score_distribution": format_score_distribution_chart(analyze_score_distribution(df)),
+            "thpt_subject_analysis": build_thpt_subject_analysis_chart(df),
+        },
+    }
+    if facets:
+        result["facets"] = index.facets(selection)
+    return result
+
+
+def parse_filters(values: Dict[str, Optional[List[str]]]) -> Dict[str, List[str]]:
+    """Chuẩn hoá tham số lọc: bỏ chiều rỗng, bỏ trùng và sắp xếp giá trị (dùng làm cache key)"""
+    filters = {}
+    for dimension, raw_values in values.items():
+        if dimension not in EXPLORE_DIMENSIONS:
+            raise ValueError(f"Chiều lọc không hợp lệ: {dimension}")
+        items = sorted({value for value in raw_values or [] if value})
+        if items:
+            filters[dimension] = items
+    return filters
@@ -0,0 +1,152 @@
+import io
+import zlib
+from typing import Iterable, Iterator, Optional
+import pandas as pd
+
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv; charset=utf-8"),
+    "ndjson": ("ndjson", "application/x-ndjson"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+EXPORT_COMPRESSIONS = {
+    "gzip": ("gz", "application/gzip"),
+    "zstd": ("zst", "application/zstd"),
+}
+
+
+def export_filename(base_name: str, fmt: str, compression: Optional[str]) -> str:
+    """Tên file tải về, ví dụ tuyensinh_2024.csv.gz (Parquet nén bên trong file nên không thêm đuôi)"""
+    filename = f"{base_name}.{EXPORT_FORMATS[fmt][0]}"
+    if compression and fmt != "parquet":
+        filename += f".{EXPORT_COMPRESSIONS[compression][0]}"
+    return filename
+
+
+def export_media_type(fmt: str, compression: Optional[str]) -> str:
+    if compression and fmt != "parquet":
+        return EXPORT_COMPRESSIONS[compression][1]
+    return EXPORT_FORMATS[fmt][1]
+
+
+def _encode_csv(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+
+def _encode_ndjson(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        payload = chunk.to_json(orient="records", lines=True, date_format="iso", force_ascii=False)
+        if not payload.endswith("\n"):
+            payload += "\n"
+        yield payload.encode("utf-8")
+
+
+class _DrainableBuffer(io.RawIOBase):
+    """File-like chỉ ghi, lấy ra phần bytes đã ghi sau mỗi row group của Parquet"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema(column_kinds: dict):
+    import pyarrow as pa
+
+    types = {"float": pa.float64(), "integer": pa.int64(), "date": pa.date32(), "string": pa.string()}
+    return pa.schema([(name, types[kind]) for name, kind in column_kinds.items()])
+
+
+def _encode_parquet(chunks: Iterable[pd.DataFrame], column_kinds: dict, compression: Optional[str]) -> Iterator[bytes]:
+    """Mỗi chunk là một row group; bytes được đẩy ra ngay sau khi ghi xong row group"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(column_kinds)
+    sink = _DrainableBuffer()
+    writer = pq.ParquetWriter(sink, schema, compression=compression or "snappy")
+    try:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _compress(stream: Iterable[bytes], compression: Optional[str]) -> Iterator[bytes]:
+    """Nén luồng bytes ngay khi sinh ra (gzip hoặc zstd)"""
+    if compression is None:
+        yield from stream
+        return
+
+    if compression == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    else:
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor().compressobj()
+
+    for data in stream:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def check_export_options(fmt: str, compression: Optional[str]) -> None:
+    """Kiểm tra định dạng / kiểu nén và thư viện tuỳ chọn trước khi bắt đầu stream"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Định dạng không hỗ trợ: {fmt}")
+    if compression is not None and compression not in EXPORT_COMPRESSIONS:
+        raise ValueError(f"Kiểu nén không hỗ trợ: {compression}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ValueError("Export Parquet cần cài đặt pyarrow") from exc
+    elif compression == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError as exc:
+            raise ValueError("Nén zstd cần cài đặt zstandard") from exc
+
+
+def encode_export_stream(
+    chunks: Iterable[pd.DataFrame],
+    fmt: str,
+    column_kinds: dict,
+    compression: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Chuyển luồng DataFrame chunk thành luồng bytes theo định dạng export
+    - csv / ndjson: nén cả luồng bằng gzip/zstd nếu có yêu cầu
+    - parquet: dùng gzip/zstd làm codec bên trong file (file Parquet đã tự nén theo cột)
+    """
+    if fmt == "parquet":
+        return _encode_parquet(chunks, column_kinds, compression)
+    if fmt == "csv":
+        return _compress(_encode_csv(chunks), compression)
+    return _compress(_encode_ndjson(chunks), compression)
@@ -0,0 +1,146 @@
+"""
+Histogram điểm cấu hình được (độ rộng bin, khoảng, cột điểm, nhóm theo ngành / khối) bằng numpy.bincount.
+
+Mỗi điểm được đổi thành số nguyên `bin` (ceil((điểm - đầu khoảng) / độ rộng) - 1, sửa lệch làm tròn
+bằng so sánh với biên) rồi ghép với mã nhóm và offset của từng histogram thành một chỉ số phẳng:
+mọi histogram được yêu cầu (nhiều cột x nhiều nhóm) được đếm trong một lần np.bincount.
+
+Bin đóng bên phải, bin đầu gồm cả biên trái, giá trị ngoài khoảng bị bỏ: cùng quy ước và cùng nhãn
+với pd.cut(..., include_lowest=True) nên kết quả dùng thẳng được với format_score_distribution_chart.
+"""
+import math
+import os
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# Độ rộng bin mặc định (giống histogram điểm xét tuyển của dashboard)
+DEFAULT_BIN_WIDTH = 5
+
+# Số bin tối đa của một histogram
+HISTOGRAM_MAX_BINS = int(os.getenv("ANALYTICS_HISTOGRAM_MAX_BINS", "1000"))
+
+# Chiều nhóm được hỗ trợ -> cột của view
+HISTOGRAM_GROUPS = {"major": "TenNganh", "block": "KhoiXetTuyen"}
+
+
+def bin_edges(
+    max_score: float,
+    bin_width: float = DEFAULT_BIN_WIDTH,
+    lower: float = 0,
+    upper: Optional[float] = None,
+    min_upper: float = 0,
+) -> np.ndarray:
+    """
+    Biên các bin từ `lower`, mỗi bin rộng `bin_width`
+    - `upper` bỏ trống: bội số đầu tiên của bin_width lớn hơn max (tối thiểu `min_upper`); độ rộng nguyên
+      tính bằng phần nguyên của max như dashboard cũ (cùng kết quả, không lệch dấu phẩy động)
+    - `upper` không chia hết: bin cuối vẫn đủ độ rộng (phủ `upper`)
+    """
+    if bin_width <= 0:
+        raise ValueError("Độ rộng bin phải > 0")
+    if upper is None:
+        if float(bin_width).is_integer():
+            steps = int(max_score) // int(bin_width)
+        else:
+            # Độ rộng lẻ (0.5, 0.25...): tính trên max thật, làm tròn để 0.3 / 0.1 vẫn là 3 bước
+            steps = math.floor(round(max_score / bin_width, 9))
+        upper = max(min_upper, (steps + 1) * bin_width)
+    if upper <= lower:
+        raise ValueError("Khoảng histogram không hợp lệ (max phải > min)")
+    n_bins = math.ceil(round((upper - lower) / bin_width, 9))
+    if n_bins > HISTOGRAM_MAX_BINS:
+        raise ValueError(f"Quá nhiều bin ({n_bins} > {HISTOGRAM_MAX_BINS})")
+    return lower + bin_width * np.arange(n_bins + 1, dtype=np.float64)
+
+
+def bin_intervals(edges: np.ndarray) -> pd.IntervalIndex:
+    """Interval (và nhãn) mà pd.cut(include_lowest=True) sinh ra cho các biên"""
+    return pd.cut(pd.Series([], dtype=float), bins=edges, include_lowest=True).cat.categories
+
+
+def bucketize(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Chỉ số bin (int64) của từng giá trị; -1 nếu ngoài khoảng hoặc NaN"""
+    lower, width = edges[0], edges[1] - edges[0]
+    n_bins = len(edges) - 1
+    with np.errstate(invalid="ignore"):
+        scaled = (values - lower) / width
+        bucket = np.ceil(scaled)
+    bucket -= 1
+    np.clip(bucket, 0, n_bins - 1, out=bucket)
+    bucket = bucket.astype(np.int64)
+    # Phép chia dấu phẩy động có thể lệch một bin sát biên: chỉ các giá trị gần biên được so lại với biên thật
+    with np.errstate(invalid="ignore"):
+        near = np.flatnonzero(np.abs(scaled - np.rint(scaled)) < 1e-6)
+    if near.size:
+        near_values, near_bucket = values[near], bucket[near]
+        near_bucket -= (near_bucket > 0) & (near_values <= edges[near_bucket])
+        near_bucket += (near_bucket < n_bins - 1) & (near_values > edges[near_bucket + 1])
+        bucket[near] = near_bucket
+    bucket[~((values >= lower) & (values <= edges[-1]))] = -1
+    return bucket
+
+
+def compute_histograms(
+    df: pd.DataFrame,
+    columns: List[str],
+    bin_width: float = DEFAULT_BIN_WIDTH,
+    lower: float = 0,
+    upper: Optional[float] = None,
+    group_by: Optional[str] = None,
+    min_upper: float = 0,
+) -> Dict[str, dict]:
+    """
+    Histogram của từng cột điểm (NULL tính là 0 như analyze_score_distribution), có thể theo nhóm
+    Returns:
+        {cột: {"intervals": IntervalIndex, "total": mảng đếm, "groups": {nhóm: mảng đếm}}};
+        cột không có điểm > 0 (và không chỉ định `upper`) có intervals rỗng
+    """
+    n_rows = len(df)
+    if group_by is not None:
+        # Cột category (frame compact) được factorize trên mã, không đổi sang object
+        group_codes, group_names = pd.factorize(df[group_by], sort=True, use_na_sentinel=False)
+        group_names = ["N/A" if pd.isna(name) else str(name) for name in group_names]
+    else:
+        group_codes, group_names = np.zeros(n_rows, dtype=np.int64), []
+    n_groups = max(len(group_names), 1)
+
+    layouts = []
+    flat_parts = []
+    offset = 0
+    for column in columns:
+        values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64, na_value=0.0)
+        max_score = float(values.max()) if n_rows else 0.0
+        if upper is None and max_score <= 0:
+            layouts.append((column, None, offset))
+            continue
+        edges = bin_edges(max_score, bin_width, lower, upper, min_upper)
+        n_bins = len(edges) - 1
+        bucket = bucketize(values, edges)
+        inside = bucket >= 0
+        flat_parts.append(offset + group_codes[inside] * n_bins + bucket[inside])
+        layouts.append((column, edges, offset))
+        offset += n_groups * n_bins
+
+    counts = np.bincount(np.concatenate(flat_parts), minlength=offset) if flat_parts else np.zeros(0, np.int64)
+
+    result = {}
+    for column, edges, start in layouts:
+        if edges is None:
+            result[column] = {"intervals": pd.IntervalIndex([]), "total": np.zeros(0, np.int64), "groups": {}}
+            continue
+        n_bins = len(edges) - 1
+        table = counts[start:start + n_groups * n_bins].reshape(n_groups, n_bins)
+        result[column] = {
+            "intervals": bin_intervals(edges),
+            "total": table.sum(axis=0),
+            "groups": {name: table[i] for i, name in enumerate(group_names)},
+        }
+    return result
+
+
+def to_series(intervals: pd.IntervalIndex, counts: np.ndarray) -> pd.Series:
+    """Series (interval -> số thí sinh) như analyze_score_distribution trả về"""
+    if not len(intervals):
+        return pd.Series(dtype=int)
+    return pd.Series(counts, index=intervals, name="count")
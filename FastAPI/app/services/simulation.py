@@ -0,0 +1,197 @@
+"""
+Mô phỏng xét tuyển ảo: phân bổ thí sinh vào ngành theo chỉ tiêu, điểm theo phương thức và thứ tự
+nguyện vọng bằng thuật toán chấp nhận trì hoãn (deferred acceptance, thí sinh đề nghị).
+
+Mỗi vòng được vector hoá: mọi thí sinh đang bị từ chối cùng đề nghị nguyện vọng kế tiếp, rồi mỗi
+ngành giữ `chỉ tiêu` hồ sơ điểm cao nhất trong (hồ sơ đang giữ + đề nghị mới) bằng một lần
+np.lexsort theo (ngành, -điểm, thí sinh). Mỗi hồ sơ bị từ chối nhiều nhất một lần nên vòng lặp
+luôn dừng; thực tế chỉ vài vòng.
+
+Dữ liệu đã nạp được giữ trong ApplicationPool nên thay đổi chỉ tiêu (what-if) chỉ chạy lại phân bổ.
+"""
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+class ApplicationPool:
+    """
+    Hồ sơ hợp lệ của một năm dạng mảng, sắp theo (thí sinh, thứ tự nguyện vọng)
+    - `applicant`, `major`, `method`: mã số nguyên; `score`: điểm xét của hồ sơ
+    - Nguyện vọng của thí sinh i nằm trong [starts[i], ends[i])
+    Chỉ đọc sau khi tạo: dùng chung giữa các request
+    """
+
+    def __init__(
+        self,
+        applicant: np.ndarray,
+        major: np.ndarray,
+        method: np.ndarray,
+        score: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        majors: pd.DataFrame,
+        methods: pd.Index,
+        invalid_applications: int,
+    ):
+        self.applicant = applicant
+        self.major = major
+        self.method = method
+        self.score = score
+        self.starts = starts
+        self.ends = ends
+        self.majors = majors
+        self.methods = methods
+        self.invalid_applications = invalid_applications
+        self.base_quotas = majors["ChiTieu"].fillna(0).to_numpy(dtype=np.int64)
+
+    @property
+    def applicants(self) -> int:
+        return int(np.count_nonzero(self.ends > self.starts))
+
+    @property
+    def applications(self) -> int:
+        return len(self.applicant)
+
+
+def _application_scores(applications: pd.DataFrame) -> np.ndarray:
+    """Điểm của hồ sơ = cột DXT_<MaPT> của thí sinh, phương thức không có cột riêng thì DiemXetTuyen"""
+    methods = applications["MaPT"].astype("category")
+    score = np.full(len(applications), np.nan)
+    for code, method in enumerate(methods.cat.categories):
+        column = f"DXT_{method}" if f"DXT_{method}" in applications.columns else "DiemXetTuyen"
+        rows = methods.cat.codes.to_numpy() == code
+        score[rows] = pd.to_numeric(applications[column], errors="coerce").to_numpy(dtype=np.float64)[rows]
+    return score
+
+
+def build_application_pool(applications: pd.DataFrame, majors: pd.DataFrame) -> ApplicationPool:
+    """
+    Tạo pool từ kết quả simulation_repo.get_simulation_data
+    - Thứ tự nguyện vọng: NgayXacNhan rồi MaNganh (HO_SO_NHAP_HOC không lưu số thứ tự nguyện vọng)
+    - Hồ sơ không có điểm (NULL / <= 0) theo phương thức của nó không được xét
+    """
+    majors = majors.sort_values("MaNganh").reset_index(drop=True)
+    score = _application_scores(applications)
+    major = pd.Index(majors["MaNganh"]).get_indexer(applications["MaNganh"])
+    valid = (score > 0) & (major >= 0)
+
+    applicant_codes, _ = pd.factorize(applications["CCCD"])
+    method_codes, methods = pd.factorize(applications["MaPT"])
+    confirmed = pd.to_datetime(applications["NgayXacNhan"]).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    confirmed = np.where(pd.isna(applications["NgayXacNhan"]).to_numpy(), np.iinfo(np.int64).max, confirmed)
+
+    order = np.lexsort((major, confirmed, applicant_codes))
+    order = order[valid[order]]
+    applicant = applicant_codes[order].astype(np.int64)
+    candidates = np.arange(int(applicant_codes.max()) + 1 if len(applicant_codes) else 0)
+
+    return ApplicationPool(
+        applicant=applicant,
+        major=major[order].astype(np.int64),
+        method=method_codes[order].astype(np.int64),
+        score=score[order],
+        starts=np.searchsorted(applicant, candidates, side="left"),
+        ends=np.searchsorted(applicant, candidates, side="right"),
+        majors=majors,
+        methods=pd.Index(methods),
+        invalid_applications=int(len(applications) - len(order)),
+    )
+
+
+def resolve_quotas(pool: ApplicationPool, overrides: Optional[Dict[str, int]] = None) -> np.ndarray:
+    """Chỉ tiêu của từng ngành: NGANH.ChiTieu, ghi đè bởi `overrides` {MaNganh: chỉ tiêu} (what-if)"""
+    quotas = pool.base_quotas.copy()
+    if not overrides:
+        return quotas
+    positions = pd.Index(pool.majors["MaNganh"]).get_indexer(list(overrides))
+    unknown = [code for code, position in zip(overrides, positions) if position < 0]
+    if unknown:
+        raise ValueError(f"Ngành không tồn tại: {', '.join(unknown)}")
+    values = np.array(list(overrides.values()), dtype=np.int64)
+    if (values < 0).any():
+        raise ValueError("Chỉ tiêu không được âm")
+    quotas[positions] = values
+    return quotas
+
+
+def run_deferred_acceptance(pool: ApplicationPool, quotas: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Phân bổ ổn định (thí sinh đề nghị), hoà điểm xếp theo mã thí sinh
+    Returns:
+        (chỉ số các hồ sơ trúng tuyển, sắp theo (ngành, -điểm)), số vòng
+    """
+    next_choice = pool.starts.copy()
+    pending = np.flatnonzero(pool.starts < pool.ends)
+    held = np.empty(0, dtype=np.int64)
+    rounds = 0
+
+    while pending.size:
+        rounds += 1
+        proposals = next_choice[pending]
+        next_choice[pending] += 1
+
+        candidates = np.concatenate([held, proposals])
+        major = pool.major[candidates]
+        order = np.lexsort((pool.applicant[candidates], -pool.score[candidates], major))
+        candidates = candidates[order]
+        major = major[order]
+        # Thứ hạng trong ngành = vị trí trong khối cùng ngành (mảng đã sắp theo ngành)
+        rank = np.arange(len(candidates)) - np.searchsorted(major, major, side="left")
+        keep = rank < quotas[major]
+
+        held = candidates[keep]
+        rejected = pool.applicant[candidates[~keep]]
+        pending = rejected[next_choice[rejected] < pool.ends[rejected]]
+
+    return held, rounds
+
+
+def simulate(pool: ApplicationPool, quota_overrides: Optional[Dict[str, int]] = None) -> dict:
+    """Điểm chuẩn (điểm thấp nhất trúng tuyển) và tỉ lệ lấp đầy chỉ tiêu của từng ngành"""
+    quotas = resolve_quotas(pool, quota_overrides)
+    held, rounds = run_deferred_acceptance(pool, quotas)
+
+    n_majors = len(pool.majors)
+    major = pool.major[held]
+    score = pool.score[held]
+    admitted = np.bincount(major, minlength=n_majors)
+
+    # held sắp theo (ngành, -điểm): hồ sơ cuối mỗi khối ngành có điểm thấp nhất
+    cutoffs = np.full(n_majors, np.nan)
+    if len(held):
+        last = np.flatnonzero(np.r_[major[1:] != major[:-1], True])
+        cutoffs[major[last]] = score[last]
+
+    method_cutoffs = (
+        pd.DataFrame({"major": major, "method": pool.methods.take(pool.method[held]), "score": score})
+        .groupby(["major", "method"], sort=True)["score"]
+        .min()
+    )
+    by_method: Dict[int, Dict[str, float]] = {}
+    for (major_code, method), value in method_cutoffs.items():
+        by_method.setdefault(int(major_code), {})[str(method)] = round(float(value), 2)
+
+    results = []
+    for i, row in enumerate(pool.majors.itertuples(index=False)):
+        quota = int(quotas[i])
+        count = int(admitted[i])
+        results.append({
+            "major_code": str(row.MaNganh),
+            "major_name": str(row.TenNganh or "N/A"),
+            "quota": quota,
+            "admitted": count,
+            "fill_rate": round(count / quota * 100, 2) if quota > 0 else 0.0,
+            "cutoff_score": None if np.isnan(cutoffs[i]) else round(float(cutoffs[i]), 2),
+            "cutoff_by_method": by_method.get(i, {}),
+        })
+
+    return {
+        "applicants": pool.applicants,
+        "applications": pool.applications,
+        "invalid_applications": pool.invalid_applications,
+        "admitted": int(len(held)),
+        "unmatched": pool.applicants - int(len(held)),
+        "rounds": rounds,
+        "majors": results,
+    }
@@ -0,0 +1,123 @@
+"""
+Tính thống kê theo từng chunk của view để bộ nhớ không phụ thuộc số thí sinh.
+Các accumulator cộng dồn được (merge giữa chunk / worker) và sinh ra cùng dạng thống kê đủ
+như app.repository.aggregation_repo.get_aggregated_stats, nên dùng lại được các hàm
+*_from_stats trong app.services.aggregation. Việc thay NULL/0 bằng trung bình của
+clean_admission_data được tái tạo từ (tổng, số lượng) của giá trị > 0, nên chỉ cần một lượt đọc.
+"""
+from collections import Counter
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from app.services.analytics import DXT_METHOD_COLUMNS, SCORE_BIN_WIDTH
+
+# Các cột điểm mà summary và 2 chart điểm cần
+STREAM_SCORE_COLUMNS = ["TongDiemTHPT", "HSA", "TSA", "IELTS", "DiemXetTuyen"] + DXT_METHOD_COLUMNS
+
+
+def _empty_column_stats() -> dict:
+    return {"pos_count": 0, "pos_sum": 0.0, "pos_max": None, "neg_count": 0, "neg_sum": 0.0, "neg_max": None}
+
+
+def _max(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+class AdmissionStatsAccumulator:
+    """
+    Accumulator cho summary, phân phối điểm và chart theo phương thức
+    - Đếm / tổng / max của giá trị > 0 và < 0 cho từng cột điểm
+    - Tập ngành (nunique) và bộ đếm quê quán (mode)
+    - Histogram bin `bin_width` điểm của DiemXetTuyen > 0
+    """
+
+    def __init__(self, score_columns: Optional[list] = None, bin_width: int = SCORE_BIN_WIDTH):
+        self.score_columns = score_columns or STREAM_SCORE_COLUMNS
+        self.bin_width = bin_width
+        self.total = 0
+        self.majors = set()
+        self.provinces = Counter()
+        self.columns = {col: _empty_column_stats() for col in self.score_columns}
+        self.score_buckets = np.zeros(0, dtype=np.int64)
+
+    def update(self, chunk: pd.DataFrame) -> "AdmissionStatsAccumulator":
+        """Cộng dồn một chunk chưa làm sạch"""
+        self.total += len(chunk)
+
+        if "TenNganh" in chunk.columns:
+            self.majors.update(chunk["TenNganh"].dropna().unique().tolist())
+        if "QueQuan" in chunk.columns:
+            self.provinces.update(chunk["QueQuan"].dropna().value_counts().to_dict())
+
+        for col in self.score_columns:
+            if col not in chunk.columns:
+                continue
+            values = pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            positive = values[values > 0]
+            negative = values[values < 0]
+            col_stats = self.columns[col]
+            if len(positive) > 0:
+                col_stats["pos_count"] += len(positive)
+                col_stats["pos_sum"] += float(positive.sum())
+                col_stats["pos_max"] = _max(col_stats["pos_max"], float(positive.max()))
+            if len(negative) > 0:
+                col_stats["neg_count"] += len(negative)
+                col_stats["neg_sum"] += float(negative.sum())
+                col_stats["neg_max"] = _max(col_stats["neg_max"], float(negative.max()))
+            if col == "DiemXetTuyen" and len(positive) > 0:
+                self._add_buckets(positive)
+
+        return self
+
+    def _add_buckets(self, positive: np.ndarray) -> None:
+        # Bin đóng bên phải giống pd.cut: bin i = (w*i, w*(i+1)], bin 0 gồm cả 0
+        buckets = np.where(positive <= self.bin_width, 0, np.ceil(positive / self.bin_width) - 1).astype(np.int64)
+        self._merge_bucket_counts(np.bincount(buckets))
+
+    def _merge_bucket_counts(self, counts: np.ndarray) -> None:
+        if len(counts) > len(self.score_buckets):
+            counts, self.score_buckets = self.score_buckets, counts.copy()
+        self.score_buckets[: len(counts)] += counts
+
+    def merge(self, other: "AdmissionStatsAccumulator") -> "AdmissionStatsAccumulator":
+        """Gộp accumulator khác (chunk / worker khác) vào accumulator này"""
+        self.total += other.total
+        self.majors |= other.majors
+        self.provinces.update(other.provinces)
+        for col, other_stats in other.columns.items():
+            col_stats = self.columns.setdefault(col, _empty_column_stats())
+            col_stats["pos_count"] += other_stats["pos_count"]
+            col_stats["pos_sum"] += other_stats["pos_sum"]
+            col_stats["pos_max"] = _max(col_stats["pos_max"], other_stats["pos_max"])
+            col_stats["neg_count"] += other_stats["neg_count"]
+            col_stats["neg_sum"] += other_stats["neg_sum"]
+            col_stats["neg_max"] = _max(col_stats["neg_max"], other_stats["neg_max"])
+        self._merge_bucket_counts(other.score_buckets)
+        return self
+
+    def to_stats(self) -> dict:
+        """Thống kê đủ cùng dạng với aggregation_repo.get_aggregated_stats"""
+        top_province = None
+        if self.provinces:
+            # Hoà thì lấy giá trị nhỏ nhất theo thứ tự chuỗi, giống Series.mode
+            top_province = min(self.provinces.items(), key=lambda item: (-item[1], item[0]))[0]
+
+        return {
+            "total": self.total,
+            "total_majors": len(self.majors),
+            "columns": {col: dict(col_stats) for col, col_stats in self.columns.items()},
+            "top_province": top_province,
+            "score_buckets": {i: int(count) for i, count in enumerate(self.score_buckets) if count > 0},
+        }
+
+
+def accumulate_chunks(chunks: Iterable[pd.DataFrame]) -> dict:
+    """Đọc lần lượt các chunk (giữ một chunk trong bộ nhớ) và trả về thống kê đủ"""
+    accumulator = AdmissionStatsAccumulator()
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator.to_stats()
@@ -0,0 +1,74 @@
+"""
+Chuỗi thời gian nhiều năm (xem analytics_repo.get_trend_data), dạng cột cho line chart:
+mọi danh sách giá trị thẳng hàng với `years`.
+"""
+from typing import List
+import numpy as np
+import pandas as pd
+from app.services.analytics import build_thpt_subject_analysis_chart, calculate_summary
+
+
+def _year_table(df: pd.DataFrame, key: str, years: List[int]) -> pd.DataFrame:
+    """Bảng đếm (key x năm) bằng một groupby, năm không có dữ liệu = 0"""
+    return df.groupby([key, "NamTuyenSinh"]).size().unstack(fill_value=0).reindex(columns=years, fill_value=0)
+
+
+def build_major_trends(applications: pd.DataFrame, majors: pd.DataFrame, years: List[int]) -> dict:
+    """Số nhập học và tỉ lệ lấp đầy chỉ tiêu (so_luong_nhap_hoc / ChiTieu) của từng ngành theo năm"""
+    counts = _year_table(applications, "MaNganh", years).reindex(index=majors["MaNganh"], fill_value=0)
+    admitted = counts.to_numpy(dtype=np.int64)
+    quota = majors["ChiTieu"].fillna(0).to_numpy(dtype=np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.where(quota[:, None] > 0, np.round(admitted / quota[:, None] * 100, 2), 0.0)
+    return {
+        "codes": majors["MaNganh"].astype(str).tolist(),
+        "names": majors["TenNganh"].fillna("N/A").astype(str).tolist(),
+        "quota": quota.tolist(),
+        "admitted": admitted.tolist(),
+        "fulfillment_rate": rates.tolist(),
+    }
+
+
+def build_province_trends(applications: pd.DataFrame, years: List[int]) -> dict:
+    """Số thí sinh theo quê quán và năm, sắp theo tổng giảm dần"""
+    counts = _year_table(applications.dropna(subset=["QueQuan"]), "QueQuan", years)
+    counts = counts.loc[counts.sum(axis=1).sort_values(ascending=False, kind="stable").index]
+    return {"names": counts.index.astype(str).tolist(), "counts": counts.to_numpy(dtype=np.int64).tolist()}
+
+
+def build_summary_trends(students: pd.DataFrame, years: List[int]) -> dict:
+    """
+    Summary (calculate_summary) và điểm xét tuyển trung bình theo phương thức của từng năm,
+    tính trên frame đã làm sạch theo năm nên khớp với dashboard của năm đó
+    """
+    groups = dict(tuple(students.groupby("NamTuyenSinh", sort=True)))
+    summaries = []
+    method_averages = {}
+    for i, year in enumerate(years):
+        group = groups.get(year, students.iloc[0:0])
+        summaries.append(calculate_summary(group).model_dump())
+        chart = build_thpt_subject_analysis_chart(group)
+        for label, value in zip(chart["labels"], chart["datasets"][0]["data"] if chart["datasets"] else []):
+            method_averages.setdefault(label, [None] * len(years))[i] = value
+
+    fields = list(summaries[0]) if summaries else []
+    return {
+        "summary": {field: [summary[field] for summary in summaries] for field in fields},
+        "methods": {"names": list(method_averages), "avg_score": list(method_averages.values())},
+    }
+
+
+def build_trends(
+    applications: pd.DataFrame,
+    students: pd.DataFrame,
+    majors: pd.DataFrame,
+    from_year: int,
+    to_year: int,
+) -> dict:
+    years = list(range(from_year, to_year + 1))
+    return {
+        "years": years,
+        **build_summary_trends(students, years),
+        "majors": build_major_trends(applications, majors, years),
+        "provinces": build_province_trends(applications, years),
+    }
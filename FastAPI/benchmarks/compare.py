@@ -0,0 +1,67 @@
+"""
+So sánh 2 báo cáo của benchmarks.run (ví dụ trước và sau một commit)
+
+Chạy (trong thư mục FastAPI):
+    python -m benchmarks.compare base.json new.json --threshold 0.10
+Thoát với mã 1 nếu có case chậm hơn quá `threshold` (tính theo median) và có --fail-on-regression
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {(result["scale"], result["group"], result["name"]): result for result in report["results"]}
+
+
+def compare(base: dict, new: dict, threshold: float) -> list:
+    """Trả về các dòng (scale, group, name, median cũ, median mới, tỉ lệ, bộ nhớ cũ, bộ nhớ mới, trạng thái)"""
+    rows = []
+    for key in sorted(base.keys() & new.keys()):
+        old, cur = base[key], new[key]
+        ratio = cur["median_s"] / old["median_s"] if old["median_s"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "chậm hơn"
+        elif ratio < 1 - threshold:
+            verdict = "nhanh hơn"
+        else:
+            verdict = ""
+        rows.append((*key, old["median_s"], cur["median_s"], ratio, old["peak_memory_bytes"], cur["peak_memory_bytes"], verdict))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="So sánh 2 báo cáo benchmark")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Chênh lệch median coi là có ý nghĩa")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    base = load_results(args.base)
+    new = load_results(args.new)
+    rows = compare(base, new, args.threshold)
+
+    print(f"{'scale':>9} {'case':<62} {'base ms':>10} {'new ms':>10} {'x':>6} {'base MB':>9} {'new MB':>9}")
+    for scale, group, name, old_s, new_s, ratio, old_mem, new_mem, verdict in rows:
+        print(
+            f"{scale:>9} {group + ' ' + name:<62} {old_s * 1000:10.2f} {new_s * 1000:10.2f} {ratio:6.2f} "
+            f"{old_mem / 2**20:9.1f} {new_mem / 2**20:9.1f} {verdict}"
+        )
+
+    only_base = sorted(base.keys() - new.keys())
+    only_new = sorted(new.keys() - base.keys())
+    if only_base:
+        print(f"Chỉ có trong {args.base}: {len(only_base)} case")
+    if only_new:
+        print(f"Chỉ có trong {args.new}: {len(only_new)} case")
+
+    regressions = [row for row in rows if row[-1] == "chậm hơn"]
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
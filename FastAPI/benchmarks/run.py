@@ -0,0 +1,326 @@
+"""
+Bộ benchmark cho repository, làm sạch dữ liệu, service và endpoint analytics
+
+- Mỗi quy mô (số thí sinh) dùng một database SQLite riêng do benchmarks.datagen sinh ra
+  (được giữ lại giữa các lần chạy, xoá file hoặc dùng --regenerate để sinh lại)
+- Mỗi quy mô chạy trong một tiến trình con để cache, engine và bộ nhớ không lẫn giữa các quy mô
+- Mỗi case: 1 lần chạy khởi động, `repeat` lần đo thời gian, rồi 1 lần đo bộ nhớ đỉnh bằng tracemalloc
+- Kết quả ghi ra file JSON (xem benchmarks.compare để so sánh giữa các commit)
+
+Chạy (trong thư mục FastAPI):
+    python -m benchmarks.run --scales 10000,100000 --repeat 5 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List, Optional
+
+REPORT_SCHEMA = 1
+
+
+class Case:
+    """Một phép đo: `run` được đo, `setup` chạy trước mỗi lần đo (không tính giờ)"""
+
+    def __init__(self, group: str, name: str, run: Callable[[], object], setup: Optional[Callable[[], None]] = None):
+        self.group = group
+        self.name = name
+        self.run = run
+        self.setup = setup
+
+
+def measure(case: Case, repeat: int) -> dict:
+    if case.setup:
+        case.setup()
+    case.run()
+
+    timings = []
+    for _ in range(repeat):
+        if case.setup:
+            case.setup()
+        started = time.perf_counter()
+        case.run()
+        timings.append(time.perf_counter() - started)
+
+    if case.setup:
+        case.setup()
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "group": case.group,
+        "name": case.name,
+        "repeat": repeat,
+        "min_s": round(min(timings), 6),
+        "median_s": round(statistics.median(timings), 6),
+        "mean_s": round(statistics.fmean(timings), 6),
+        "max_s": round(max(timings), 6),
+        "peak_memory_bytes": peak,
+    }
+
+
+def build_cases(year: int) -> List[Case]:
+    """Tạo danh sách case; import app ở đây vì DATABASE_URL phải được đặt trước"""
+    import pandas as pd
+    from fastapi.testclient import TestClient
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.models import TkWatermark
+    from app.repository import analytics_repo
+    from app.repository.aggregation_repo import get_aggregated_stats
+    from app.repository.export_repo import EXPORT_COLUMNS, get_export_column_kinds, iter_cleaned_view_chunks
+    from app.repository.rollup_repo import refresh_rollups
+    from app.routers import analytics as analytics_router
+    from app.services import aggregation, analytics, visualization
+    from app.services.export import encode_export_stream
+    from app.services.streaming import accumulate_chunks
+
+    db = SessionLocal()
+    refresh_rollups(db, year)
+
+    raw_chunks = list(analytics_repo.iter_view_admission_chunks(db, year))
+    raw_view = pd.concat(raw_chunks, ignore_index=True) if raw_chunks else pd.DataFrame()
+    clean_view = analytics_repo.clean_admission_data_fast(raw_view)
+    stats = get_aggregated_stats(db, year)
+    df_major = analytics_repo.get_admission_by_major(db, year)
+    df_province = analytics_repo.get_demographics_by_province(db, year)
+    score_distribution = analytics.analyze_score_distribution(clean_view)
+    export_kinds = get_export_column_kinds(EXPORT_COLUMNS)
+
+    client = TestClient(app)
+    dashboard_etag = {}
+
+    def consume(iterator) -> int:
+        return sum(len(item) for item in iterator)
+
+    def drop_watermark():
+        db.query(TkWatermark).filter(TkWatermark.NamTuyenSinh == year).delete()
+        db.commit()
+
+    def prime_view_cache():
+        analytics_repo.get_cached_view_admission_data(db, year, columns=analytics_repo.ANALYTICS_COLUMNS, compact=True)
+
+    def get(path: str, headers: Optional[dict] = None):
+        response = client.get(path, headers=headers)
+        if response.status_code not in (200, 304):
+            raise RuntimeError(f"{path}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+
+    def cold():
+        """Request lạnh thật: không cache DataFrame, không body đã serialize, không payload tính sẵn"""
+        analytics_repo.clear_view_cache()
+        analytics_router._response_cache.invalidate()
+        analytics_router.precompute_scheduler.invalidate()
+
+    def prime_dashboard():
+        cold()
+        dashboard_etag["value"] = get(f"/analytics/dashboard?year={year}").headers["etag"]
+
+    return [
+        # Repository
+        Case("repository", "get_view_admission_data", lambda: analytics_repo.get_view_admission_data(db, year)),
+        Case(
+            "repository",
+            "get_view_admission_data[analytics_columns,compact]",
+            lambda: analytics_repo.get_view_admission_data(
+                db, year, columns=analytics_repo.ANALYTICS_COLUMNS, compact=True
+            ),
+        ),
+        Case("repository", "get_cached_view_admission_data[hit]", prime_view_cache, setup=prime_view_cache),
+        Case("repository", "get_data_version", lambda: analytics_repo.get_data_version(db, year)),
+        Case(
+            "repository",
+            "iter_view_admission_chunks",
+            lambda: consume(analytics_repo.iter_view_admission_chunks(db, year, columns=analytics_repo.ANALYTICS_COLUMNS)),
+        ),
+        Case("repository", "get_admitted_students_scores", lambda: analytics_repo.get_admitted_students_scores(db, year)),
+        Case(
+            "repository",
+            "get_admission_by_major[live]",
+            lambda: analytics_repo.get_admission_by_major(db, year, use_rollup=False),
+        ),
+        Case("repository", "get_admission_by_major[rollup]", lambda: analytics_repo.get_admission_by_major(db, year)),
+        Case(
+            "repository",
+            "get_demographics_by_province[live]",
+            lambda: analytics_repo.get_demographics_by_province(db, year, use_rollup=False),
+        ),
+        Case(
+            "repository",
+            "get_demographics_by_province[rollup]",
+            lambda: analytics_repo.get_demographics_by_province(db, year),
+        ),
+        Case("repository", "get_aggregated_stats", lambda: get_aggregated_stats(db, year)),
+        Case("repository", "refresh_rollups[full]", lambda: refresh_rollups(db, year), setup=drop_watermark),
+        Case("repository", "iter_cleaned_view_chunks", lambda: consume(iter_cleaned_view_chunks(db, year))),
+        # Làm sạch dữ liệu
+        Case("cleaning", "clean_admission_data", lambda: analytics_repo.clean_admission_data(raw_view)),
+        Case("cleaning", "clean_admission_data_fast", lambda: analytics_repo.clean_admission_data_fast(raw_view)),
+        Case(
+            "cleaning",
+            "compact_admission_dtypes",
+            lambda: analytics_repo.compact_admission_dtypes(clean_view.copy()),
+        ),
+        # Service (dữ liệu đã nạp sẵn trong bộ nhớ)
+        Case("service", "calculate_summary", lambda: analytics.calculate_summary(clean_view)),
+        Case("service", "analyze_score_distribution", lambda: analytics.analyze_score_distribution(clean_view)),
+        Case("service", "format_score_distribution_chart", lambda: analytics.format_score_distribution_chart(score_distribution)),
+        Case("service", "build_thpt_subject_analysis_chart", lambda: analytics.build_thpt_subject_analysis_chart(clean_view)),
+        Case("service", "map_major_items", lambda: analytics.map_major_items(df_major)),
+        Case("service", "map_province_items", lambda: analytics.map_province_items(df_province)),
+        Case("service", "format_major_admission_chart", lambda: visualization.format_major_admission_chart(df_major)),
+        Case("service", "format_province_pie_chart", lambda: visualization.format_province_pie_chart(df_province)),
+        Case("service", "summary_from_stats", lambda: aggregation.summary_from_stats(stats)),
+        Case("service", "score_distribution_from_stats", lambda: aggregation.score_distribution_from_stats(stats)),
+        Case("service", "thpt_subject_chart_from_stats", lambda: aggregation.thpt_subject_chart_from_stats(stats)),
+        Case("service", "accumulate_chunks", lambda: accumulate_chunks(raw_chunks)),
+        Case(
+            "service",
+            "encode_export_stream[csv]",
+            lambda: consume(encode_export_stream([clean_view[EXPORT_COLUMNS]], "csv", export_kinds)),
+        ),
+        Case(
+            "service",
+            "encode_export_stream[ndjson,gzip]",
+            lambda: consume(encode_export_stream([clean_view[EXPORT_COLUMNS]], "ndjson", export_kinds, "gzip")),
+        ),
+        # Endpoint (qua TestClient, cache được xoá trước mỗi lần đo trừ các case [hit] / [304])
+        Case("endpoint", "GET /analytics/dashboard[pandas]", lambda: get(f"/analytics/dashboard?year={year}"), setup=cold),
+        Case("endpoint", "GET /analytics/dashboard[sql]", lambda: get(f"/analytics/dashboard?year={year}&mode=sql"), setup=cold),
+        Case(
+            "endpoint",
+            "GET /analytics/dashboard[stream]",
+            lambda: get(f"/analytics/dashboard?year={year}&mode=stream"),
+            setup=cold,
+        ),
+        Case("endpoint", "GET /analytics/dashboard[hit]", lambda: get(f"/analytics/dashboard?year={year}")),
+        Case(
+            "endpoint",
+            "GET /analytics/dashboard[304]",
+            lambda: get(f"/analytics/dashboard?year={year}", headers={"If-None-Match": dashboard_etag["value"]}),
+            setup=prime_dashboard,
+        ),
+        Case("endpoint", "GET /analytics/summary[pandas]", lambda: get(f"/analytics/summary?year={year}"), setup=cold),
+        Case("endpoint", "GET /analytics/charts[pandas]", lambda: get(f"/analytics/charts?year={year}"), setup=cold),
+        Case("endpoint", "GET /analytics/export[csv]", lambda: get(f"/analytics/export?year={year}")),
+    ]
+
+
+def run_worker(scale: int, year: int, repeat: int, only: Optional[str]) -> dict:
+    """Chạy mọi case trên database hiện tại (DATABASE_URL đã trỏ tới database của `scale`)"""
+    cases = build_cases(year)
+    results = []
+    for case in cases:
+        if only and only not in case.name:
+            continue
+        result = measure(case, repeat)
+        result["scale"] = scale
+        results.append(result)
+        print(f"[{scale}] {case.group:<10} {case.name:<55} {result['median_s'] * 1000:10.2f} ms", file=sys.stderr)
+    return {"results": results}
+
+
+def _git_info() -> dict:
+    def git(*args) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def _package_versions() -> dict:
+    from importlib import metadata
+
+    versions = {}
+    for package in ("fastapi", "sqlalchemy", "pandas", "numpy", "pydantic"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def _database_path(data_dir: str, scale: int, seed: int) -> str:
+    from benchmarks.datagen import DATAGEN_VERSION
+
+    return os.path.join(data_dir, f"bench_{scale}_{seed}_v{DATAGEN_VERSION}.db")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark analytics theo quy mô dữ liệu")
+    parser.add_argument("--scales", default="10000,100000", help="Các quy mô (số thí sinh), phân tách bằng dấu phẩy")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=".benchmarks", help="Thư mục chứa database sinh ra")
+    parser.add_argument("--regenerate", action="store_true", help="Sinh lại database kể cả khi đã có")
+    parser.add_argument("--only", help="Chỉ chạy các case có tên chứa chuỗi này")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        # Tiến trình con: DATABASE_URL đã được tiến trình cha đặt
+        print(json.dumps(run_worker(args.worker, args.year, args.repeat, args.only)))
+        return
+
+    from benchmarks.datagen import generate
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+    datasets = {}
+    results = []
+    for scale in scales:
+        path = _database_path(args.data_dir, scale, args.seed)
+        database_url = f"sqlite:///{os.path.abspath(path)}"
+        if args.regenerate and os.path.exists(path):
+            os.remove(path)
+        if not os.path.exists(path):
+            print(f"Sinh dữ liệu {scale} thí sinh => {path}", file=sys.stderr)
+            datasets[scale] = generate(database_url, scale, args.seed)
+        else:
+            datasets[scale] = {"candidates": scale, "seed": args.seed, "reused": True}
+
+        command = [
+            sys.executable, "-m", "benchmarks.run",
+            "--worker", str(scale), "--year", str(args.year), "--repeat", str(args.repeat),
+        ]
+        if args.only:
+            command += ["--only", args.only]
+        env = dict(os.environ, DATABASE_URL=database_url)
+        completed = subprocess.run(command, env=env, stdout=subprocess.PIPE, text=True, check=True)
+        results.extend(json.loads(completed.stdout.strip().splitlines()[-1])["results"])
+
+    report = {
+        "schema": REPORT_SCHEMA,
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git": _git_info(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "packages": _package_versions(),
+            "year": args.year,
+            "repeat": args.repeat,
+            "datasets": {str(scale): info for scale, info in datasets.items()},
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Đã ghi {len(results)} kết quả vào {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark thời gian import / khởi động worker (cold start)
+
+Mỗi lần đo là một tiến trình Python mới:
+- import_s: thời gian `import app.main`
+- startup_s: thời gian chạy lifespan (tạo schema nếu bật) tới khi GET / trả về
+- first_dashboard_s: request /analytics/dashboard đầu tiên (gồm cả import pandas nếu chưa nạp)
+- pandas_on_import: pandas đã bị nạp ngay khi import app.main hay chưa
+
+Chạy (trong thư mục FastAPI):
+    python -m benchmarks.startup --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# Cấu hình được so sánh: mặc định dev (tạo schema lúc khởi động) và production
+STARTUP_PROFILES = {
+    "development": {"APP_ENV": "development"},
+    "production": {"APP_ENV": "production", "ANALYTICS_PRELOAD": "0"},
+    "production+preload": {"APP_ENV": "production", "ANALYTICS_PRELOAD": "1"},
+}
+
+
+def run_once(year: int) -> dict:
+    started = time.perf_counter()
+    from app.main import app
+
+    imported = time.perf_counter()
+    pandas_on_import = "pandas" in sys.modules
+
+    from fastapi.testclient import TestClient
+
+    client_started = time.perf_counter()
+    with TestClient(app) as client:
+        client.get("/")
+        ready = time.perf_counter()
+        response = client.get(f"/analytics/dashboard?year={year}")
+        first_dashboard = time.perf_counter()
+
+    return {
+        "import_s": imported - started,
+        "startup_s": ready - client_started,
+        "first_dashboard_s": first_dashboard - ready,
+        "dashboard_status": response.status_code,
+        "pandas_on_import": pandas_on_import,
+    }
+
+
+def _summary(runs: list) -> dict:
+    summary = {}
+    for key in ("import_s", "startup_s", "first_dashboard_s"):
+        values = [run[key] for run in runs]
+        summary[key] = {"median": round(statistics.median(values), 6), "min": round(min(values), 6)}
+    summary["pandas_on_import"] = any(run["pandas_on_import"] for run in runs)
+    summary["dashboard_status"] = sorted({run["dashboard_status"] for run in runs})
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark cold start của API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--candidates", type=int, default=10_000)
+    parser.add_argument("--data-dir", default=".benchmarks")
+    parser.add_argument("--output", default="startup.json")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_once(args.year)))
+        return
+
+    from benchmarks.datagen import generate
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    path = os.path.join(args.data_dir, f"bench_{args.candidates}_42.db")
+    database_url = f"sqlite:///{os.path.abspath(path)}"
+    if not os.path.exists(path):
+        generate(database_url, args.candidates)
+
+    profiles = {}
+    for name, profile_env in STARTUP_PROFILES.items():
+        env = dict(os.environ, DATABASE_URL=database_url, **profile_env)
+        runs = []
+        for _ in range(args.runs):
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup", "--worker", "--year", str(args.year)],
+                env=env, stdout=subprocess.PIPE, text=True, check=True,
+            )
+            runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        profiles[name] = {"env": profile_env, "summary": _summary(runs), "runs": runs}
+        summary = profiles[name]["summary"]
+        print(
+            f"{name:<20} import {summary['import_s']['median'] * 1000:8.1f} ms  "
+            f"startup {summary['startup_s']['median'] * 1000:8.1f} ms  "
+            f"first dashboard {summary['first_dashboard_s']['median'] * 1000:8.1f} ms  "
+            f"pandas on import: {summary['pandas_on_import']}",
+            file=sys.stderr,
+        )
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "candidates": args.candidates,
+        "profiles": profiles,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
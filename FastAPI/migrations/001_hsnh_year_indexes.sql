@@ -0,0 +1,7 @@
+-- Index cho các truy vấn lọc theo năm tuyển sinh trên HO_SO_NHAP_HOC
+-- - IX_HSNH_NAM_NGANH: thống kê nhập học theo ngành của một năm (get_admission_by_major)
+-- - IX_HSNH_NAM_CCCD: lọc view VW_PHAN_TICH_TUYENSINH theo năm (EXISTS theo CCCD)
+-- Chạy một lần trên database đã tồn tại; database mới được tạo index qua models.py
+
+CREATE INDEX IX_HSNH_NAM_NGANH ON HO_SO_NHAP_HOC (NamTuyenSinh, MaNganh);
+CREATE INDEX IX_HSNH_NAM_CCCD ON HO_SO_NHAP_HOC (NamTuyenSinh, CCCD);
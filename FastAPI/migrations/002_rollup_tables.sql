@@ -0,0 +1,40 @@
+-- Bảng tổng hợp (rollup) theo năm tuyển sinh, cập nhật incremental theo watermark
+-- Xem app/repository/rollup_repo.py và POST /analytics/rollups/refresh
+
+CREATE TABLE IF NOT EXISTS TK_NGANH_NAM (
+    NamTuyenSinh INT NOT NULL,
+    MaNganh VARCHAR(50) NOT NULL,
+    SoLuongNhapHoc INT DEFAULT 0,
+    PRIMARY KEY (NamTuyenSinh, MaNganh),
+    FOREIGN KEY (MaNganh) REFERENCES NGANH (MaNganh)
+);
+
+CREATE TABLE IF NOT EXISTS TK_TINH_NAM (
+    NamTuyenSinh INT NOT NULL,
+    QueQuan VARCHAR(255) NOT NULL,
+    SoLuong INT DEFAULT 0,
+    PRIMARY KEY (NamTuyenSinh, QueQuan)
+);
+
+CREATE TABLE IF NOT EXISTS TK_PHUONG_THUC_NAM (
+    NamTuyenSinh INT NOT NULL,
+    PhuongThuc VARCHAR(50) NOT NULL,
+    SoLuong INT DEFAULT 0,
+    TongDiem DOUBLE DEFAULT 0,
+    PRIMARY KEY (NamTuyenSinh, PhuongThuc)
+);
+
+CREATE TABLE IF NOT EXISTS TK_BIN_DIEM_NAM (
+    NamTuyenSinh INT NOT NULL,
+    Bin INT NOT NULL,
+    SoLuong INT DEFAULT 0,
+    PRIMARY KEY (NamTuyenSinh, Bin)
+);
+
+CREATE TABLE IF NOT EXISTS TK_WATERMARK (
+    NamTuyenSinh INT NOT NULL PRIMARY KEY,
+    NgayChot DATE,
+    SoDong INT,
+    PhienBan INT,
+    CapNhatLuc DATETIME
+);
@@ -0,0 +1,12 @@
+-- Quantile sketch (t-digest) điểm theo (năm, ngành, phương thức), gắn với version dữ liệu của năm
+-- Xem app/repository/sketch_repo.py và POST /analytics/sketches/refresh
+
+CREATE TABLE IF NOT EXISTS TK_PHAN_VI_NAM (
+    NamTuyenSinh INT NOT NULL,
+    TenNganh VARCHAR(255) NOT NULL,
+    PhuongThuc VARCHAR(50) NOT NULL,
+    SoLuong INT DEFAULT 0,
+    Digest BLOB,
+    PhienBan VARCHAR(100),
+    PRIMARY KEY (NamTuyenSinh, TenNganh, PhuongThuc)
+);
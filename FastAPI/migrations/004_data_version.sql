@@ -0,0 +1,10 @@
+-- Version dữ liệu theo năm tuyển sinh, dùng chung giữa mọi worker (cache, ETag, rollup)
+-- API nạp dữ liệu tăng PhienBan trong cùng transaction với mỗi batch (xem app/repository/version_repo.py)
+-- Script ghi thẳng vào DB cần tự tăng version của các năm bị ảnh hưởng, ví dụ:
+--   UPDATE TK_PHIEN_BAN SET PhienBan = PhienBan + 1, CapNhatLuc = NOW() WHERE NamTuyenSinh = 2024;
+
+CREATE TABLE IF NOT EXISTS TK_PHIEN_BAN (
+    NamTuyenSinh INT NOT NULL PRIMARY KEY,
+    PhienBan INT DEFAULT 0,
+    CapNhatLuc DATETIME
+);
@@ -0,0 +1,36 @@
+"""
+Fixture dùng chung: database SQLite tạm sinh bằng benchmarks.datagen (VW_PHAN_TICH_TUYENSINH được
+điền như một bảng). DATABASE_URL phải được đặt trước khi import app.core.database.
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="admission-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["ANALYTICS_SNAPSHOT_DIR"] = ""
+os.environ["ANALYTICS_PRELOAD"] = "0"
+
+import pytest
+
+TEST_CANDIDATES = 1500
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Engine của database test đã có dữ liệu (sinh một lần cho cả phiên)"""
+    from app.core.database import SQLALCHEMY_DATABASE_URL, engine
+    from benchmarks.datagen import generate
+
+    generate(SQLALCHEMY_DATABASE_URL, candidates=TEST_CANDIDATES, seed=7)
+    return engine
+
+
+@pytest.fixture
+def db(database):
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.models import HoSoNhapHoc, NhomXetTuyen
+
+
+def _client():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def _get(client, path: str, **params) -> dict:
+    response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize("year", [2022, 2023, 2024])
+def test_sql_mode_matches_pandas(database, year):
+    """mode=sql (GROUP BY trên DB) trả cùng summary, phổ điểm và chart môn THPT với mode=pandas"""
+    client = _client()
+    sections = ["score_distribution", "thpt_subject_analysis"]
+    for path, params in (
+        ("/analytics/summary", {"year": year}),
+        ("/analytics/charts", {"year": year, "sections": sections}),
+    ):
+        assert _get(client, path, **params, mode="sql") == _get(client, path, **params, mode="pandas")
+
+
+def test_sql_mode_matches_pandas_filtered(db):
+    """Lọc theo năm + ngành + phương thức: cùng điều kiện WHERE với khung dữ liệu pandas"""
+    ma_nganh, ma_pt = (
+        db.query(HoSoNhapHoc.MaNganh, NhomXetTuyen.MaPT)
+        .join(NhomXetTuyen, HoSoNhapHoc.MaNhom == NhomXetTuyen.MaNhom)
+        .filter(HoSoNhapHoc.NamTuyenSinh == 2023)
+        .order_by(HoSoNhapHoc.MaNganh, NhomXetTuyen.MaPT)
+        .first()
+    )
+    client = _client()
+    params = {"year": 2023, "major": ma_nganh, "method": ma_pt}
+    pandas_summary = _get(client, "/analytics/summary", **params, mode="pandas")
+    assert pandas_summary == _get(client, "/analytics/summary", **params, mode="sql")
+    assert 0 < pandas_summary["total_students"] < _get(client, "/analytics/summary", year=2023)["total_students"]
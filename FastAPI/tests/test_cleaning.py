@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.repository.analytics_repo import SCORE_COLUMNS, clean_admission_data, clean_admission_data_fast
+
+
+def _frame(n: int = 400, seed: int = 0) -> pd.DataFrame:
+    """Frame giống view: điểm có NULL, 0, giá trị âm, chuỗi không phải số, kèm cột category"""
+    rng = np.random.default_rng(seed)
+    data = {
+        "CCCD": [f"{i:012d}" for i in range(n)],
+        "TenNganh": pd.Categorical(rng.choice(["CNTT", "Kinh tế", None], n)),
+        "QueQuan": pd.Categorical(rng.choice(["Hà Nội", "Nam Định"], n)),
+    }
+    for col in SCORE_COLUMNS:
+        values = np.round(rng.uniform(1, 30, n), 2)
+        values[rng.random(n) < 0.2] = np.nan
+        values[rng.random(n) < 0.2] = 0
+        values[rng.random(n) < 0.02] = -1
+        data[col] = values
+    df = pd.DataFrame(data)
+    # Cột toàn NULL / 0: không có giá trị > 0 để tính trung bình
+    df["SAT"] = np.where(rng.random(n) < 0.5, np.nan, 0.0)
+    df["DXT_SAT"] = np.nan
+    # Cột kiểu chuỗi (đọc từ nguồn không có kiểu): giá trị không phải số thành NaN
+    df["IELTS"] = df["IELTS"].astype(object)
+    df.loc[::7, "IELTS"] = "abc"
+    return df
+
+
+def _assert_same(expected: pd.DataFrame, actual: pd.DataFrame):
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual.attrs["cleaning_stats"] == expected.attrs["cleaning_stats"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fast_matches_reference(seed):
+    df = _frame(seed=seed)
+    _assert_same(clean_admission_data(df), clean_admission_data_fast(df))
+
+
+def test_nan_and_zero_replaced_by_positive_mean():
+    df = pd.DataFrame({"DiemXetTuyen": [np.nan, 0.0, 20.0, 30.0], "TSA": [0.0, np.nan, 0.0, np.nan]})
+    out = clean_admission_data_fast(df)
+    assert out["DiemXetTuyen"].tolist() == [25.0, 25.0, 20.0, 30.0]
+    # Không có giá trị > 0: NULL thành 0, 0 giữ nguyên
+    assert out["TSA"].tolist() == [0.0, 0.0, 0.0, 0.0]
+    assert out.attrs["cleaning_stats"]["DiemXetTuyen"] == {
+        "null_count": 1, "zero_count": 1, "total_replaced": 2, "mean_value": 25.0, "valid_data_count": 2,
+    }
+    _assert_same(clean_admission_data(df), out)
+
+
+def test_categorical_columns_untouched():
+    df = _frame()
+    out = clean_admission_data_fast(df)
+    for col in ("TenNganh", "QueQuan"):
+        assert isinstance(out[col].dtype, pd.CategoricalDtype)
+        pd.testing.assert_series_equal(out[col], df[col])
+
+
+def test_not_inplace_leaves_input_unchanged():
+    df = _frame()
+    before = df.copy(deep=True)
+    clean_admission_data_fast(df, inplace=False)
+    pd.testing.assert_frame_equal(df, before)
+    assert "cleaning_stats" not in df.attrs
+
+
+def test_inplace_overwrites_input():
+    df = _frame()
+    expected = clean_admission_data(df)
+    out = clean_admission_data_fast(df, inplace=True)
+    assert out is df
+    _assert_same(expected, df)
+
+
+def test_empty_frame():
+    df = _frame().iloc[0:0]
+    expected, actual = clean_admission_data(df), clean_admission_data_fast(df)
+    # Cột object rỗng: to_numeric của bản gốc cho int64, bản nhanh luôn cho float64
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    assert actual.attrs["cleaning_stats"] == expected.attrs["cleaning_stats"] == {}
+
+
+def test_matches_reference_on_view(db):
+    from app.repository.analytics_repo import _build_view_query
+
+    # Frame thô từ view (chưa làm sạch, còn NULL / 0): get_view_admission_data đã làm sạch sẵn
+    raw = pd.read_sql(_build_view_query(db, 2024).statement, db.bind)
+    assert len(raw) > 0
+    expected = clean_admission_data(raw)
+    assert expected.attrs["cleaning_stats"]
+    assert any(stats["total_replaced"] > 0 for stats in expected.attrs["cleaning_stats"].values())
+    _assert_same(expected, clean_admission_data_fast(raw))
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+from app.core.concurrency import run_queries
+from app.repository import analytics_repo
+
+
+def _dashboard_tasks(year: int) -> dict:
+    return {
+        "view": lambda session: analytics_repo.get_view_admission_data(session, year),
+        "major": lambda session: analytics_repo.get_admission_by_major(session, year, use_rollup=False),
+        "province": lambda session: analytics_repo.get_demographics_by_province(session, year, use_rollup=False),
+    }
+
+
+def test_parallel_matches_sequential(db):
+    sequential = run_queries(db, _dashboard_tasks(2023), concurrent=False)
+    parallel = run_queries(db, _dashboard_tasks(2023), concurrent=True)
+    assert sequential.keys() == parallel.keys()
+    for name in sequential:
+        pd.testing.assert_frame_equal(sequential[name], parallel[name])
+    assert len(parallel["view"]) > 0
+
+
+def test_parallel_tasks_use_own_sessions(db):
+    seen = run_queries(db, {i: (lambda session: session) for i in range(3)}, concurrent=True)
+    assert all(session is not db for session in seen.values())
+    assert len({id(session) for session in seen.values()}) == 3
+
+
+def test_sequential_fallback_uses_request_session(db):
+    seen = run_queries(db, {"a": lambda session: session, "b": lambda session: session}, concurrent=False)
+    assert seen == {"a": db, "b": db}
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_task_error_is_raised(db, concurrent):
+    def fail(session):
+        raise ValueError("lỗi truy vấn")
+
+    with pytest.raises(ValueError, match="lỗi truy vấn"):
+        run_queries(db, {"ok": lambda session: 1, "fail": fail}, concurrent=concurrent)
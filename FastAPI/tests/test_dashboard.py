@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+from app.schemas import DashboardAnalyticsResponse, DashboardSectionsResponse
+
+
+def _client():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def test_sectioned_dashboard_matches_declared_model(database):
+    client = _client()
+    response = client.get("/analytics/dashboard", params={"year": 2023, "sections": "top_majors,score_distribution"})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert set(body) == {"year", "charts", "top_majors"}
+    assert set(body["charts"]) == {"score_distribution"}
+    DashboardSectionsResponse.model_validate(body)
+
+
+def test_full_dashboard_still_complete(database):
+    body = _client().get("/analytics/dashboard", params={"year": 2023}).json()
+    DashboardAnalyticsResponse.model_validate(body)
+
+
+def test_openapi_declares_sections_model(database):
+    schema = _client().get("/openapi.json").json()
+    response_schema = schema["paths"]["/analytics/dashboard"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert response_schema["$ref"].endswith("/DashboardSectionsResponse")
+    required = schema["components"]["schemas"]["DashboardSectionsResponse"].get("required", [])
+    assert required == ["year"]
@@ -0,0 +1,59 @@
+import io
+from fastapi.testclient import TestClient
+from app.models import HoSoNhapHoc, ThiSinh
+from app.repository import admission, analytics_repo
+from app.repository.version_repo import bump_data_versions
+
+
+def _candidate(db, year: int) -> ThiSinh:
+    cccd = db.query(HoSoNhapHoc.CCCD).filter(HoSoNhapHoc.NamTuyenSinh == year).order_by(HoSoNhapHoc.CCCD).first()[0]
+    return db.get(ThiSinh, cccd)
+
+
+def test_version_only_from_database(db):
+    # Không còn phần nào riêng của tiến trình: xoá cache không đổi version
+    before = analytics_repo.get_data_version(db, 2023)
+    analytics_repo.clear_view_cache()
+    assert analytics_repo.get_data_version(db, 2023) == before
+
+
+def test_bump_changes_only_that_year(db):
+    before = {year: analytics_repo.get_data_version(db, year) for year in (2022, 2023, None)}
+    bump_data_versions(db, [2022])
+    db.commit()
+    assert analytics_repo.get_data_version(db, 2022) != before[2022]
+    assert analytics_repo.get_data_version(db, 2023) == before[2023]
+    assert analytics_repo.get_data_version(db, None) != before[None]
+
+
+def test_ingest_thisinh_invalidates_other_workers(db):
+    """Worker khác (không gọi clear_view_cache) vẫn thấy dữ liệu mới nhờ version trong DB"""
+    candidate = _candidate(db, 2024)
+    df = analytics_repo.get_cached_view_admission_data(db, 2024, columns=["CCCD", "QueQuan"])
+    assert "Tỉnh Kiểm Thử" not in set(df["QueQuan"])
+
+    csv = f"CCCD,QueQuan\n{candidate.CCCD},Tỉnh Kiểm Thử\n".encode("utf-8")
+    result = admission.bulk_ingest(db, "thisinh", io.BytesIO(csv), "csv")
+    assert result["rows_written"] == 1
+
+    df = analytics_repo.get_cached_view_admission_data(db, 2024, columns=["CCCD", "QueQuan"])
+    assert df.loc[df["CCCD"] == candidate.CCCD, "QueQuan"].tolist() == ["Tỉnh Kiểm Thử"]
+
+
+def test_etag_changes_after_ingest(db):
+    from app.main import app
+
+    client = TestClient(app)
+    first = client.get("/analytics/summary", params={"year": 2022})
+    assert client.get(
+        "/analytics/summary", params={"year": 2022}, headers={"If-None-Match": first.headers["etag"]}
+    ).status_code == 304
+
+    candidate = _candidate(db, 2022)
+    csv = f"CCCD,MaKyThi,MaMon,Diem\n{candidate.CCCD},KT_TEST,TOAN,9.5\n".encode("utf-8")
+    response = client.post("/admissions/ingest/diem_thi", content=csv, params={"fmt": "csv"})
+    assert response.status_code == 200, response.text
+
+    second = client.get("/analytics/summary", params={"year": 2022}, headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
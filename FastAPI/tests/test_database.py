@@ -0,0 +1,72 @@
+import importlib.util
+from sqlalchemy import text
+
+
+def _load_database(monkeypatch, **env):
+    """Nạp lại app.core.database với biến môi trường mới (bản riêng, không đụng engine của app)"""
+    for name in ("DATABASE_REPLICA_URL", "DB_READ_TIMEOUT"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    spec = importlib.util.find_spec("app.core.database")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _session_bind(module):
+    dependency = module.get_read_db()
+    session = next(dependency)
+    try:
+        session.execute(text("SELECT 1"))
+        return session.get_bind()
+    finally:
+        dependency.close()
+
+
+def test_pool_settings_from_env_and_primary_fallback(monkeypatch, tmp_path):
+    database = _load_database(
+        monkeypatch,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'primary.db'}",
+        DB_POOL_SIZE="3",
+        DB_MAX_OVERFLOW="2",
+        DB_POOL_TIMEOUT="1.5",
+        DB_POOL_RECYCLE="60",
+        DB_POOL_PRE_PING="0",
+        DB_CONNECT_TIMEOUT="7",
+    )
+    try:
+        pool = database.engine.pool
+        assert (pool.size(), pool._max_overflow, pool._timeout, pool._recycle, pool._pre_ping) == (3, 2, 1.5, 60, False)
+        assert database._connect_args("sqlite") == {"timeout": 7}
+        assert database._connect_args("mysql") == {"connect_timeout": 7}
+
+        # Không đặt DATABASE_REPLICA_URL: route chỉ đọc dùng chung engine chính
+        assert database.read_engine is database.engine
+        assert _session_bind(database) is database.engine
+        stats = database.get_pool_stats()
+        assert list(stats) == ["primary"]
+        assert stats["primary"] == {"pool": "QueuePool", "size": 3, "checked_out": 0, "checked_in": 1, "overflow": -2}
+    finally:
+        database.engine.dispose()
+
+
+def test_replica_engine_and_memory_sqlite(monkeypatch, tmp_path):
+    database = _load_database(
+        monkeypatch,
+        DATABASE_URL="sqlite://",
+        DATABASE_REPLICA_URL=f"sqlite:///{tmp_path / 'replica.db'}",
+        DB_POOL_SIZE="4",
+        DB_READ_TIMEOUT="30",
+    )
+    try:
+        assert database.read_engine is not database.engine
+        assert _session_bind(database) is database.read_engine
+        assert database._connect_args("mysql") == {"connect_timeout": 10, "read_timeout": 30, "write_timeout": 30}
+        stats = database.get_pool_stats()
+        # SQLite in-memory giữ pool riêng (không nhận tham số kích thước pool)
+        assert stats["primary"]["pool"] != "QueuePool" and stats["primary"]["size"] is None
+        assert stats["replica"]["pool"] == "QueuePool" and stats["replica"]["size"] == 4
+    finally:
+        database.engine.dispose()
+        database.read_engine.dispose()
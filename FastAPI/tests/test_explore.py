@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services import explore
+
+
+def _index() -> explore.BitmapIndex:
+    df = pd.DataFrame({
+        "CCCD": [f"{i:03d}" for i in range(21)],
+        "TenNganh": ["A", "B", "C"] * 7,
+        "GioiTinh": ["Nam", "Nữ", "Nam"] * 7,
+    })
+    methods = pd.DataFrame({"CCCD": ["000", "003", "004", "020"], "MaPT": ["HSA", "HSA", "THPT", "THPT"]})
+    return explore.build_bitmap_index(df, methods)
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_facets_popcount(monkeypatch, native):
+    if not native:
+        # numpy < 2.0: không có np.bitwise_count
+        monkeypatch.delattr(np, "bitwise_count", raising=False)
+    index = _index()
+    selection = index.select({"major": ["A", "B"]})
+    assert index.facets(selection) == {
+        "major": {"A": 7, "B": 7, "C": 0},
+        "gender": {"Nam": 7, "Nữ": 7},
+        "method": {"HSA": 2, "THPT": 1},
+    }
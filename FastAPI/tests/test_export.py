@@ -0,0 +1,77 @@
+import gzip
+import io
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.repository import analytics_repo, export_repo
+
+
+def _decompress(data: bytes, compression) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        import zstandard
+
+        # Luồng nén không ghi kích thước nội dung trong header: giải nén kiểu stream
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def _read(data: bytes, fmt: str) -> pd.DataFrame:
+    if fmt == "csv":
+        return pd.read_csv(io.BytesIO(data), dtype={"CCCD": str})
+    if fmt == "ndjson":
+        return pd.read_json(io.BytesIO(data), lines=True, dtype={"CCCD": str})
+    return pd.read_parquet(io.BytesIO(data))
+
+
+def _normalize(df: pd.DataFrame, kinds: dict) -> pd.DataFrame:
+    """Ngày => chuỗi ISO, số => float64 (CSV / JSON không giữ kiểu date và int/float)"""
+    df = df.copy()
+    for name, kind in kinds.items():
+        if kind == "date":
+            df[name] = pd.to_datetime(df[name]).dt.strftime("%Y-%m-%d")
+        elif kind in ("float", "integer"):
+            df[name] = df[name].astype("float64")
+        else:
+            df[name] = df[name].astype(object)
+    return df
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+@pytest.mark.parametrize("fmt", ["csv", "ndjson", "parquet"])
+def test_export_round_trip_matches_cleaned_view(db, monkeypatch, fmt, compression):
+    """Đọc lại file export (nhiều chunk) = view đã làm sạch trên toàn bộ dữ liệu của năm"""
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    from app.main import app
+
+    # Chunk nhỏ: nhiều chunk CSV / nhiều row group Parquet, giá trị điền phải tính trên cả năm
+    monkeypatch.setattr(analytics_repo, "STREAM_CHUNKSIZE", 128)
+    params = {"year": 2023, "format": fmt, **({"compression": compression} if compression else {})}
+    response = TestClient(app).get("/analytics/export", params=params)
+    assert response.status_code == 200, response.text
+
+    kinds = export_repo.get_export_column_kinds(export_repo.EXPORT_COLUMNS)
+    if fmt == "parquet":
+        # Parquet nén bên trong file theo codec được chọn, luồng bytes không nén thêm
+        import pyarrow.parquet as pq
+
+        metadata = pq.ParquetFile(io.BytesIO(response.content)).metadata
+        assert metadata.num_row_groups > 1
+        assert metadata.row_group(0).column(0).compression == (compression or "snappy").upper()
+        exported = _read(response.content, fmt)
+    else:
+        exported = _read(_decompress(response.content, compression), fmt)
+    expected = analytics_repo.get_view_admission_data(db, 2023, columns=export_repo.EXPORT_COLUMNS)
+    assert len(expected) > 128
+    pd.testing.assert_frame_equal(_normalize(exported, kinds), _normalize(expected, kinds))
+
+
+def test_export_rejects_unknown_column(database):
+    from app.main import app
+
+    response = TestClient(app).get("/analytics/export", params={"year": 2023, "columns": "CCCD,KhongCo"})
+    assert response.status_code == 400
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services import analytics
+from app.services.histogram import bin_edges, compute_histograms
+
+
+@pytest.mark.parametrize(
+    "max_score, bin_width, min_upper, expected_upper",
+    [
+        (27.9, 0.5, 20, 28.0),
+        (7.9, 0.25, 0, 8.0),
+        (0.3, 0.1, 0, 0.4),
+        (24.9, 5, 20, 25),
+        (25.0, 5, 20, 30),
+        (12.0, 5, 20, 20),
+    ],
+)
+def test_upper_covers_float_max(max_score, bin_width, min_upper, expected_upper):
+    edges = bin_edges(max_score, bin_width, min_upper=min_upper)
+    assert edges[-1] == pytest.approx(expected_upper)
+    assert edges[-1] >= max_score
+
+
+def test_fractional_width_keeps_top_scores():
+    df = pd.DataFrame({"DiemXetTuyen": [21.0, 24.5, 27.83, 27.9], "IELTS": [6.5, 7.0, 7.5, 7.9]})
+    histograms = compute_histograms(df, ["DiemXetTuyen"], 0.5, min_upper=20)
+    histograms.update(compute_histograms(df, ["IELTS"], 0.25))
+    assert histograms["DiemXetTuyen"]["total"].sum() == 4
+    assert histograms["DiemXetTuyen"]["total"][-1] == 2
+    assert histograms["IELTS"]["total"].sum() == 4
+    assert histograms["IELTS"]["intervals"][-1].right == pytest.approx(8.0)
+
+
+@pytest.mark.parametrize("bin_width", [0.1, 0.25, 0.3, 0.5, 0.75, 1.5, 2.5])
+def test_fractional_widths_match_pd_cut(bin_width):
+    rng = np.random.default_rng(int(bin_width * 100))
+    scores = np.round(rng.uniform(0.01, 29.99, 2000), 2)
+    df = pd.DataFrame({"DiemXetTuyen": scores})
+    histogram = compute_histograms(df, ["DiemXetTuyen"], bin_width)["DiemXetTuyen"]
+
+    assert histogram["total"].sum() == len(scores)
+    edges = bin_edges(scores.max(), bin_width)
+    expected = pd.cut(df["DiemXetTuyen"], bins=edges, include_lowest=True).value_counts(sort=False)
+    assert histogram["total"].tolist() == expected.tolist()
+
+
+def test_dashboard_bins_unchanged():
+    # Độ rộng 5 của dashboard: giống quy tắc cũ max(20, (int(max) // 5 + 1) * 5)
+    for max_score in (3.2, 19.99, 20.0, 24.75, 29.5, 30.0):
+        legacy_upper = max(20, (int(max_score) // 5 + 1) * 5)
+        assert analytics.score_distribution_bins(max_score)[-1].right == legacy_upper
+
+
+def _pd_cut_counts(scores: pd.Series, bin_width: float) -> list:
+    edges = bin_edges(scores.max(), bin_width)
+    return pd.cut(scores, bins=edges, include_lowest=True).value_counts(sort=False).tolist()
+
+
+def test_compact_frame_keeps_edge_values(db):
+    """Frame compact giữ điểm float64: giá trị trên biên bin lẻ (27.3 với độ rộng 0.1) vào đúng bin như pd.cut"""
+    from app.repository import analytics_repo
+
+    raw = analytics_repo.get_view_admission_data(db, 2023, columns=analytics_repo.HISTOGRAM_COLUMNS)
+    compact = analytics_repo.get_view_admission_data(db, 2023, columns=analytics_repo.HISTOGRAM_COLUMNS, compact=True)
+    assert compact["DiemXetTuyen"].dtype == "float64"
+    expected = _pd_cut_counts(raw["DiemXetTuyen"], 0.1)
+    assert compute_histograms(compact, ["DiemXetTuyen"], 0.1)["DiemXetTuyen"]["total"].tolist() == expected
+
+
+@pytest.mark.parametrize("compact_dtypes", [True, False])
+def test_histogram_endpoint_matches_float64_pd_cut(db, monkeypatch, compact_dtypes):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.repository import analytics_repo
+
+    monkeypatch.setattr(analytics_repo, "COMPACT_DTYPES", compact_dtypes)
+    analytics_repo.clear_view_cache()
+    response = TestClient(app).get("/analytics/histogram", params={"year": 2023, "bin_width": 0.1})
+    assert response.status_code == 200, response.text
+    chart = response.json()["histograms"]["DiemXetTuyen"]
+
+    raw = analytics_repo.get_view_admission_data(db, 2023, columns=analytics_repo.HISTOGRAM_COLUMNS)
+    assert chart["datasets"][0]["data"] == _pd_cut_counts(raw["DiemXetTuyen"], 0.1)
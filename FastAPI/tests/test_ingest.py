@@ -0,0 +1,74 @@
+import datetime
+import io
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.models import HoSoNhapHoc, ThiSinh
+from app.repository import admission, analytics_repo
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def test_dates_are_day_first():
+    batch = pd.DataFrame({
+        "CCCD": ["900000000001", "900000000002", "900000000003", "900000000004"],
+        "NgaySinh": ["03/04/2005", "2005-04-03", "03-04-2005", "04/13/2005"],
+    })
+    errors = []
+    valid = admission._validate_batch(ThiSinh, batch, 0, errors)
+    assert valid["NgaySinh"].tolist() == [datetime.date(2005, 4, 3)] * 3
+    # Tháng 13 (kiểu tháng trước ngày) bị từ chối thay vì đọc sai
+    assert [error["row"] for error in errors] == [4]
+    assert "NgaySinh" in errors[0]["error"]
+
+
+def test_unparseable_dates_rejected():
+    batch = pd.DataFrame({"CCCD": ["900000000005", "900000000006"], "NgaySinh": ["3 tháng 4", "2005/04/03"]})
+    errors = []
+    assert admission._validate_batch(ThiSinh, batch, 0, errors).empty
+    assert len(errors) == 2
+
+
+def test_failed_batch_keeps_committed_rows_visible(db, client, monkeypatch):
+    """Batch sau lỗi: batch trước đã commit cùng version mới và cache của tiến trình vẫn được xoá"""
+    cccds = [cccd for (cccd,) in db.query(HoSoNhapHoc.CCCD).filter(HoSoNhapHoc.NamTuyenSinh == 2023).distinct().limit(2)]
+    version = analytics_repo.get_data_version(db, 2023)
+
+    upsert = admission._upsert_statement
+    calls = []
+
+    def failing_upsert(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("mất kết nối")
+        return upsert(*args, **kwargs)
+
+    cleared = []
+    clear = analytics_repo.clear_view_cache
+    monkeypatch.setattr(admission, "_upsert_statement", failing_upsert)
+    monkeypatch.setattr(analytics_repo, "clear_view_cache", lambda: (cleared.append(1), clear()))
+
+    csv = "CCCD,NoiSinh\n" + "".join(f"{cccd},Nơi sinh mới\n" for cccd in cccds)
+    response = client.post("/admissions/ingest/thisinh", content=csv.encode("utf-8"), params={"batch_size": 1})
+    assert response.status_code == 500
+    assert cleared == [1]
+
+    db.expire_all()
+    assert db.get(ThiSinh, cccds[0]).NoiSinh == "Nơi sinh mới"
+    assert db.get(ThiSinh, cccds[1]).NoiSinh != "Nơi sinh mới"
+    assert analytics_repo.get_data_version(db, 2023) != version
+
+
+def test_large_upload_spooled_to_disk(client, monkeypatch):
+    from app.routers import admission as admission_router
+
+    monkeypatch.setattr(admission_router, "INGEST_SPOOL_BYTES", 64)
+    rows = "".join(f"91{i:010d},Thí sinh {i}\n" for i in range(200))
+    response = client.post("/admissions/ingest/thisinh", content=("CCCD,HoTen\n" + rows).encode("utf-8"))
+    assert response.status_code == 200, response.text
+    assert response.json()["rows_written"] == 200
@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.repository import analytics_repo, listing_repo
+
+
+def _client():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def _walk(client, **params) -> list:
+    """Đọc mọi trang theo next_cursor"""
+    items, cursor, pages = [], None, 0
+    while True:
+        response = client.get("/analytics/students", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.parametrize(
+    "sort, order",
+    [("DiemXetTuyen", "desc"), ("DiemXetTuyen", "asc"), ("DXT_HSA", "asc")],
+)
+def test_walk_all_pages_matches_full_sort(db, sort, order):
+    """Ghép mọi trang = sắp xếp cả frame đã làm sạch theo (điểm, CCCD): không trùng, không sót"""
+    items, pages = _walk(_client(), year=2023, sort=sort, order=order, limit=137)
+
+    df = analytics_repo.get_view_admission_data(db, 2023, columns=listing_repo.LISTING_COLUMNS)
+    df["sort_key"] = df[sort].round(listing_repo.LISTING_SORT_PRECISION)
+    expected = df.sort_values(["sort_key", "CCCD"], ascending=order == "asc")
+
+    assert pages == -(-len(expected) // 137)
+    assert [item["CCCD"] for item in items] == expected["CCCD"].tolist()
+    assert [item[sort] for item in items] == pytest.approx(expected[sort].tolist())
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"cursor": "khong-phai-cursor"},
+        {"cursor": "WyJ4IiwieSJd"},  # ["x","y"]: điểm không phải số
+        {"cursor": "WzFd"},  # [1]: thiếu CCCD
+        {"sort": "HoTen"},
+        {"sort": "DXT_KHONG_CO"},
+    ],
+)
+def test_bad_cursor_or_sort_is_400(database, params):
+    response = _client().get("/analytics/students", params={"year": 2023, **params})
+    assert response.status_code == 400, response.text
@@ -0,0 +1,38 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.core import metrics
+
+
+def test_parallel_spans_report_wall_clock():
+    """Span "sql" chạy song song không được cộng dồn vượt quá thời gian request"""
+    timings = metrics.RequestTimings()
+    token = metrics._current.set(timings)
+    started = time.perf_counter()
+    try:
+        def query():
+            with metrics.span("sql"):
+                time.sleep(0.05)
+
+        # Giống run_queries: mỗi task chạy trong bản sao context của request
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, query) for _ in range(4)]
+            for future in futures:
+                future.result()
+    finally:
+        metrics._current.reset(token)
+    total = time.perf_counter() - started
+
+    assert 0.05 <= timings.stages["sql"] <= total
+
+
+def test_sequential_spans_accumulate():
+    timings = metrics.RequestTimings()
+    token = metrics._current.set(timings)
+    try:
+        for _ in range(2):
+            with metrics.span("compute"):
+                time.sleep(0.01)
+    finally:
+        metrics._current.reset(token)
+    assert timings.stages["compute"] >= 0.02
@@ -0,0 +1,52 @@
+import glob
+import os
+import re
+from sqlalchemy import create_engine, inspect, text
+from app.core.database import Base
+from app.migrate import migrate
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+
+def _statements(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        sql = "\n".join(line for line in f.read().splitlines() if not line.lstrip().startswith("--"))
+    return [statement.strip() for statement in sql.split(";") if statement.strip()]
+
+
+def test_sql_migrations_match_models(tmp_path):
+    """migrations/*.sql (chạy trên các bảng gốc) tạo đúng bảng / cột / index như app.migrate từ models.py"""
+    files = sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql")))
+    statements = [statement for path in files for statement in _statements(path)]
+    assert all(re.match(r"CREATE (TABLE|INDEX)", statement, re.I) for statement in statements)
+    migrated_tables = {
+        match.group(1) for statement in statements
+        for match in [re.match(r"CREATE TABLE IF NOT EXISTS (\w+)", statement)] if match
+    }
+
+    from_sql = create_engine(f"sqlite:///{tmp_path / 'sql.db'}")
+    Base.metadata.create_all(
+        bind=from_sql, tables=[table for table in Base.metadata.sorted_tables if table.name not in migrated_tables]
+    )
+    with from_sql.begin() as connection:
+        for statement in statements:
+            if statement.upper().startswith("CREATE INDEX"):
+                # Bảng gốc đã có index khai báo trong models.py
+                name = statement.split()[2]
+                if name in {index["name"] for table in inspect(connection).get_table_names()
+                            for index in inspect(connection).get_indexes(table)}:
+                    continue
+            connection.execute(text(statement))
+
+    from_models = create_engine(f"sqlite:///{tmp_path / 'models.db'}")
+    migrate(from_models)
+
+    sql_inspector, model_inspector = inspect(from_sql), inspect(from_models)
+    for table in migrated_tables:
+        assert {column["name"] for column in sql_inspector.get_columns(table)} == {
+            column["name"] for column in model_inspector.get_columns(table)
+        }, table
+    # Tổng điểm rollup là DOUBLE ở cả hai nơi (FLOAT của MySQL là single-precision)
+    for inspector in (sql_inspector, model_inspector):
+        columns = {column["name"]: column["type"] for column in inspector.get_columns("TK_PHUONG_THUC_NAM")}
+        assert str(columns["TongDiem"]).startswith("DOUBLE")
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+from app.routers import analytics
+from app.services import sketch
+
+
+def test_merged_sketches_cached_per_year_set(db, monkeypatch):
+    from app.main import app
+
+    calls = []
+    merge = sketch.merge_sketches
+    monkeypatch.setattr(sketch, "merge_sketches", lambda sets: calls.append(1) or merge(sets))
+
+    client = TestClient(app)
+    params = {"year": [2022, 2023], "q": [0.5]}
+    first = client.get("/analytics/percentiles", params=params)
+    second = client.get("/analytics/percentiles", params=params)
+    assert first.status_code == 200, first.text
+    assert first.json() == second.json()
+    assert len(calls) == 1
+
+    # Một năm: dùng thẳng digest của năm, không gộp
+    assert client.get("/analytics/percentiles", params={"year": 2024}).status_code == 200
+    assert len(calls) == 1
+
+
+def test_single_year_uses_year_digest(db):
+    single = analytics._get_merged_quantile_sketches(db, [2024])
+    assert single is analytics._get_quantile_sketches(db, 2024)
@@ -0,0 +1,82 @@
+from app.core.precompute import PrecomputedEntry, PrecomputeScheduler
+
+
+def _scheduler(version: list) -> PrecomputeScheduler:
+    scheduler = PrecomputeScheduler(interval=3600, probe_interval=3600)
+    scheduler.register(
+        "job",
+        probe=lambda: version[0],
+        compute=lambda v: PrecomputedEntry(str(v).encode(), f'"{v}"', v),
+    )
+    return scheduler
+
+
+def test_request_refresh_recomputes_without_version_change():
+    scheduler = _scheduler([1])
+    scheduler.run_once()
+    assert scheduler.get("job").body == b"1"
+
+    scheduler.request_refresh()
+    # Đang chờ tính lại: handler tự tính thay vì nhận entry cũ
+    assert scheduler.get("job") is None
+
+    scheduler.run_once()
+    assert scheduler.get("job").body == b"1"
+    assert scheduler.stats()["jobs"][0]["refreshes"] == 2
+
+
+def test_request_refresh_picks_up_new_version():
+    version = [1]
+    scheduler = _scheduler(version)
+    scheduler.run_once()
+    version[0] = 2
+    scheduler.request_refresh("job")
+    scheduler.run_once()
+    assert scheduler.get("job").version == 2
+
+
+def test_entry_withheld_until_refresh_succeeds():
+    scheduler = PrecomputeScheduler(interval=3600, probe_interval=3600)
+    seen_during_compute = []
+    fail = [False]
+
+    def compute(version):
+        seen_during_compute.append(scheduler.get("job"))
+        if fail[0]:
+            raise RuntimeError("DB lỗi")
+        return PrecomputedEntry(b"ok", '"1"', version)
+
+    scheduler.register("job", probe=lambda: 1, compute=compute)
+    scheduler.run_once()
+
+    scheduler.request_refresh()
+    fail[0] = True
+    scheduler.run_once()
+    # Trong lúc tính và sau khi tính lỗi: entry cũ không được trả
+    assert seen_during_compute[-1] is None
+    assert scheduler.get("job") is None
+
+    fail[0] = False
+    scheduler.run_once()
+    assert scheduler.get("job").body == b"ok"
+
+
+def test_refresh_requested_during_compute_is_kept():
+    scheduler = PrecomputeScheduler(interval=3600, probe_interval=3600)
+    computes = []
+
+    def compute(version):
+        computes.append(version)
+        if len(computes) == 2:
+            # Lần nạp dữ liệu khác xảy ra trong lúc đang tính lại
+            scheduler.request_refresh("job")
+        return PrecomputedEntry(b"ok", '"1"', version)
+
+    scheduler.register("job", probe=lambda: 1, compute=compute)
+    scheduler.run_once()
+    scheduler.request_refresh("job")
+    scheduler.run_once()
+    assert scheduler.get("job") is None
+    scheduler.run_once()
+    assert scheduler.get("job") is not None
+    assert len(computes) == 3
@@ -0,0 +1,74 @@
+import threading
+from app.routers import analytics
+
+# Dạng của analytics_repo.get_data_version: (MAX(NgayXacNhan), COUNT(*), TK_PHIEN_BAN)
+OLD_VERSION = ("2024-08-20", 500, 1)
+NEW_VERSION = ("2024-08-20", 500, 2)
+
+
+def test_single_flight_does_not_share_across_versions():
+    """
+    Request thấy version mới không nhận body của lần tính đang chạy trên version cũ, và lần tính cũ
+    xong sau không ghi đè body mới trong cache
+    """
+    key = ("test-single-flight",)
+    started, release = threading.Event(), threading.Event()
+
+    def build_old():
+        started.set()
+        release.wait(5)
+        return {"version": 1}
+
+    results = {}
+    leader = threading.Thread(target=lambda: results.setdefault("old", analytics._cached_body(key, OLD_VERSION, build_old)))
+    leader.start()
+    assert started.wait(5)
+    try:
+        results["new"] = analytics._cached_body(key, NEW_VERSION, lambda: {"version": 2})
+    finally:
+        release.set()
+        leader.join(5)
+
+    assert results["new"] == b'{"version":2}'
+    assert results["old"] == b'{"version":1}'
+    assert analytics._response_cache.get(key, NEW_VERSION) == b'{"version":2}'
+
+
+def test_followers_receive_serialized_body_once(monkeypatch):
+    """Payload được serialize một lần trong single-flight, các request chờ nhận cùng bytes"""
+    key = ("test-serialize-once",)
+    started, release = threading.Event(), threading.Event()
+    serialized = []
+    dumps = analytics.dumps
+
+    def counting_dumps(payload):
+        serialized.append(payload)
+        return dumps(payload)
+
+    def build():
+        started.set()
+        release.wait(5)
+        return {"ok": True}
+
+    monkeypatch.setattr(analytics, "dumps", counting_dumps)
+    coalesced = analytics._single_flight.stats()["coalesced"]
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(analytics._cached_body(key, NEW_VERSION, build)))
+        for _ in range(4)
+    ]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Chờ ba follower vào hàng đợi của lần tính đang chạy
+    for _ in range(500):
+        if analytics._single_flight.stats()["coalesced"] - coalesced >= 3:
+            break
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [b'{"ok":true}'] * 4
+    assert len(serialized) == 1
@@ -0,0 +1,86 @@
+import io
+import threading
+import time
+from datetime import date
+from app.models import HoSoNhapHoc
+from app.repository import admission, aggregation_repo, rollup_repo
+from app.services import aggregation
+
+# Watermark sau mọi NgayXacNhan của dữ liệu sinh: mọi hồ sơ đều đã được tổng hợp
+FUTURE = date(2100, 1, 1)
+
+
+def _dashboard_parts(stats: dict):
+    return (
+        aggregation.summary_from_stats(stats).model_dump(),
+        aggregation.score_distribution_from_stats(stats).to_dict(),
+        aggregation.thpt_subject_chart_from_stats(stats),
+    )
+
+
+def test_rollup_stats_match_view_scan(db):
+    rollup_repo.refresh_rollups(db, 2023, FUTURE)
+    assert rollup_repo.is_rollup_fresh(db, 2023)
+
+    from_rollup = aggregation_repo.get_aggregated_stats(db, 2023)
+    from_view = aggregation_repo.get_score_column_stats(db, 2023)
+    from_view["score_buckets"] = aggregation_repo.get_score_bucket_counts(db, 2023)
+    from_view["top_province"] = aggregation_repo.get_top_province(db, 2023)
+    assert _dashboard_parts(from_rollup) == _dashboard_parts(from_view)
+
+
+def test_ingest_without_row_count_change_marks_rollup_stale(db):
+    rollup_repo.refresh_rollups(db, 2024, FUTURE)
+    assert rollup_repo.is_rollup_fresh(db, 2024)
+
+    # Đổi quê quán: số hồ sơ không đổi nhưng TK_TINH_NAM đã cũ
+    cccd = db.query(HoSoNhapHoc.CCCD).filter(HoSoNhapHoc.NamTuyenSinh == 2024).order_by(HoSoNhapHoc.CCCD).first()[0]
+    csv = f"CCCD,QueQuan\n{cccd},Tỉnh Rollup\n".encode("utf-8")
+    admission.bulk_ingest(db, "thisinh", io.BytesIO(csv), "csv")
+    assert not rollup_repo.is_rollup_fresh(db, 2024)
+
+    assert rollup_repo.refresh_rollups(db, 2024, FUTURE)["mode"] == "full"
+    assert rollup_repo.is_rollup_fresh(db, 2024)
+
+
+def test_interleaved_refreshes_do_not_double_count(db, monkeypatch):
+    """Hai lần refresh chồng nhau trên cùng watermark: lần sau phải chờ và thấy watermark lần trước đã ghi"""
+    from app.core.database import SessionLocal
+
+    rollup_repo.refresh_rollups(db, 2022, date(2022, 8, 5))
+    aggregate_delta = rollup_repo._aggregate_delta
+    first_in_delta = threading.Event()
+
+    def slow_aggregate_delta(*args, **kwargs):
+        # Lần refresh đầu dừng giữa chừng để lần sau kịp đọc watermark (nếu không có khoá)
+        if not first_in_delta.is_set():
+            first_in_delta.set()
+            time.sleep(0.5)
+        return aggregate_delta(*args, **kwargs)
+
+    monkeypatch.setattr(rollup_repo, "_aggregate_delta", slow_aggregate_delta)
+    results = {}
+
+    def refresh(name):
+        session = SessionLocal()
+        try:
+            results[name] = rollup_repo.refresh_rollups(session, 2022, FUTURE)
+        finally:
+            session.close()
+
+    first = threading.Thread(target=refresh, args=("first",))
+    first.start()
+    assert first_in_delta.wait(10)
+    second = threading.Thread(target=refresh, args=("second",))
+    second.start()
+    first.join()
+    second.join()
+
+    assert results["first"]["delta_rows"] > 0
+    assert results["second"]["delta_rows"] == 0
+    db.expire_all()
+    assert rollup_repo.is_rollup_fresh(db, 2022)
+    from_view = aggregation_repo.get_score_column_stats(db, 2022)
+    from_view["score_buckets"] = aggregation_repo.get_score_bucket_counts(db, 2022)
+    from_view["top_province"] = aggregation_repo.get_top_province(db, 2022)
+    assert _dashboard_parts(aggregation_repo.get_aggregated_stats(db, 2022)) == _dashboard_parts(from_view)
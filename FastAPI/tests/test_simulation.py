@@ -0,0 +1,99 @@
+from collections import deque
+import numpy as np
+import pandas as pd
+import pytest
+from app.services import simulation
+
+
+def _random_pool(seed: int, candidates: int = 120, majors: int = 6) -> simulation.ApplicationPool:
+    """Dữ liệu ngẫu nhiên nhỏ: 1-4 nguyện vọng (ngành khác nhau) mỗi thí sinh, điểm làm tròn 0.25 để có hoà"""
+    rng = np.random.default_rng(seed)
+    codes = [f"N{i}" for i in range(majors)]
+    rows = []
+    for i in range(candidates):
+        for rank, major in enumerate(rng.choice(codes, size=rng.integers(1, 5), replace=False)):
+            rows.append({
+                "CCCD": f"{i:012d}",
+                "MaNganh": major,
+                "MaPT": rng.choice(["THPT", "HSA", "KHAC"]),
+                "NgayXacNhan": pd.Timestamp(2024, 8, 1) + pd.Timedelta(days=rank),
+                "DXT_THPT": rng.choice([np.nan, 0.0, *np.arange(15, 30, 0.25)]),
+                "DXT_HSA": rng.choice([np.nan, *np.arange(60, 100, 0.25)]),
+                "DiemXetTuyen": round(float(rng.uniform(15, 30)) * 4) / 4,
+            })
+    majors_df = pd.DataFrame({
+        "MaNganh": codes,
+        "TenNganh": [f"Ngành {code}" for code in codes],
+        "ChiTieu": rng.integers(0, 25, size=majors),
+    })
+    return simulation.build_application_pool(pd.DataFrame(rows), majors_df)
+
+
+def _priority(pool, application: int) -> tuple:
+    # Ngành xếp hồ sơ theo điểm giảm dần, hoà thì mã thí sinh nhỏ hơn trước
+    return (-pool.score[application], pool.applicant[application])
+
+
+def _naive_deferred_acceptance(pool, quotas) -> set:
+    """Gale-Shapley tuần tự: từng thí sinh tự do đề nghị nguyện vọng kế tiếp"""
+    next_choice = pool.starts.copy()
+    held = {major: [] for major in range(len(quotas))}
+    free = deque(np.flatnonzero(pool.starts < pool.ends).tolist())
+    while free:
+        applicant = free.popleft()
+        if next_choice[applicant] >= pool.ends[applicant]:
+            continue
+        application = int(next_choice[applicant])
+        next_choice[applicant] += 1
+        major = int(pool.major[application])
+        held[major] = sorted(held[major] + [application], key=lambda a: _priority(pool, a))
+        for rejected in held[major][quotas[major]:]:
+            free.append(int(pool.applicant[rejected]))
+        held[major] = held[major][: quotas[major]]
+    return {application for applications in held.values() for application in applications}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_naive_proposer_and_is_stable(seed):
+    pool = _random_pool(seed)
+    assert pool.invalid_applications > 0
+    quotas = simulation.resolve_quotas(pool)
+    held, rounds = simulation.run_deferred_acceptance(pool, quotas)
+    assert rounds > 1
+    assert set(held.tolist()) == _naive_deferred_acceptance(pool, quotas)
+
+    # Ổn định: không thí sinh nào thích một ngành (nguyện vọng trước hồ sơ trúng tuyển) mà ngành đó
+    # còn chỗ hoặc đang giữ hồ sơ có ưu tiên thấp hơn
+    matched = {int(pool.applicant[a]): int(a) for a in held}
+    assert len(matched) == len(held)
+    by_major = {major: [a for a in held if pool.major[a] == major] for major in range(len(quotas))}
+    for applicant in range(len(pool.starts)):
+        last = matched.get(applicant, pool.ends[applicant])
+        for application in range(pool.starts[applicant], last):
+            major = int(pool.major[application])
+            assert len(by_major[major]) == quotas[major]
+            assert all(_priority(pool, a) < _priority(pool, application) for a in by_major[major])
+
+
+def test_quota_overrides_are_respected():
+    pool = _random_pool(11)
+    overrides = {"N0": 0, "N1": 3, "N2": 40}
+    result = simulation.simulate(pool, overrides)
+    by_code = {major["major_code"]: major for major in result["majors"]}
+    for code, quota in overrides.items():
+        assert by_code[code]["quota"] == quota
+    assert by_code["N0"]["admitted"] == 0 and by_code["N0"]["cutoff_score"] is None
+    assert by_code["N1"]["admitted"] == 3
+    for major in result["majors"]:
+        assert major["admitted"] <= major["quota"]
+    assert result["admitted"] == sum(major["admitted"] for major in result["majors"])
+    assert result["unmatched"] == result["applicants"] - result["admitted"]
+
+
+def test_resolve_quotas_rejects_unknown_and_negative():
+    pool = _random_pool(3)
+    with pytest.raises(ValueError, match="không tồn tại"):
+        simulation.resolve_quotas(pool, {"N0": 1, "KHONG_CO": 5})
+    with pytest.raises(ValueError, match="âm"):
+        simulation.resolve_quotas(pool, {"N1": -1})
+    assert simulation.resolve_quotas(pool, {"N1": 7})[1] == 7
@@ -0,0 +1,85 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from app.core import snapshot
+from app.core.snapshot import SnapshotStore
+
+
+def _frame() -> pd.DataFrame:
+    df = pd.DataFrame({
+        "TenNganh": pd.Categorical(["CNTT", "Kinh tế", "CNTT", None]),
+        "DiemXetTuyen": np.array([27.3, 20.25, 18.0, 24.5]),
+        "SoLuong": np.array([1, 2, 3, 4], dtype=np.int32),
+        "CCCD": ["001", "002", None, "004"],
+    })
+    df.attrs["memory_bytes"] = 123
+    df.attrs["cleaning_stats"] = {"DiemXetTuyen": {"null_replaced": np.int64(2)}}
+    return df
+
+
+def test_round_trip_compact_frame(tmp_path):
+    """Cột category, cột số (giữ dtype) và cột chuỗi (mã hoá rồi trả lại dtype gốc) cùng attrs"""
+    store = SnapshotStore(str(tmp_path))
+    df = _frame()
+    store.write("view", (2024, 1), df)
+    loaded = store.attach("view", (2024, 1))
+
+    # Cột số map trực tiếp từ file (chỉ đọc); copy để so sánh như ndarray thường
+    assert not loaded["DiemXetTuyen"].to_numpy().flags.writeable
+    pd.testing.assert_frame_equal(loaded.copy(), df)
+    assert isinstance(loaded["TenNganh"].dtype, pd.CategoricalDtype)
+    assert loaded["SoLuong"].dtype == np.int32
+    assert loaded.attrs == {"memory_bytes": 123, "cleaning_stats": {"DiemXetTuyen": {"null_replaced": 2}}}
+
+
+def test_version_mismatch_returns_none(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    assert store.attach("view", ("2024-08-01", 10, 1)) is None
+    store.write("view", ("2024-08-01", 10, 1), _frame())
+    assert store.attach("view", ("2024-08-01", 10, 2)) is None
+    assert store.attach("khac", ("2024-08-01", 10, 1)) is None
+    assert store.attach("view", ("2024-08-01", 10, 1)) is not None
+
+
+def test_get_or_create_produces_once(tmp_path):
+    """Nhiều luồng cùng yêu cầu một (key, version): chỉ một lần produce, mọi luồng nhận cùng dữ liệu"""
+    store = SnapshotStore(str(tmp_path))
+    calls = []
+    barrier = threading.Barrier(6)
+    results = []
+
+    def produce():
+        calls.append(1)
+        return _frame()
+
+    def worker():
+        barrier.wait()
+        results.append(store.get_or_create("view", 1, produce))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert store.writes == 1
+    for df in results:
+        pd.testing.assert_frame_equal(df.copy(), _frame())
+
+    # Version mới: produce lại đúng một lần
+    store.get_or_create("view", 2, produce)
+    store.get_or_create("view", 2, produce)
+    assert len(calls) == 2
+
+
+def test_cleanup_keeps_last_generations(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    for version in range(5):
+        store.write("view", version, _frame())
+    key_dir = store._key_dir("view")
+    generations = sorted(name for name in os.listdir(key_dir) if name.startswith("gen-"))
+    assert generations == ["gen-000004", "gen-000005"][-snapshot.KEEP_GENERATIONS:]
+    assert store.attach("view", 4) is not None
+    assert store.attach("view", 3) is None
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.repository import analytics_repo
+from app.services import aggregation, analytics
+from app.services.streaming import AdmissionStatsAccumulator, accumulate_chunks
+
+
+def _chunks(db, year: int, chunksize: int) -> list:
+    return list(
+        analytics_repo.iter_view_admission_chunks(db, year, columns=analytics_repo.ANALYTICS_COLUMNS, chunksize=chunksize)
+    )
+
+
+@pytest.mark.parametrize("year", [2022, 2024])
+def test_small_chunks_match_pandas(db, year):
+    """Nhiều chunk nhỏ (chunk cuối lẻ) cho cùng summary / phổ điểm / chart THPT với mode=pandas"""
+    chunks = _chunks(db, year, 97)
+    assert len(chunks) > 2
+    stats = accumulate_chunks(chunks)
+
+    df = analytics_repo.get_view_admission_data(db, year, columns=analytics_repo.ANALYTICS_COLUMNS)
+    assert aggregation.summary_from_stats(stats) == analytics.calculate_summary(df)
+    assert aggregation.score_distribution_from_stats(stats).to_dict() == analytics.analyze_score_distribution(df).to_dict()
+    assert aggregation.thpt_subject_chart_from_stats(stats) == analytics.build_thpt_subject_analysis_chart(df)
+
+
+def _split_sums(stats: dict) -> tuple:
+    """Tách tổng (cộng theo thứ tự khác nhau nên lệch ở bit cuối) khỏi phần phải bằng tuyệt đối"""
+    sums = {}
+    for col, col_stats in stats["columns"].items():
+        sums[col] = (col_stats.pop("pos_sum"), col_stats.pop("neg_sum"))
+    return stats, sums
+
+
+def test_merge_matches_single_accumulator(db):
+    """Gộp hai accumulator (hai nửa dữ liệu, theo cả hai chiều) giống một accumulator đọc tuần tự"""
+    chunks = _chunks(db, 2023, 200)
+    half = len(chunks) // 2
+
+    def accumulate(part):
+        accumulator = AdmissionStatsAccumulator()
+        for chunk in part:
+            accumulator.update(chunk)
+        return accumulator
+
+    expected, expected_sums = _split_sums(accumulate(chunks).to_stats())
+    for merged in (
+        accumulate(chunks[:half]).merge(accumulate(chunks[half:])),
+        accumulate(chunks[half:]).merge(accumulate(chunks[:half])),
+    ):
+        stats, sums = _split_sums(merged.to_stats())
+        assert stats == expected
+        for col, (pos_sum, neg_sum) in expected_sums.items():
+            assert sums[col] == (pytest.approx(pos_sum), pytest.approx(neg_sum))
+
+
+def test_bucket_edges_match_pd_cut():
+    """Bin đóng bên phải như pd.cut: điểm đúng bằng biên thuộc bin bên dưới, bin đầu gồm cả điểm nhỏ"""
+    width = 5
+    scores = np.array([0.01, 4.99, 5.0, 5.01, 10.0, 14.999, 15.0, 27.3, 29.99, 30.0])
+    accumulator = AdmissionStatsAccumulator(bin_width=width)
+    # Chia hai chunk để bin cao nhất đến sau
+    accumulator.update(pd.DataFrame({"DiemXetTuyen": scores[:5]}))
+    accumulator.update(pd.DataFrame({"DiemXetTuyen": scores[5:]}))
+
+    edges = np.arange(0, scores.max() + width, width)
+    expected = pd.Series(pd.cut(scores, bins=edges, include_lowest=True)).value_counts(sort=False).tolist()
+    assert accumulator.score_buckets.tolist() == expected
@@ -0,0 +1,45 @@
+from fastapi.testclient import TestClient
+
+
+def _client():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def test_trends_match_dashboard_per_year(database):
+    """Mỗi năm trong /trends (một lượt đọc nhiều năm) khớp với /dashboard của riêng năm đó"""
+    client = _client()
+    response = client.get("/analytics/trends", params={"from": 2022, "to": 2024})
+    assert response.status_code == 200, response.text
+    trends = response.json()
+    assert trends["years"] == [2022, 2023, 2024]
+
+    for i, year in enumerate(trends["years"]):
+        dashboard = client.get("/analytics/dashboard", params={"year": year}).json()
+
+        assert {field: values[i] for field, values in trends["summary"].items()} == dashboard["summary"]
+
+        chart = dashboard["charts"]["thpt_subject_analysis"]
+        methods = trends["methods"]
+        assert {
+            name: scores[i] for name, scores in zip(methods["names"], methods["avg_score"]) if scores[i] is not None
+        } == dict(zip(chart["labels"], chart["datasets"][0]["data"]))
+
+        majors = trends["majors"]
+        by_name = {
+            name: {
+                "quota": majors["quota"][j],
+                "admitted": majors["admitted"][j][i],
+                "fulfillment_rate": majors["fulfillment_rate"][j][i],
+            }
+            for j, name in enumerate(majors["names"])
+        }
+        assert dashboard["top_majors"]
+        for item in dashboard["top_majors"]:
+            assert by_name[item["major_name"]] == {key: item[key] for key in ("quota", "admitted", "fulfillment_rate")}
+
+        provinces = dict(zip(trends["provinces"]["names"], (counts[i] for counts in trends["provinces"]["counts"])))
+        assert dashboard["top_provinces"]
+        for item in dashboard["top_provinces"]:
+            assert provinces[item["province"]] == item["student_count"]